@@ -0,0 +1 @@
+"""Benchmarks for the Periodic Table Explorer; see ``benchmarks.run``."""
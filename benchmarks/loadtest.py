@@ -0,0 +1,514 @@
+"""Concurrent-session load test for the Streamlit app.
+
+Starts ``streamlit run main.py`` (or uses a running server), connects N
+headless sessions over Streamlit's websocket protocol and has each one play
+an interaction script: changing the sidebar filters, sorting and paging the
+table, moving the Analytics sliders, paging the gallery and so on. Widgets
+are found by key or label in the messages the server sends. Widgets inside
+a tab fragment rerun only that fragment, as in a browser. Switching tabs
+happens entirely in the browser and costs the server nothing, so the
+scripts drive the widgets inside each tab instead::
+
+    python -m benchmarks.loadtest                               # 1, 5 and 10 sessions
+    python -m benchmarks.loadtest --sessions 1,10,25,50 --iterations 3
+    python -m benchmarks.loadtest --url http://localhost:8501 --server-pid 1234
+
+Before the levels, a debug-mode session checks that a widget change on
+one tab reruns only that tab: it reads the per-tab run counters from the
+debug panel (``section_runs``, see ``count_run`` in ``main.py``) before and
+after changing a widget in each tab, and the command fails if any other
+tab's counter moved (``--isolation-only`` runs just this check).
+
+For each concurrency level it reports p50/p95/p99 rerun latency (time from
+sending a rerun to the server's script-finished message), overall and per
+step, reruns per second, bytes received per rerun and the server's
+resident memory. Memory is shown at idle, at peak, with the sessions still
+connected (and per connected session) and after they disconnect. Results
+are written to ``benchmarks/results/`` as JSON, like ``benchmarks.run``.
+Memory is read from ``/proc`` and is only available on Linux for a server
+on this machine.
+
+Streamlit's ``AppTest`` cannot be used here: it swaps a process-wide
+runtime on every run, so tests in one process cannot run concurrently.
+"""
+import argparse
+import ast
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+from benchmarks.run import RESULTS_DIR, metadata
+
+DEFAULT_LEVELS = (1, 5, 10)
+DEFAULT_THINK_S = 0.2
+RERUN_TIMEOUT_S = 120
+RSS_SAMPLE_INTERVAL_S = 0.25
+# Time the server gets to drop disconnected sessions before memory is measured again.
+SETTLE_S = 2.0
+PERCENTILES = (50, 95, 99)
+SECTION_RUNS_PREFIX = "section runs "
+WIDGET_TYPES = ("checkbox", "multiselect", "number_input", "radio", "selectbox", "slider", "text_input")
+
+
+class Step(NamedTuple):
+    name: str
+    widget: str  # widget key, or label for widgets without a key
+    value: object
+
+
+# Values are given as the user sees them; option labels are matched as strings.
+SCENARIOS = {
+    "explorer": (
+        Step("sidebar.type", "Filter by Metal Type", "Metal"),
+        Step("sidebar.group", "Filter by Group", ["1", "2", "13"]),
+        Step("analysis.sort", "table_sort", "AtomicMass"),
+        Step("analysis.page", "table_page", 2),
+        Step("analytics.range", "Select Atomic Number Range", (5, 60)),
+        Step("analytics.bubble_size", "Bubble Size", 18),
+        Step("gallery.page", "gallery_page", 2),
+        Step("sidebar.reset", "Filter by Metal Type", "All"),
+    ),
+    "analyst": (
+        Step("sidebar.radioactive", "Filter by Radioactivity", "Non-Radioactive"),
+        Step("analysis.search", "🔍 Search for Specific Values", "Year>1800"),
+        Step("trends.properties", "Select Properties to Compare", ["AtomicRadius", "Electronegativity"]),
+        Step("analytics.mode", "analytics_mode", "Correlation & Clustering"),
+        Step("analytics.mode", "analytics_mode", "3D Scatter"),
+        Step("gallery.per_row", "Elements per row", "15"),
+        Step("details.element", "element_details", "Iron"),
+        Step("sidebar.search", "Search Element", "ium"),
+    ),
+}
+
+
+# A widget in each tab fragment, with the ``count_run`` section of that tab.
+ISOLATION_STEPS = (
+    (Step("analysis.sort", "table_sort", "AtomicMass"), "data_analysis"),
+    (Step("trends.properties", "Select Properties to Compare", ["AtomicRadius", "Electronegativity"]), "trend"),
+    (Step("analytics.bubble_size", "Bubble Size", 18), "analytics"),
+    (Step("gallery.page", "gallery_page", 2), "gallery"),
+    (Step("details.element", "element_details", "Iron"), "details"),
+)
+
+
+class Rerun(NamedTuple):
+    level: int
+    session: int
+    scenario: str
+    step: str
+    latency_s: float
+    bytes: int
+    fragment: bool
+    error: str = None
+
+
+class Widget(NamedTuple):
+    kind: str
+    proto: object
+    fragment_id: str
+
+    @property
+    def key(self):
+        # Element IDs end in "-<user key>" ("-None" without one).
+        key = self.proto.id.rsplit("-", 1)[-1]
+        return None if key == "None" else key
+
+
+def rss_bytes(pid):
+    """Resident set size of ``pid`` in bytes, or None where /proc is unavailable."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+def widget_state(widget, value):
+    """The ``WidgetState`` a browser would send after setting ``widget`` to ``value``."""
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+    proto = widget.proto
+    state = WidgetState(id=proto.id)
+    if widget.kind in ("selectbox", "radio"):
+        state.int_value = list(proto.options).index(str(value))
+    elif widget.kind == "multiselect":
+        state.int_array_value.data.extend(list(proto.options).index(str(item)) for item in value)
+    elif widget.kind == "slider":
+        values = value if isinstance(value, (tuple, list)) else (value,)
+        state.double_array_value.data.extend(min(max(float(v), proto.min), proto.max) for v in values)
+    elif widget.kind == "number_input":
+        if proto.has_min:
+            value = max(value, proto.min)
+        if proto.has_max:
+            value = min(value, proto.max)
+        if proto.data_type == proto.INT:
+            state.int_value = int(value)
+        else:
+            state.double_value = float(value)
+    elif widget.kind == "checkbox":
+        state.bool_value = bool(value)
+    elif widget.kind == "text_input":
+        state.string_value = str(value)
+    else:
+        raise ValueError(f"Unsupported widget type: {widget.kind}")
+    return state
+
+
+class Session:
+    """One headless browser session: a websocket plus the widget values it has set."""
+
+    def __init__(self, url, level, number, scenario, query_string=""):
+        self.url = url
+        self.level = level
+        self.number = number
+        self.scenario = scenario
+        self.query_string = query_string
+        self.section_runs = None  # from the debug panel, when the session has ``?debug=1``
+        self.widgets = {}  # element ID -> Widget
+        self.states = {}  # element ID -> WidgetState set by this session
+        self.reruns = []
+        self.skipped = 0
+        self._messages = {}  # hash -> ForwardMsg, for messages the server later sends by reference
+        self._ws = None
+
+    async def connect(self):
+        from tornado.httpclient import HTTPRequest
+        from tornado.websocket import websocket_connect
+
+        ws_url = self.url.replace("http", "ws", 1).rstrip("/") + "/_stcore/stream"
+        self._ws = await websocket_connect(
+            HTTPRequest(ws_url, headers={"Sec-WebSocket-Protocol": "streamlit"}), max_message_size=1 << 30
+        )
+        await self.rerun("page_load")
+
+    def close(self):
+        if self._ws is not None:
+            self._ws.close()
+            self._ws = None
+
+    def find(self, name):
+        for widget in self.widgets.values():
+            if widget.key == name:
+                return widget
+        for widget in self.widgets.values():
+            if widget.key is None and widget.proto.label == name:
+                return widget
+        return None
+
+    async def interact(self, step):
+        widget = self.find(step.widget)
+        if widget is None:
+            self.skipped += 1
+            return
+        try:
+            self.states[widget.proto.id] = widget_state(widget, step.value)
+        except ValueError:
+            # The option is not offered under the current filters.
+            self.skipped += 1
+            return
+        await self.rerun(step.name, widget.fragment_id)
+
+    async def rerun(self, step, fragment_id=""):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+
+        message = BackMsg()
+        message.rerun_script.query_string = self.query_string
+        message.rerun_script.widget_states.widgets.extend(self.states.values())
+        if fragment_id:
+            message.rerun_script.fragment_id = fragment_id
+
+        started = time.perf_counter()
+        await self._ws.write_message(message.SerializeToString(), binary=True)
+        received, seen, error = await self._read_until_finished()
+        latency = time.perf_counter() - started
+
+        # Widgets the run did not draw are gone (a fragment run only redraws its own).
+        for element_id, widget in list(self.widgets.items()):
+            if (not fragment_id or widget.fragment_id == fragment_id) and element_id not in seen:
+                del self.widgets[element_id]
+                self.states.pop(element_id, None)
+        self.widgets.update(seen)
+        self.reruns.append(
+            Rerun(self.level, self.number, self.scenario, step, latency, received, bool(fragment_id), error)
+        )
+
+    async def _read_until_finished(self):
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        received, seen, error = 0, {}, None
+        while True:
+            payload = await asyncio.wait_for(self._ws.read_message(), RERUN_TIMEOUT_S)
+            if payload is None:
+                raise ConnectionError("The server closed the session")
+            received += len(payload)
+            message = ForwardMsg()
+            message.ParseFromString(payload)
+            if message.ref_hash:
+                message = await self._referenced(message.ref_hash)
+            elif message.metadata.cacheable:
+                self._messages[message.hash] = message
+
+            kind = message.WhichOneof("type")
+            if kind == "script_finished":
+                if message.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    return received, seen, error
+            elif kind == "delta" and message.delta.WhichOneof("type") == "new_element":
+                element = message.delta.new_element
+                element_kind = element.WhichOneof("type")
+                if element_kind in WIDGET_TYPES:
+                    proto = getattr(element, element_kind)
+                    seen[proto.id] = Widget(element_kind, proto, message.delta.fragment_id)
+                elif element_kind == "exception":
+                    error = f"{element.exception.type}: {element.exception.message}"
+                elif element_kind == "markdown" and SECTION_RUNS_PREFIX in element.markdown.body:
+                    counters = element.markdown.body.split(SECTION_RUNS_PREFIX, 1)[1]
+                    self.section_runs = ast.literal_eval(counters.strip())
+
+    async def _referenced(self, ref_hash):
+        message = self._messages.get(ref_hash)
+        if message is None:
+            from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+            from tornado.httpclient import AsyncHTTPClient
+
+            response = await AsyncHTTPClient().fetch(f"{self.url.rstrip('/')}/_stcore/message?hash={ref_hash}")
+            message = ForwardMsg()
+            message.ParseFromString(response.body)
+            self._messages[ref_hash] = message
+        return message
+
+    async def play(self, steps, iterations, think_s, rng):
+        for _ in range(iterations):
+            for step in steps:
+                await asyncio.sleep(think_s * rng.uniform(0.5, 1.5))
+                await self.interact(step)
+
+
+class AppServer:
+    """``streamlit run`` in a subprocess on a free port, for the duration of a ``with`` block."""
+
+    def __init__(self, script="main.py"):
+        self.script = script
+        self.process = None
+        self.log = None
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            self.port = probe.getsockname()[1]
+        self.url = f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        self.log = tempfile.NamedTemporaryFile(prefix="loadtest-server-", suffix=".log", delete=False)
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", self.script, "--server.headless=true",
+             f"--server.port={self.port}", "--server.address=127.0.0.1", "--browser.gatherUsageStats=false"],
+            stdout=self.log, stderr=subprocess.STDOUT,
+        )
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"streamlit exited with code {self.process.returncode}; see {self.log.name}")
+            try:
+                with socket.create_connection(("127.0.0.1", self.port), timeout=1):
+                    return self
+            except OSError:
+                time.sleep(0.25)
+        self.__exit__(None, None, None)
+        raise RuntimeError(f"streamlit did not start within 60 s; see {self.log.name}")
+
+    def __exit__(self, *exc_info):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+        self.log.close()
+
+
+async def check_isolation(url):
+    """Problems found when changing a widget in each tab; empty if every change reran only its tab."""
+    session = Session(url, 0, 0, "isolation", query_string="debug=1")
+    await session.connect()
+    problems = []
+    try:
+        for step, section in ISOLATION_STEPS:
+            # Full reruns around the step count once for every tab; the step itself may only
+            # count for its own tab.
+            await session.rerun("isolation.before")
+            before = dict(session.section_runs or {})
+            skipped = session.skipped
+            await session.interact(step)
+            if session.skipped > skipped:
+                problems.append(f"{step.name}: widget {step.widget!r} not found")
+                continue
+            await session.rerun("isolation.after")
+            after = session.section_runs or {}
+            moved = {name: after.get(name, 0) - before.get(name, 0) - 1 for name in {*before, *after}}
+            moved = {name: count for name, count in sorted(moved.items()) if count}
+            if moved != {section: 1}:
+                problems.append(f"{step.name}: extra runs {moved or 'none'}, expected only {{{section!r}: 1}}")
+    finally:
+        session.close()
+    return problems
+
+
+def percentiles(values):
+    if not values:
+        return {f"p{p}": None for p in PERCENTILES}
+    return {f"p{p}": float(value) for p, value in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+
+async def run_level(url, pid, sessions, iterations, think_s, ramp_s, seed=0):
+    """Run ``sessions`` concurrent sessions and summarize them."""
+    scenario_names = list(SCENARIOS)
+    rss = {"idle": rss_bytes(pid)}
+    peak = [rss["idle"] or 0]
+    sampling = True
+
+    async def sample():
+        while sampling:
+            peak[0] = max(peak[0], rss_bytes(pid) or 0)
+            await asyncio.sleep(RSS_SAMPLE_INTERVAL_S)
+
+    async def user(number):
+        await asyncio.sleep(ramp_s * number / sessions)
+        scenario = scenario_names[number % len(scenario_names)]
+        session = Session(url, sessions, number, scenario)
+        await session.connect()
+        await session.play(SCENARIOS[scenario], iterations, think_s, random.Random(seed + number))
+        return session
+
+    sampler = asyncio.create_task(sample())
+    started = time.perf_counter()
+    finished = await asyncio.gather(*(user(number) for number in range(sessions)))
+    elapsed = time.perf_counter() - started
+    rss["connected"] = rss_bytes(pid)
+    for session in finished:
+        session.close()
+    await asyncio.sleep(SETTLE_S)
+    rss["disconnected"] = rss_bytes(pid)
+    sampling = False
+    await sampler
+    rss["peak"] = peak[0] or None
+
+    reruns = [rerun for session in finished for rerun in session.reruns]
+    latencies = [rerun.latency_s for rerun in reruns]
+    steps = {}
+    for rerun in reruns:
+        steps.setdefault(rerun.step, []).append(rerun)
+    per_session = None
+    if rss["idle"] is not None and rss["connected"] is not None:
+        per_session = (rss["connected"] - rss["idle"]) / sessions
+    return {
+        "sessions": sessions,
+        "iterations": iterations,
+        "elapsed_s": elapsed,
+        "reruns": len(reruns),
+        "reruns_per_s": len(reruns) / elapsed if elapsed else None,
+        "skipped_steps": sum(session.skipped for session in finished),
+        "errors": sorted({rerun.error for rerun in reruns if rerun.error}),
+        "latency_s": percentiles(latencies),
+        "bytes_per_rerun": {"mean": float(np.mean([r.bytes for r in reruns])) if reruns else None,
+                            **percentiles([r.bytes for r in reruns])},
+        "rss_bytes": {**rss, "growth_per_session": per_session},
+        "steps": {
+            name: {"count": len(items), "fragment": items[0].fragment,
+                   "latency_s": percentiles([r.latency_s for r in items]),
+                   "mean_bytes": float(np.mean([r.bytes for r in items]))}
+            for name, items in steps.items()
+        },
+    }
+
+
+def _mb(value):
+    return "n/a" if value is None else f"{value / 1024 / 1024:8.1f} MB"
+
+
+def report(level):
+    latency = level["latency_s"]
+    rss = level["rss_bytes"]
+    print(f"\n{level['sessions']} sessions: {level['reruns']} reruns in {level['elapsed_s']:.1f} s "
+          f"({level['reruns_per_s']:.1f}/s), {level['skipped_steps']} steps skipped")
+    print("  latency  " + "  ".join(f"{name} {value * 1000:8.1f} ms" for name, value in latency.items()))
+    print(f"  payload  mean {level['bytes_per_rerun']['mean'] / 1024:8.1f} KB"
+          f"  p95 {level['bytes_per_rerun']['p95'] / 1024:8.1f} KB per rerun")
+    print(f"  memory   idle {_mb(rss['idle'])}  peak {_mb(rss['peak'])}  connected {_mb(rss['connected'])}"
+          f"  disconnected {_mb(rss['disconnected'])}  per session {_mb(rss['growth_per_session'])}")
+    for name, step in sorted(level["steps"].items()):
+        step_latency = step["latency_s"]
+        print(f"    {name:<24} x{step['count']:<4} p50 {step_latency['p50'] * 1000:8.1f} ms"
+              f"  p95 {step_latency['p95'] * 1000:8.1f} ms  {step['mean_bytes'] / 1024:8.1f} KB"
+              f"{'  (fragment)' if step['fragment'] else ''}")
+    for error in level["errors"]:
+        print(f"  error: {error}")
+
+
+async def run(url, pid, levels, iterations, think_s, ramp_s):
+    isolation = await check_isolation(url)
+    print("Tab isolation: " + ("ok" if not isolation else "FAILED"))
+    for problem in isolation:
+        print(f"  {problem}")
+    if levels is None:
+        return isolation, None, []
+    # One pass first, so the levels measure warm caches; its latency is the cold start.
+    warmup = await run_level(url, pid, 1, 1, 0, 0)
+    print(f"Warm-up: page load {warmup['steps']['page_load']['latency_s']['p50'] * 1000:.0f} ms, "
+          f"memory {_mb(warmup['rss_bytes']['disconnected'])}")
+    results = []
+    for sessions in levels:
+        level = await run_level(url, pid, sessions, iterations, think_s, ramp_s)
+        report(level)
+        results.append(level)
+    return isolation, warmup, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the Streamlit app with concurrent sessions.")
+    parser.add_argument("--sessions", default=",".join(str(level) for level in DEFAULT_LEVELS),
+                        help="comma-separated concurrency levels (default: %(default)s)")
+    parser.add_argument("--iterations", type=int, default=2, help="times each session plays its script")
+    parser.add_argument("--think", type=float, default=DEFAULT_THINK_S, help="mean pause between steps, seconds")
+    parser.add_argument("--ramp", type=float, default=1.0, help="seconds over which sessions connect")
+    parser.add_argument("--url", help="running server to test (default: start one for main.py)")
+    parser.add_argument("--server-pid", type=int, help="process ID of --url's server, for memory figures")
+    parser.add_argument("--isolation-only", action="store_true",
+                        help="only check that a widget change on one tab reruns just that tab")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/loadtest-<timestamp>-<commit>.json)")
+    args = parser.parse_args(argv)
+    levels = None if args.isolation_only else [int(level) for level in args.sessions.split(",") if level.strip()]
+
+    def go(url, pid):
+        return asyncio.run(run(url, pid, levels, args.iterations, args.think, args.ramp))
+
+    if args.url:
+        isolation, warmup, results = go(args.url, args.server_pid)
+    else:
+        with AppServer() as server:
+            isolation, warmup, results = go(server.url, server.process.pid)
+    if args.isolation_only:
+        return 1 if isolation else 0
+
+    meta = metadata()
+    output = args.output
+    if output is None:
+        stamp = meta["timestamp"].replace(":", "").replace("-", "")[:15]
+        output = os.path.join(RESULTS_DIR, f"loadtest-{stamp}-{meta['commit']}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "isolation_problems": isolation, "warmup": warmup, "levels": results}, f, indent=2)
+    print(f"\nWrote {output}")
+    return 1 if isolation else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
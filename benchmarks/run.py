@@ -0,0 +1,252 @@
+"""Benchmarks for the work a rerun of main.py does.
+
+Times the data paths behind the app (loading, sidebar filters, Data Analysis
+filtering and search, periodic table HTML, trend smoothing, 3D scatter
+construction and image encoding) at the shipped 118-row size and at
+synthetic, scaled-up sizes, and writes the results as JSON::
+
+    python -m benchmarks.run                       # 118, 10k and 100k rows
+    python -m benchmarks.run --sizes 118,1000000   # pick the sizes
+    python -m benchmarks.run --compare benchmarks/results/<older>.json
+
+Run it from the repository root. Each result file records the git commit
+and package versions so runs from different releases can be compared.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from periodic_table_visualizer import core, dataset
+from periodic_table_visualizer.analytics import build_scatter_figure, downsample
+from periodic_table_visualizer.datatable import TableIndex
+from periodic_table_visualizer.expressions import ExpressionEngine, parse_expression
+from periodic_table_visualizer.filters import FilterEngine, FilterSpec
+from periodic_table_visualizer.images import IMAGE_DIR, ImageStore
+from periodic_table_visualizer.multivariate import MultivariateIndex
+from periodic_table_visualizer.ranges import RangeFilter
+from periodic_table_visualizer.search import SearchIndex
+from periodic_table_visualizer.thumbnails import THUMBNAIL_DIR
+
+RESULTS_DIR = os.path.join("benchmarks", "results")
+DEFAULT_SIZES = (118, 10_000, 100_000)
+# Stop repeating a case once it has used this much time (it still runs at least MIN_REPEATS times).
+TIME_BUDGET_S = 2.0
+MIN_REPEATS = 3
+MAX_REPEATS = 50
+
+SIDEBAR_SPEC = FilterSpec(name="ium", groups=(1, 2, 13, 14), periods=(4, 5, 6), radioactive=False)
+RANGE_FILTERS = {"AtomicMass": (10.0, 200.0), "Density": (0.5, 15.0), "MeltingPoint": (200.0, 2500.0)}
+SEARCH_QUERIES = ("iron", "ir*", "Symbol:Fe", "Year>1900")
+TREND_PROPERTIES = ("AtomicRadius", "Electronegativity", "IonizationEnergy", "Density")
+TABLE_COLUMNS = ("AtomicNumber", "Element", "Symbol", "AtomicMass", "Density")
+SCATTER_AXES = ("AtomicMass", "Density", "MeltingPoint", "AtomicRadius", "IonizationEnergy")
+DERIVED_FORMULAS = {"ratio": "AtomicMass / Density", "group_delta": "Electronegativity - group_mean(Electronegativity)"}
+
+
+def synthetic_dataset(base, rows, seed=0):
+    """``base`` repeated up to ``rows`` rows, with jittered measurements and unique names."""
+    if rows <= len(base):
+        return base.iloc[:rows].reset_index(drop=True)
+    rng = np.random.default_rng(seed)
+    repeats = -(-rows // len(base))
+    df = pd.concat([base] * repeats, ignore_index=True).iloc[:rows]
+    copy_number = (np.arange(rows) // len(base)).astype(str)
+    df["Element"] = (df["Element"].astype(str) + "-" + copy_number).astype(base["Element"].dtype)
+    for column in df.select_dtypes(include=["floating"]).columns:
+        noise = rng.normal(1.0, 0.02, rows).astype(df[column].dtype)
+        df[column] = df[column] * noise
+    return df.reset_index(drop=True)
+
+
+def measure(func, setup=None):
+    """Run ``func`` repeatedly and return timing statistics in seconds.
+
+    ``setup``, if given, returns the arguments of each run; it is not timed.
+    """
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < MAX_REPEATS:
+        args = setup() if setup else ()
+        t0 = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - t0)
+        if len(timings) >= MIN_REPEATS and time.perf_counter() - started > TIME_BUDGET_S:
+            break
+    return {
+        "min_s": min(timings),
+        "median_s": statistics.median(timings),
+        "mean_s": statistics.fmean(timings),
+        "repeats": len(timings),
+    }
+
+
+def load_cases(base, rows, workdir):
+    """Cold CSV parse vs. cached Feather load of a dataset of ``rows`` rows."""
+    csv_path = os.path.join(workdir, f"elements-{rows}.csv")
+    cache_dir = os.path.join(workdir, "cache")
+    synthetic_dataset(base, rows).to_csv(csv_path, index=False)
+    dataset.load_dataset(csv_path, cache_dir)  # populate the Feather cache
+    yield "load.csv_typed", lambda: dataset.read_csv_typed(csv_path)
+    yield "load.feather_cached", lambda: dataset.load_dataset(csv_path, cache_dir)
+
+
+def data_cases(df):
+    engine = FilterEngine(df)
+    series_columns = [column for column in TREND_PROPERTIES if column in df]
+
+    yield "filter.engine_build", lambda: FilterEngine(df)
+    # Cold cases run on a fresh instance built by their (untimed) setup, so they time the same
+    # public call as the warm case, just without its memoized results.
+    yield "filter.sidebar_cold", lambda fresh: fresh.filter(SIDEBAR_SPEC), lambda: (FilterEngine(df),)
+    yield "filter.sidebar_memoized", lambda: engine.filter(SIDEBAR_SPEC)
+    ranges = RangeFilter(df)
+
+    def slider_stats():
+        fresh = RangeFilter(df)
+        return [fresh.stats(column) for column in RANGE_FILTERS]
+
+    yield "analysis.range_stats_cold", slider_stats
+    yield "analysis.range_filters_cold", lambda: engine.take(RangeFilter(df).mask(RANGE_FILTERS))
+    yield "analysis.range_filters", lambda: engine.take(ranges.mask(RANGE_FILTERS))
+    table = TableIndex(df)
+    table_mask = ranges.mask(RANGE_FILTERS)
+    yield "analysis.table_sort_order", lambda fresh: fresh.sort_order("AtomicMass", False), lambda: (TableIndex(df),)
+    yield "analysis.table_page", lambda: table.page(table_mask, TABLE_COLUMNS, page=2, sort_by="AtomicMass")
+    yield "analysis.search_index_build", lambda: SearchIndex(df)
+    for query in SEARCH_QUERIES:
+        yield f"analysis.search[{query}]", lambda fresh, query=query: fresh.mask(query), lambda: (SearchIndex(df),)
+    multivariate = MultivariateIndex(df)
+    sidebar_mask = engine.mask(SIDEBAR_SPEC)
+    multivariate.moments(SCATTER_AXES, sidebar_mask)
+    yield "analytics.correlation_cold", lambda: MultivariateIndex(df).correlation(SCATTER_AXES, sidebar_mask)
+    # Swapping between two filters that differ in a few rows exercises the incremental update.
+    nearby_mask = sidebar_mask.copy()
+    nearby_mask[: max(1, len(df) // 100)] ^= True
+    yield "analytics.correlation_incremental", lambda: [
+        multivariate.correlation(SCATTER_AXES, mask) for mask in (nearby_mask, sidebar_mask)
+    ]
+    yield "analytics.kmeans", lambda: multivariate.cluster(SCATTER_AXES, table_mask, 5)
+    expressions = ExpressionEngine(df)
+    for name, formula in DERIVED_FORMULAS.items():
+        yield f"derived.parse[{name}]", lambda formula=formula: parse_expression(formula, expressions.columns)
+        yield (f"derived.evaluate[{name}]", lambda fresh, formula=formula: fresh.evaluate(formula),
+               lambda: (ExpressionEngine(df),))
+    yield "trends.smoothed_series", lambda: core.trend_series(df, series_columns, sigma=2.0)
+    yield "analytics.scatter_figure", lambda: build_scatter_figure(
+        df.dropna(subset=list(SCATTER_AXES)),
+        downsample(df.dropna(subset=list(SCATTER_AXES)), SCATTER_AXES[:3]),
+        *SCATTER_AXES
+    )
+
+
+def base_size_cases(df):
+    """Cases that only make sense for the real 118 elements."""
+    yield "layout.periodic_table_html", lambda: core.render_periodic_table_html(df)
+    yield "gallery.page", lambda: core.gallery_page(df, page=2, page_size=40)
+    atomic_numbers = df["AtomicNumber"].tolist()
+
+    def encode(width):
+        store = ImageStore(IMAGE_DIR, thumbnail_dir=THUMBNAIL_DIR)
+        for atomic_number in atomic_numbers:
+            store.data_uri(atomic_number, width)
+
+    yield "images.encode_originals", lambda: encode(None)
+    if os.path.isdir(THUMBNAIL_DIR):
+        yield "images.encode_thumbnails_128", lambda: encode(128)
+
+
+def run(sizes, base_path=core.DATA_PATH):
+    base = dataset.read_csv_typed(base_path)
+    results = []
+
+    def record(name, rows, func, setup=None):
+        stats = measure(func, setup)
+        results.append({"name": name, "rows": rows, **stats})
+        print(f"{name:<36} {rows:>9,} rows  median {stats['median_s'] * 1000:10.3f} ms  (x{stats['repeats']})")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in sizes:
+            df = base if rows == len(base) else synthetic_dataset(base, rows)
+            for name, func in load_cases(base, rows, workdir):
+                record(name, rows, func)
+            for name, func, *setup in data_cases(df):
+                record(name, rows, func, *setup)
+            if rows == len(base):
+                for name, func in base_size_cases(df):
+                    record(name, rows, func)
+    return results
+
+
+def metadata():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = "unknown"
+    import plotly
+    import scipy
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "versions": {
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "plotly": plotly.__version__,
+            "scipy": scipy.__version__,
+        },
+    }
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["name"], r["rows"]): r for r in json.load(f)["results"]}
+    print(f"\nCompared with {baseline_path} (median, >1 means slower now):")
+    for result in results:
+        old = baseline.get((result["name"], result["rows"]))
+        if old:
+            ratio = result["median_s"] / old["median_s"] if old["median_s"] else float("inf")
+            flag = "  <-- regression" if ratio > 1.2 else ""
+            print(f"{result['name']:<36} {result['rows']:>9,} rows  x{ratio:6.2f}{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the periodic table data paths.")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="comma-separated row counts (default: %(default)s)")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/<timestamp>-<commit>.json)")
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    results = run(sizes)
+    meta = metadata()
+
+    output = args.output
+    if output is None:
+        stamp = meta["timestamp"].replace(":", "").replace("-", "")[:15]
+        output = os.path.join(RESULTS_DIR, f"{stamp}-{meta['commit']}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2)
+    print(f"\nWrote {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,207 +1,131 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import os
-import base64
-import json
-from streamlit_plotly_events import plotly_events
-import numpy as np
-from scipy.ndimage import gaussian_filter1d
+import functools
+from periodic_table_visualizer.analytics import (
+    DEFAULT_MARKER_SCALE,
+    DEFAULT_POINT_BUDGET,
+    LOD_METHODS,
+    build_scatter_figure,
+    downsample,
+    hover_details,
+)
+from periodic_table_visualizer.assets import ASSET_BASE_URL_ENV, AssetManifest, atlas_enabled, publish_assets
+from periodic_table_visualizer.content import (
+    APP_CSS,
+    BASIC_INFO_PERIODIC_TABLE,
+    ELEMENT_DEFINITIONS_HTML,
+    FEATURES_MODERN_CHEMISTRY,
+    FUN_FACTS_ABOUT_PERIODIC_TABLE,
+    HISTORY_OF_PERIODIC_TABLE,
+    PERIODIC_TABLE_IN_EVERYDAY_LIFE,
+)
+from periodic_table_visualizer.core import (
+    DATA_PATH,
+    FilterEngine,
+    FilterSpec,
+    GalleryIndex,
+    render_periodic_table_html,
+    trend_series,
+)
+from periodic_table_visualizer.datatable import MARKER_COLUMN, PAGE_SIZES, TableIndex
+from periodic_table_visualizer.export import EXPORT_FORMATS, export_bytes, export_file_name
+from periodic_table_visualizer.expressions import (
+    AGGREGATES,
+    FUNCTIONS,
+    ExpressionEngine,
+    ExpressionError,
+    definitions_digest,
+    validate_name,
+)
+from periodic_table_visualizer.filters import mask_digest
+from periodic_table_visualizer.gallery import render_gallery_html
+from periodic_table_visualizer.instrumentation import Recorder, debug_enabled, new_id
+from periodic_table_visualizer.images import IMAGE_DIR, ImageStore
+from periodic_table_visualizer.layout import ELEMENT_COLORS
+from periodic_table_visualizer.lookup import ElementIndex, render_details_html
+from periodic_table_visualizer.ranges import RangeFilter, sparkline
+from periodic_table_visualizer.multivariate import (
+    CLUSTER_METHODS,
+    MultivariateIndex,
+    build_correlation_heatmap,
+    build_projection_figure,
+)
+from periodic_table_visualizer.registry import DatasetCache, cache_budget, dataset_name, discover_datasets
+from periodic_table_visualizer.search import SearchIndex, SearchQueryError
+from periodic_table_visualizer.thumbnails import THUMBNAIL_DIR, build_thumbnails, width_for_columns
+from periodic_table_visualizer.trends import DEFAULT_SIGMA, LINE_STYLES, build_trend_figure, style_trend_figure
 
 st.set_page_config(page_title="Periodic Table Explorer", layout="wide")
-MAX_GROUP = 18
-MAX_PERIOD = 7 
 
-@st.cache_data
-def load_data(filepath):
+# Opt-in with PTV_DEBUG=1 or ?debug=1: times each section of this run and logs it as JSON lines.
+# Fragment-only reruns are logged under the run id of the full run that drew them.
+recorder = Recorder(debug_enabled(st.query_params), session=st.session_state.setdefault("debug_session", new_id()))
+
+@st.cache_resource
+def get_dataset_cache():
+    # One copy of each dataset for the whole process, reloaded when its file changes.
+    return DatasetCache(max_bytes=cache_budget())
+
+def load_data(name, filepath):
     try:
         if not os.path.exists(filepath):
             st.error(f"File not found: {filepath}")
             st.stop()
-        return pd.read_csv(filepath)
+        return get_dataset_cache().get(filepath, name)
     except Exception as e:
         st.error(f"An error occurred while loading the dataset: {e}")
         st.stop()
 
-DATA_PATH = "data/Periodic Table of Elements.csv"
-df = load_data(DATA_PATH)
-
-# Ensure 'Type' column has string values and handle NaN
-df['Type'] = df['Type'].fillna('Unknown').astype(str)
+datasets = discover_datasets()
+default_dataset = dataset_name(DATA_PATH)
+if default_dataset not in datasets:
+    datasets = {default_dataset: DATA_PATH, **datasets}
+dataset_choice = default_dataset
+if len(datasets) > 1:
+    dataset_choice = st.sidebar.selectbox(
+        "Dataset", list(datasets), index=list(datasets).index(default_dataset), key="dataset"
+    )
 
-st.markdown("""
-<style>
-body {
-    background-color: #1a1a1a;
-    color: white;
-}
-
-.periodic-table {
-    overflow-x: auto;
-    padding: 15px;
-    background: #1a1a1a;
-    border-radius: 10px;
-}
-
-.grid {
-    display: grid;
-    grid-template-columns: repeat(18, 70px);
-    gap: 5px;
-    padding: 10px;
-    background: #1a1a1a;
-}
-
-.lanthanides, .actinides {
-    display: grid;
-    grid-template-columns: repeat(15, 70px);
-    gap: 5px;
-    margin-top: 20px;
-    padding: 10px;
-    background: #1a1a1a;
-}
-
-.element {
-    position: relative;
-    width: 70px;
-    height: 70px;
-    border-radius: 5px;
-    cursor: pointer;
-    transition: transform 0.3s ease, box-shadow 0.3s ease;
-    display: flex;
-    flex-direction: column;
-    justify-content: center;
-    align-items: center;
-    font-family: Arial, sans-serif;
-    box-shadow: 0 2px 5px rgba(0, 0, 0, 0.3);
-}
-
-.element:hover {
-    transform: scale(1.1);
-    z-index: 10;
-    box-shadow: 0 5px 15px rgba(0, 0, 0, 0.5);
-}
-
-.element-name {
-    font-size: 10px;
-    margin-top: 5px;
-    color: white;
-}
-
-.element-symbol {
-    font-size: 24px;
-    font-weight: bold;
-    color: white;
-    margin-bottom: 5px;
-}
-
-.element-atomic {
-    font-size: 12px;
-    color: white;
-}
-
-.element-image {
-    position: absolute;
-    width: 100%;
-    height: 100%;
-    object-fit: cover;
-    opacity: 0;
-    transition: opacity 0.3s ease;
-}
-
-.element:hover .element-image {
-    opacity: 1;
-}
-
-/* Element category colors */
-.Alkali-Metal {
-    background-color: #ff7f7f;
-}
-
-.Alkaline-Earth-Metal {
-    background-color: #ffa57f;
-}
-
-.Transition-Metal {
-    background-color: #e6e6fa;
-}
-
-.Post-Transition-Metal {
-    background-color: #b3d9ff;
-}
-
-.Metalloid {
-    background-color: #ffffb3;
-}
-
-.Nonmetal {
-    background-color: #ffb3b3;
-}
-
-.Halogen {
-    background-color: #ffb3ff;
-}
-
-.Noble-Gas {
-    background-color: #b3ffb3;
-}
-
-.Lanthanide {
-    background-color: #b3ffff;
-}
-
-.Actinide {
-    background-color: #ffb3e6;
-}
-
-.Unknown {
-    background-color: #d3d3d3;
-}
-
-/* Sidebar styles */
-.stSidebar {
-    background-color: #2d2d2d;
-}
-
-/* Button styles */
-.stButton>button {
-    min-height: 45px;
-    font-size: 18px;
-    border-radius: 8px;
-    background: #4a90e2;
-    color: white;
-    transition: background 0.3s ease;
-}
-
-.stButton>button:hover {
-    background: #357abd;
-}
-
-/* Input styles */
-.stTextInput>input, .stSelectbox, .stMultiselect {
-    font-size: 16px;
-    border-radius: 8px;
-    padding: 10px;
-    background-color: #333;
-    color: white;
-}
-
-/* Dataframe styles */
-[data-bbox~="0, 0, 960, 780"] {
-    background-color: #222;
-}
-
-/* Tab styles */
-[data-testid="stTab"] {
-    background-color: #222;
-}
-
-/* Expander styles */
-[data-testid="stExpander"] {
-    background-color: #222;
-}
-</style>
-""", unsafe_allow_html=True)
+with recorder.section("data.load"):
+    loaded = load_data(dataset_choice, datasets[dataset_choice])
+
+def dataset_index(kind, df=None, dataset_key=None):
+    # Indexes are built once per dataset and shared by all sessions. They are kept with the
+    # cached dataset rather than in caches of their own, so evicting or reloading it frees them.
+    # Without ``df`` the index is over the loaded dataset, without derived columns.
+    if df is None:
+        df, dataset_key = loaded.df, loaded.key
+    return get_dataset_cache().index(loaded, (kind, dataset_key), lambda: kind(df))
+
+def apply_derived_columns(base_df, base_key):
+    """The dataset plus this session's derived columns, and the cache key for that combination."""
+    engine = dataset_index(ExpressionEngine)
+    definitions = []
+    for name, formula in st.session_state.get("derived_columns", {}).items():
+        try:
+            validate_name(name, base_df)
+            engine.evaluate(formula)
+        except ExpressionError as e:
+            st.sidebar.warning(f"Derived column {name} is not available for this dataset: {e}")
+            continue
+        definitions.append((name, formula))
+    if not definitions:
+        return base_df, base_key
+    definitions = tuple(definitions)
+    # Shared by every session that defines the same columns; the frame shares the dataset's columns.
+    derived = get_dataset_cache().index(loaded, ("derived", definitions), lambda: engine.with_columns(definitions))
+    return derived, f"{base_key}+{definitions_digest(definitions)}"
+
+# Only the views that show derived columns (the range filters, table search, table, export,
+# trends and analytics) use ``df`` and ``dataset_key``; each distinct set of derived columns gets its own
+# copies of their indexes. Everything else uses the loaded dataset's indexes, which adding a
+# derived column leaves alone.
+with recorder.section("data.derived_columns"):
+    df, dataset_key = apply_derived_columns(loaded.df, loaded.key)
+
+st.markdown(APP_CSS, unsafe_allow_html=True)
 
 st.title("⚛️ Periodic Table Explorer")
 st.markdown("""
@@ -217,242 +141,156 @@ with st.sidebar:
         is_metal = st.selectbox("Filter by Metal Type", ["All", "Metal", "Nonmetal", "Metalloid"], index=0)
         is_radioactive = st.selectbox("Filter by Radioactivity", ["All", "Radioactive", "Non-Radioactive"], index=0)
 
-filtered_data = df.copy()
-if element_name:
-    filtered_data = filtered_data[filtered_data['Element'].str.contains(element_name, case=False, na=False)]
-if group:
-    filtered_data = filtered_data[filtered_data['Group'].isin(group)]
-if period:
-    filtered_data = filtered_data[filtered_data['Period'].isin(period)]
-if is_metal != "All":
-    filtered_data = filtered_data[filtered_data["Type"] == is_metal]
-if is_radioactive != "All":
-    filtered_data = filtered_data[filtered_data["Radioactive"] == ("yes" if is_radioactive == "Radioactive" else "no")]
+@st.cache_data(max_entries=64)
+def cached_trend_series(_data, dataset_key, spec, properties, sigma):
+    return trend_series(_data, properties, sigma)
+
+@st.cache_data(max_entries=64)
+def cached_trend_figure(_data, dataset_key, spec, properties, sigma):
+    return build_trend_figure(cached_trend_series(_data, dataset_key, spec, properties, sigma))
+
+with recorder.section("sidebar.filter"):
+    filter_engine = dataset_index(FilterEngine)
+    filter_spec = FilterSpec(
+        name=element_name.strip(),
+        groups=tuple(sorted(group)),
+        periods=tuple(sorted(period)),
+        element_type=None if is_metal == "All" else is_metal,
+        radioactive=None if is_radioactive == "All" else is_radioactive == "Radioactive",
+    )
+    filter_mask = filter_engine.mask(filter_spec)
+    filtered_data = filter_engine.take(filter_mask, df)
 
 tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
     "Interactive Periodic Table", "📊 Data Analysis", "📈 Trend Visualization", 
     "🔬 Analytics", "🖼️ Element Gallery", "🔍 Element Details"
 ])
 
-element_colors = {
-    "Alkali Metal": "#ff7f7f",
-    "Alkaline Earth Metal": "#ffa57f",
-    "Transition Metal": "#e6e6fa",
-    "Post-Transition Metal": "#b3d9ff",
-    "Metalloid": "#ffffb3",
-    "Nonmetal": "#ffb3b3",
-    "Halogen": "#ffb3ff",
-    "Noble Gas": "#b3ffb3",
-    "Lanthanide": "#b3ffff",
-    "Actinide": "#ffb3e6",
-    "Unknown": "#d3d3d3"
-}
-
-
-image_dir = 'images/elements/'
-image_data = {}
-for atomic_number in range(1, 119):
-    image_path = os.path.join(image_dir, f"{atomic_number}.png")
-    if os.path.exists(image_path):
-        with open(image_path, "rb") as f:
-            encoded = base64.b64encode(f.read()).decode('utf-8')
-            image_data[atomic_number] = f"data:image/png;base64,{encoded}"
-    else:
-        image_data[atomic_number] = None
-
-with tab1:
-
-    history_of_periodic_table = """
-    ## History of the Periodic Table
-
-    The periodic table of elements is one of the most significant scientific achievements in history. It organizes all known elements based on their atomic number, electron configurations, and recurring chemical properties. The table was first proposed by **Dmitri Mendeleev** in 1869, who arranged the elements by atomic mass and noticed periodic trends in their properties.
-    
-    ### **Key Milestones:**
-    - **1669:** Hennig Brand discovers phosphorus, marking the beginning of systematic chemical research into the elements.
-    - **1789:** Antoine Lavoisier publishes the first extensive list of elements, distinguishing between metals and non-metals.
-    - **1869:** Dmitri Mendeleev publishes the first version of the periodic table, predicting undiscovered elements based on gaps in the table.
-    - **1913:** Henry Moseley refines the table by arranging elements based on atomic number rather than atomic mass.
-    - **1940s–Present:** Synthetic elements, such as plutonium and seaborgium, are created in laboratories, expanding the periodic table.
-
-    Mendeleev’s original periodic table was remarkable for its predictive power. He left gaps in his table for elements that were not yet discovered but accurately predicted their properties. For example, his prediction of **eka-aluminum** corresponded almost exactly to the properties of gallium, which was discovered later.
-
-    The periodic table continues to evolve as new elements are discovered and as the atomic model becomes more refined. Today, the periodic table not only serves as a tool for chemists but also represents the culmination of centuries of scientific inquiry into the building blocks of matter.
-    """
-
-    basic_info_periodic_table = """
-    ## Basic Information About the Periodic Table
-
-    The periodic table is a tabular arrangement of all known chemical elements. The elements are ordered by their atomic number (the number of protons in the nucleus of an atom), with each element also having a specific electron configuration. It is widely used in chemistry, physics, biology, and engineering.
-
-    ### **Structure of the Periodic Table:**
-    1. **Groups (Columns):** The vertical columns of the periodic table. There are 18 groups, and elements in the same group often have similar chemical properties.
-        - **Group 1:** Alkali metals (e.g., Lithium, Sodium)
-        - **Group 2:** Alkaline Earth metals (e.g., Magnesium, Calcium)
-        - **Groups 3–12:** Transition metals (e.g., Iron, Copper, Zinc)
-        - **Group 17:** Halogens (e.g., Fluorine, Chlorine)
-        - **Group 18:** Noble gases (e.g., Helium, Neon)
-
-    2. **Periods (Rows):** The horizontal rows of the periodic table. There are 7 periods. As you move across a period from left to right, elements transition from metals to nonmetals, and their properties gradually change.
-
-    3. **Blocks of the Periodic Table:**
-        - **s-block:** Includes Groups 1 and 2, along with Helium.
-        - **p-block:** Includes Groups 13 to 18.
-        - **d-block:** Transition metals, which occupy the center of the table.
-        - **f-block:** Lanthanides and Actinides, often displayed separately at the bottom.
-
-    4. **Categories of Elements:**
-        - **Metals:** Found on the left and center of the table, metals are generally shiny, conductive, malleable, and ductile.
-        - **Nonmetals:** Found on the right side of the table, nonmetals are often brittle and are insulators of electricity.
-        - **Metalloids:** Elements with properties intermediate between metals and nonmetals. Examples include boron and silicon.
-
-    5. **Periodic Trends:**
-        - **Atomic Radius:** Decreases across a period and increases down a group.
-        - **Ionization Energy:** Increases across a period and decreases down a group.
-        - **Electronegativity:** Increases across a period and decreases down a group.
-    """
-
-    fun_facts_about_periodic_table = """
-    ## Fun Facts About the Periodic Table
-    1. **Ununseptium to Oganesson:** The most recently discovered elements, including **Oganesson (Og)**, are synthetic and only exist momentarily in laboratories.
-    2. **Gold and Platinum:** These metals are so unreactive that they are often found in their pure forms in nature, unlike most elements.
-    3. **Carbon:** Known as the "King of Elements," carbon forms the backbone of organic chemistry and is the basis for all known life.
-    4. **Helium:** The second most abundant element in the universe is used in everything from party balloons to cooling superconducting magnets in MRI machines.
-    5. **Periodic Table Song:** There is a famous song by Tom Lehrer that lists all the known elements at the time, set to the tune of "The Major General's Song" from Gilbert and Sullivan's *The Pirates of Penzance*.
-    """
-
-    features_modern_chemistry = """
-    ##  Features of Modern Chemistry
-    1. **Synthetic Elements:** As of today, there are 118 elements in the periodic table, with elements beyond uranium (92) being man-made in particle accelerators. These include **plutonium**, **americium**, and **seaborgium**.
-    2. **Isotopes:** Many elements have isotopes, which are atoms of the same element with different numbers of neutrons. Some isotopes, like **Carbon-14**, are used in radiocarbon dating to estimate the age of fossils and artifacts.
-    3. **Superheavy Elements:** Scientists are working to create and study "island of stability" elements, hypothesized to be more stable than other synthetic elements.
-    4. **Element Naming:** The naming of new elements is governed by the International Union of Pure and Applied Chemistry (IUPAC). Names often honor scientists or places, such as **Einsteinium (Es)** or **Moscovium (Mc)**.
-    """
-
-    periodic_table_in_everyday_life = """
-    ## The Periodic Table in Everyday Life
-    1. **In Medicine:** Elements like **Iodine** and **Technetium** are used in medical imaging and treatments.
-    2. **In Technology:** Elements like **Silicon** power the semiconductor industry, while **Lithium** is essential for rechargeable batteries.
-    3. **In Environment:** Noble gases like **Argon** are used in energy-efficient windows, and **Oxygen** is critical for life and industrial processes.
-    4. **In Food and Health:** Trace elements like **Zinc** and **Iron** are crucial for human health, supporting functions like enzyme activity and oxygen transport.
-    """
-
-
-
-    def create_periodic_table(df):
-       
-      
-        grid = [[None for _ in range(MAX_GROUP)] for _ in range(MAX_PERIOD)]
-
-        
-        lanthanides = df[(df['AtomicNumber'] >= 57) & (df['AtomicNumber'] <= 71)]
-        actinides = df[(df['AtomicNumber'] >= 89) & (df['AtomicNumber'] <= 103)]
-
-  
-        for _, row in df.iterrows():
-            if 57 <= row['AtomicNumber'] <= 71 or 89 <= row['AtomicNumber'] <= 103:
-              
-                continue
+@st.cache_resource
+def get_image_store():
+    # Shared by every session; images are encoded on first use only.
+    # Thumbnails are normally prebuilt, this only fills in missing/outdated ones.
+    try:
+        build_thumbnails(IMAGE_DIR, THUMBNAIL_DIR)
+    except OSError:
+        # E.g. a read-only checkout or an unreadable image: serve the full-size images instead.
+        return ImageStore(IMAGE_DIR)
+    return ImageStore(IMAGE_DIR, thumbnail_dir=THUMBNAIL_DIR)
+
+image_store = get_image_store()
+
+@st.cache_resource
+def get_asset_manifest():
+    # With static serving, images are linked as content-hashed files that browsers cache
+    # across reruns and sessions; without it they are inlined as data URIs.
+    if not (st.get_option("server.enableStaticServing") or os.environ.get(ASSET_BASE_URL_ENV)):
+        return None
+    try:
+        publish_assets(IMAGE_DIR, THUMBNAIL_DIR, atlas=atlas_enabled())
+    except OSError:
+        return None
+    return AssetManifest.load()
+
+asset_manifest = get_asset_manifest()
+
+def image_source(atomic_number, width):
+    if asset_manifest is not None:
+        source = asset_manifest.slot(atomic_number, width) or asset_manifest.url(atomic_number, width)
+        if source:
+            return source
+    return image_store.data_uri(atomic_number, width)
+
+@st.cache_data(max_entries=32)
+def gallery_page_html(_index, _mask, dataset_key, spec, page, page_size, columns):
+    # Only the cards on the requested page are built, as one HTML block.
+    entries = _index.page(page, page_size, _mask)
+    width = width_for_columns(columns)
+    return render_gallery_html(entries.rows, lambda atomic_number: image_source(atomic_number, width), columns)
+
+@st.cache_data(max_entries=256)
+def element_details_html(_index, dataset_key, position):
+    return render_details_html(_index.df.iloc[position])
+
+@st.cache_data(max_entries=8)
+def periodic_table_html(_df, dataset_key, colors):
+    # Built once per dataset and color scheme; the table is a single markdown element.
+    return render_periodic_table_html(_df, colors)
+
+# Tabs with widgets are fragments: changing one of their widgets reruns only that tab,
+# while a sidebar change reruns the whole script. count_run keeps per-session counters
+# so this can be checked: a widget change on one tab must only bump that tab's counter, which
+# ``python -m benchmarks.loadtest --isolation-only`` verifies through the debug panel.
+def count_run(section):
+    runs = st.session_state.setdefault("section_runs", {})
+    runs[section] = runs.get(section, 0) + 1
+
+def instrumented(section):
+    # Counts every run of a tab body and, when debugging, times it.
+    def decorate(func):
+        @functools.wraps(func)
+        def run_section(*args, **kwargs):
+            count_run(section)
+            with recorder.section(f"tab.{section}"):
+                return func(*args, **kwargs)
+        return run_section
+    return decorate
+
+with tab1, recorder.section("tab.periodic_table"):
+    st.markdown(HISTORY_OF_PERIODIC_TABLE)
+    st.markdown(BASIC_INFO_PERIODIC_TABLE)
+    table_html = recorder.payload("periodic_table.html", periodic_table_html(loaded.df, loaded.key, ELEMENT_COLORS))
+    st.markdown(table_html, unsafe_allow_html=True)
+    st.markdown(FUN_FACTS_ABOUT_PERIODIC_TABLE)
+    st.markdown(FEATURES_MODERN_CHEMISTRY)
+    st.markdown(PERIODIC_TABLE_IN_EVERYDAY_LIFE)
+
+def derived_columns_editor(df):
+    definitions = st.session_state.get("derived_columns", {})
+    with st.expander("🧮 Derived Columns", expanded=bool(definitions)):
+        st.markdown(
+            "Add numeric columns computed from existing ones, such as molar volume `AtomicMass / Density` "
+            "or `Electronegativity - group_mean(Electronegativity)`. They show up in this table, its range "
+            "filters, search and export, and in the Trend Visualization and Analytics tabs."
+        )
+        name_col, formula_col, add_col = st.columns([2, 5, 1], vertical_alignment="bottom")
+        name = name_col.text_input("Column name", key="derived_name", placeholder="MolarVolume").strip()
+        formula = formula_col.text_input(
+            "Formula",
+            key="derived_formula",
+            placeholder="AtomicMass / Density",
+            help="Numeric column names with + - * / ** %, numbers, "
+                 f"{', '.join(f'{function}()' for function in (*FUNCTIONS, *AGGREGATES))}. "
+                 "Means are taken over the whole dataset (per Group / Period for group_mean / period_mean). "
+                 "Quote other column names with backticks."
+        )
+        if add_col.button("Add", key="derived_add"):
             try:
-                group = int(row['Group']) - 1 if not pd.isnull(row['Group']) else None
-                period = int(row['Period']) - 1 if not pd.isnull(row['Period']) else None
-
-                if group is not None and period is not None:
-                    grid[period][group] = row
-            except (ValueError, KeyError):
-                continue  
-
-
-        for period in range(MAX_PERIOD):
-            cols = st.columns(MAX_GROUP)
-            for group in range(MAX_GROUP):
-                if grid[period][group] is not None:
-                    element = grid[period][group]
-                    symbol = element['Symbol']
-                    atomic_number = element['AtomicNumber']
-                    name = element['Element']
-                    element_type = element['Type']
-                    color = element_colors.get(element_type, "#FFFFFF")  # Default to white if type not found
-
-           
-                    with cols[group]:
-                        st.markdown(
-                            f"""
-                            <div style="text-align: center; background-color: {color}; 
-                                        border-radius: 5px; padding: 10px; margin: 5px; color: #000000;">
-                                <strong>{symbol}</strong><br>
-                                <small>{atomic_number}</small><br>
-                                <small>{name}</small>
-                            </div>
-                            """,
-                            unsafe_allow_html=True
-                        )
-                else:
-                    with cols[group]:
-                        st.markdown("<div style='padding: 10px; margin: 5px;'>&nbsp;</div>", unsafe_allow_html=True)
-
-
-        if len(lanthanides) > 0:
-            st.subheader("Lanthanides")
-            lan_cols = st.columns(len(lanthanides))
-            for i, (_, element) in enumerate(lanthanides.iterrows()):
-                with lan_cols[i]:
-                    symbol = element['Symbol']
-                    atomic_number = element['AtomicNumber']
-                    name = element['Element']
-                    color = element_colors['Lanthanide']
-                    st.markdown(
-                        f"""
-                        <div style="text-align: center; background-color: {color}; 
-                                    border-radius: 5px; padding: 10px; margin: 5px; color: #000000;">
-                            <strong>{symbol}</strong><br>
-                            <small>{atomic_number}</small><br>
-                            <small>{name}</small>
-                        </div>
-                        """,
-                        unsafe_allow_html=True
-                    )
-        else:
-            st.subheader("Lanthanides")
-            st.write("No lanthanides data available.")
-
-        # Render Actinides
-        if len(actinides) > 0:
-            st.subheader("Actinides")
-            act_cols = st.columns(len(actinides))
-            for i, (_, element) in enumerate(actinides.iterrows()):
-                with act_cols[i]:
-                    symbol = element['Symbol']
-                    atomic_number = element['AtomicNumber']
-                    name = element['Element']
-                    color = element_colors['Actinide']
-                    st.markdown(
-                        f"""
-                        <div style="text-align: center; background-color: {color}; 
-                                    border-radius: 5px; padding: 10px; margin: 5px; color: #000000;">
-                            <strong>{symbol}</strong><br>
-                            <small>{atomic_number}</small><br>
-                            <small>{name}</small>
-                        </div>
-                        """,
-                        unsafe_allow_html=True
-                    )
-        else:
-            st.subheader("Actinides")
-            st.write("No actinides data available.")
-
-
-    st.markdown(history_of_periodic_table)
-    st.markdown(basic_info_periodic_table)
-    
-    create_periodic_table(df)    
-    st.markdown(fun_facts_about_periodic_table)
-    st.markdown(features_modern_chemistry)
-    st.markdown(periodic_table_in_everyday_life)
-
-with tab2:
+                validate_name(name, df)
+                dataset_index(ExpressionEngine).evaluate(formula)
+            except ExpressionError as e:
+                st.error(str(e))
+            else:
+                st.session_state["derived_columns"] = {**definitions, name: formula}
+                # Derived columns belong to the dataset, so every tab has to be redrawn.
+                st.rerun()
+
+        for name, formula in definitions.items():
+            label_col, remove_col = st.columns([7, 1], vertical_alignment="center")
+            label_col.markdown(f"`{name}` = `{formula}`")
+            if remove_col.button("Remove", key=f"derived_remove_{name}"):
+                st.session_state["derived_columns"] = {
+                    other: other_formula for other, other_formula in definitions.items() if other != name
+                }
+                st.rerun()
+
+@st.fragment
+@instrumented("data_analysis")
+def data_analysis_tab(df, filter_engine, filter_mask):
     st.subheader("📊 Data Analysis")
     st.markdown("Explore the periodic table data with filtering and statistical analysis.")
 
+    derived_columns_editor(df)
+
     st.markdown("### Column Selection")
     available_columns = df.columns.tolist()
     selected_columns = st.multiselect(
@@ -469,67 +307,101 @@ with tab2:
         search_query = st.text_input(
             "🔍 Search for Specific Values",
             placeholder="Type an element name, symbol, or value...",
-            help="Search for elements across all displayed columns."
+            help="Search all columns. Use `ir*` for prefixes, `Symbol:Fe` to search one column "
+                 "and `Year>1900` (also >=, <, <=, =, !=) to compare numbers."
         )
 
-        filtered_table = filtered_data.copy()
+        # Slider bounds and category options come from the rows left by the sidebar filters,
+        # so moving one slider does not change the others.
+        range_filter = dataset_index(RangeFilter, df, dataset_key)
+        ranges = {}
+        table_mask = filter_mask.copy()
         for column in selected_columns:
-            if filtered_table[column].dtype in ['float64', 'int64']:
-                min_val, max_val = float(filtered_table[column].min()), float(filtered_table[column].max())
-                filter_range = st.slider(
+            values = df[column]
+            if column in range_filter.columns:
+                stats = range_filter.stats(column, filter_mask)
+                if not stats.has_range:
+                    continue
+                ranges[column] = st.slider(
                     f"Filter {column}:",
-                    min_value=min_val,
-                    max_value=max_val,
-                    value=(min_val, max_val),
-                    key=f"slider_{column}"
+                    min_value=stats.min,
+                    max_value=stats.max,
+                    value=(stats.min, stats.max),
+                    key=f"slider_{column}",
+                    help=f"{stats.nulls} filtered rows have no value and are left out." if stats.nulls else None
                 )
-                filtered_table = filtered_table[
-                    (filtered_table[column] >= filter_range[0]) & (filtered_table[column] <= filter_range[1])
-                ]
-            elif filtered_table[column].nunique() <= 10:
-                unique_values = filtered_table[column].dropna().unique()
+                st.caption(f"Distribution: `{sparkline(stats.histogram)}`")
+            elif values[filter_mask].nunique() <= 10:
+                unique_values = values[filter_mask].dropna().unique()
                 selected_values = st.multiselect(
                     f"Select {column}:",
                     options=unique_values,
                     default=unique_values,
                     key=f"multiselect_{column}"
                 )
-                filtered_table = filtered_table[filtered_table[column].isin(selected_values)]
-
+                table_mask &= filter_engine.category_mask(column, selected_values)
+        table_mask = range_filter.mask(ranges, base=table_mask)
         if search_query:
-            filtered_table = filtered_table[
-                filtered_table.apply(lambda row: search_query.lower() in row.to_string().lower(), axis=1)
-            ]
-
-        st.markdown(f"### Filtered Table ({len(filtered_table)} Rows)")
-        styled_table = filtered_table[selected_columns].style.set_properties(**{
-            'background-color': 'rgba(255, 255, 255, 0.1)',
-            'color': 'white',
-            'border': '1px solid rgba(255, 255, 255, 0.2)',
-            'border-radius': '5px',
-            'padding': '8px',
-            'font-family': 'Arial, sans-serif'
-        })
-
-        def highlight_radioactive(row):
-            if 'Radioactive' in row and row['Radioactive'] == 'yes':
-                return ['background-color: rgba(255, 0, 0, 0.2); color: white;'] * len(row)
-            return [''] * len(row)
-
-        styled_table = styled_table.apply(highlight_radioactive, axis=1)
-        st.dataframe(styled_table, use_container_width=True, height=400)
+            try:
+                table_mask &= dataset_index(SearchIndex, df, dataset_key).mask(search_query)
+            except SearchQueryError as e:
+                st.warning(str(e))
+        table_index = dataset_index(TableIndex, df, dataset_key)
+        total_rows = int(table_mask.sum())
+
+        st.markdown(f"### Filtered Table ({total_rows} Rows)")
+        sort_col, order_col, size_col, page_col = st.columns([3, 2, 2, 2])
+        sort_by = sort_col.selectbox("Sort by", ["(dataset order)"] + selected_columns, key="table_sort")
+        descending = order_col.toggle("Descending", key="table_descending")
+        page_size = size_col.selectbox("Rows per page", PAGE_SIZES, index=1, key="table_page_size")
+        page_count = max(1, -(-total_rows // page_size))
+        if st.session_state.get("table_page", 1) > page_count:
+            st.session_state["table_page"] = page_count
+        page = page_col.number_input("Page", min_value=1, max_value=page_count, step=1, key="table_page")
+
+        # Only the visible page is sent to the browser, as typed columns without per-cell styles.
+        table_page = table_index.page(
+            table_mask, selected_columns, page, page_size,
+            sort_by=None if sort_by == "(dataset order)" else sort_by, ascending=not descending
+        )
+        st.caption(f"Page {table_page.page} of {table_page.page_count} · ☢️ marks radioactive elements")
+        st.dataframe(
+            recorder.payload("data_analysis.table_page", table_page.rows),
+            use_container_width=True,
+            height=400,
+            hide_index=True,
+            column_config={MARKER_COLUMN: st.column_config.TextColumn(MARKER_COLUMN, width="small")},
+        )
 
         st.markdown("### Data Download")
-        csv = styled_table.data.to_csv(index=False).encode("utf-8")
-        st.download_button(
-            label="Download Filtered Data",
-            data=csv,
-            file_name="filtered_periodic_table.csv",
-            mime="text/csv",
-            help="Download the filtered table as a CSV file."
-        )
+        # The file is only built when asked for and kept in the session while it matches the rows,
+        # columns and format shown, so paging or sorting the table does not rebuild it. Each session
+        # keeps at most one: exports can be large and are rarely downloaded twice.
+        format_col, prepare_col = st.columns([3, 2], vertical_alignment="bottom")
+        export_format = format_col.selectbox("Format", list(EXPORT_FORMATS), key="export_format")
+        export_key = (dataset_key, mask_digest(table_mask), tuple(selected_columns), export_format)
+        if prepare_col.button("Prepare Download", help="Build the file for the rows and columns shown above."):
+            st.session_state["table_export"] = (
+                export_key, export_bytes(df, table_mask, selected_columns, export_format)
+            )
+        prepared_key, export_data = st.session_state.get("table_export", (None, None))
+        if prepared_key is not None and prepared_key != export_key:
+            del st.session_state["table_export"]  # out of date; free it
+        elif prepared_key is not None:
+            st.download_button(
+                label="Download Filtered Data",
+                data=export_data,
+                file_name=export_file_name("filtered_periodic_table", export_format),
+                mime=EXPORT_FORMATS[export_format].mime,
+                help="Download the filtered table."
+            )
 
-with tab3:
+with tab2:
+    data_analysis_tab(df, filter_engine, filter_mask)
+
+@st.fragment
+@instrumented("trend")
+def trend_tab(filtered_data, filter_spec):
     st.subheader("📈 Trend Visualization")
     st.markdown("Explore how element properties change across the periodic table.")
 
@@ -549,63 +421,115 @@ with tab3:
         use_smoothing = st.checkbox("Apply Smoothing")
         line_style = st.selectbox(
             "Line Style",
-            ["solid", "dash", "dot", "dashdot"],
+            LINE_STYLES,
             index=0
         )
 
-        if trend_properties:
-            data_to_plot = filtered_data.copy()
-            if use_smoothing:
-                for prop in trend_properties:
-                    data_to_plot[prop] = gaussian_filter1d(data_to_plot[prop].fillna(0), sigma=2)
-
-            fig = px.line(
-                data_to_plot,
-                x="AtomicNumber",
-                y=trend_properties,
-                title="Property Trends Across Elements",
-                markers=show_markers,
-                line_dash_sequence=[line_style],
-                color_discrete_sequence=px.colors.qualitative.Bold
+        sigma = None
+        if use_smoothing:
+            sigma = st.slider(
+                "Smoothing Strength (σ)",
+                min_value=0.5,
+                max_value=10.0,
+                value=DEFAULT_SIGMA,
+                step=0.5,
+                help="Standard deviation of the Gaussian kernel, in elements. Missing values are skipped."
             )
 
-            fig.update_layout(
-                title=dict(
-                    text="Property Trends Across Elements",
-                    font=dict(size=24, color="white"),
-                    x=0.5,
-                    y=0.95
-                ),
-                xaxis_title="Atomic Number",
-                yaxis_title="Property Value",
-                legend=dict(
-                    title="Properties",
-                    orientation="h",
-                    yanchor="bottom",
-                    y=1.02,
-                    xanchor="right",
-                    x=1
-                ),
-                hovermode="x unified",
-                template="plotly_dark",
-                margin=dict(l=0, r=0, b=0, t=50),
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)'
-            )
-
-            fig.update_traces(mode="lines+markers" if show_markers else "lines")
-            st.plotly_chart(fig, use_container_width=True)
+        if trend_properties:
+            # The cached figure only depends on the data; markers and dash style are patched on.
+            with recorder.section("trend.figure"):
+                fig = cached_trend_figure(filtered_data, dataset_key, filter_spec, tuple(trend_properties), sigma)
+                style_trend_figure(fig, show_markers=show_markers, line_style=line_style)
+            st.plotly_chart(recorder.payload("trend.figure", fig), use_container_width=True)
 
-with tab4:
+with tab3:
+    trend_tab(filtered_data, filter_spec)
+
+@st.cache_data(max_entries=32)
+def multivariate_figures(_index, _mask, dataset_key, spec, columns, clusters, method, dimensions):
+    # Cached per filter and settings; on a miss the index updates its sums from the previous filter.
+    columns = list(columns)
+    heatmap = build_correlation_heatmap(_index.correlation(columns, _mask), columns)
+    pca = _index.pca(columns, _mask, n_components=dimensions)
+    groups = _index.cluster(columns, _mask, clusters, method, pca=pca)
+    positions = np.flatnonzero(_mask)
+    scores = _index.project(columns, _mask, pca)
+    if len(scores) > DEFAULT_POINT_BUDGET:
+        sample = np.random.default_rng(0).choice(len(scores), DEFAULT_POINT_BUDGET, replace=False)
+        scores, labels, positions = scores[sample], groups.labels[sample], positions[sample]
+    else:
+        labels = groups.labels
+    names = _index.df["Element"].to_numpy()[positions]
+    projection = build_projection_figure(scores, labels, names, pca.explained, dimensions)
+    return heatmap, projection, pca.explained, np.bincount(groups.labels)
+
+def multivariate_view(df, filter_mask, filter_spec):
+    index = dataset_index(MultivariateIndex, df, dataset_key)
+    columns = st.multiselect(
+        "Properties",
+        index.columns,
+        default=[column for column in index.columns if pd.api.types.is_float_dtype(df[column])][:8],
+        help="Numeric columns to correlate and cluster. Missing values are skipped pairwise for "
+             "correlations and replaced by the column mean for PCA and clustering."
+    )
+    settings = st.columns(3)
+    method = settings[0].selectbox(
+        "Clustering", CLUSTER_METHODS, format_func={"kmeans": "k-means", "hierarchical": "Hierarchical (Ward)"}.get
+    )
+    clusters = settings[1].slider("Clusters", min_value=2, max_value=10, value=4)
+    dimensions = settings[2].radio("Projection", [2, 3], format_func="{}D".format, horizontal=True)
+
+    if len(columns) < 2:
+        st.warning("Select at least two properties.")
+        return
+    if filter_mask.sum() < clusters:
+        st.warning("Not enough elements match the filters for this many clusters.")
+        return
+
+    with recorder.section("analytics.multivariate"):
+        heatmap, projection, explained, sizes = multivariate_figures(
+            index, filter_mask, dataset_key, filter_spec, tuple(columns), clusters, method, min(dimensions, len(columns))
+        )
+    st.plotly_chart(recorder.payload("analytics.correlation", heatmap), use_container_width=True)
+    st.caption(
+        f"Explained variance: {', '.join(f'PC{axis + 1} {share:.0%}' for axis, share in enumerate(explained))} · "
+        f"cluster sizes: {', '.join(str(size) for size in sizes)}"
+    )
+    st.plotly_chart(recorder.payload("analytics.projection", projection), use_container_width=True)
+
+@st.cache_data(max_entries=16)
+def scatter_figure(_plot_data, dataset_key, mask_key, atomic_number_range, axes, point_budget, lod_method,
+                   marker_scale, log_scale):
+    # Hovering reruns the fragment; the sample and figure are only rebuilt when an input changes.
+    positions = downsample(_plot_data, axes[:3], point_budget, lod_method)
+    fig = build_scatter_figure(_plot_data, positions, *axes, marker_scale=marker_scale, log_scale=log_scale)
+    return positions, fig
+
+@st.fragment
+@instrumented("analytics")
+def analytics_tab(df, filter_mask, filter_spec, filtered_data):
     st.subheader("🔬 Analytics")
+    mode = st.radio("Mode", ["3D Scatter", "Correlation & Clustering"], horizontal=True, key="analytics_mode")
+    if mode == "Correlation & Clustering":
+        st.markdown("Correlations, principal components and clusters of the selected properties.")
+        multivariate_view(df, filter_mask, filter_spec)
+        return
     st.markdown("Explore 3D relationships between element properties.")
 
-    atomic_number_range = st.slider(
-        "Select Atomic Number Range",
-        min_value=int(filtered_data['AtomicNumber'].min()),
-        max_value=int(filtered_data['AtomicNumber'].max()),
-        value=(int(filtered_data['AtomicNumber'].min()), int(filtered_data['AtomicNumber'].max()))
-    )
+    if filtered_data.empty:
+        st.info("No elements match the sidebar filters.")
+        return
+
+    min_atomic, max_atomic = int(filtered_data['AtomicNumber'].min()), int(filtered_data['AtomicNumber'].max())
+    atomic_number_range = (min_atomic, max_atomic)
+    if min_atomic < max_atomic:
+        atomic_number_range = st.slider(
+            "Select Atomic Number Range",
+            min_value=min_atomic,
+            max_value=max_atomic,
+            value=(min_atomic, max_atomic)
+        )
 
     plot_data = filtered_data[
         (filtered_data['AtomicNumber'] >= atomic_number_range[0]) & 
@@ -622,138 +546,118 @@ with tab4:
         size_property = st.selectbox("Bubble Size Property", numeric_columns, index=3)
         color_property = st.selectbox("Bubble Color Property", numeric_columns, index=4)
 
+        with st.expander("Rendering Options"):
+            point_budget = st.number_input(
+                "Point Budget",
+                min_value=100,
+                value=DEFAULT_POINT_BUDGET,
+                step=1000,
+                help="Above this many points the plot shows a representative sample."
+            )
+            lod_method = st.selectbox(
+                "Sampling Method",
+                LOD_METHODS,
+                format_func={"voxel": "Voxel grid", "stratified": "Stratified by Type"}.get,
+                help="Voxel grid keeps one point per region of the plot; stratified keeps each Type in proportion."
+            )
+
         plot_data = plot_data.dropna(subset=[x_property, y_property, z_property, size_property, color_property])
-        plot_data = plot_data.fillna(0)
 
         if plot_data.empty:
             st.warning("No data available for the selected filters or properties.")
         else:
-            fig = px.scatter_3d(
-                plot_data,
-                x=x_property,
-                y=y_property,
-                z=z_property,
-                size=size_property,
-                color=color_property,
-                hover_name="Element",
-                hover_data=["Symbol", "AtomicNumber", "AtomicMass", "Density", "IonizationEnergy"],
-                title="3D Property Relationships"
-            )
-
             log_scale = st.checkbox("Apply Logarithmic Scale")
-            if log_scale:
-                fig.update_layout(scene=dict(
-                    xaxis=dict(type="log"),
-                    yaxis=dict(type="log"),
-                    zaxis=dict(type="log")
-                ))
-
-            marker_size = st.slider("Bubble Size", min_value=5, max_value=30, value=10)
-            fig.update_traces(marker=dict(size=plot_data[size_property] * marker_size))
-
-            fig.update_layout(
-                title=dict(
-                    text="3D Property Relationships",
-                    font=dict(size=24, color="white"),
-                    x=0.5
-                ),
-                scene=dict(
-                    xaxis_title=x_property,
-                    yaxis_title=y_property,
-                    zaxis_title=z_property,
-                    bgcolor="rgba(0,0,0,0)"
-                ),
-                margin=dict(l=0, r=0, b=0, t=50),
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)'
-            )
+            marker_size = st.slider("Bubble Size", min_value=5, max_value=30, value=DEFAULT_MARKER_SCALE)
 
-            st.plotly_chart(fig, use_container_width=True)
+            with recorder.section("analytics.figure"):
+                positions, fig = scatter_figure(
+                    plot_data, dataset_key, mask_digest(filter_mask), tuple(atomic_number_range),
+                    (x_property, y_property, z_property, size_property, color_property),
+                    int(point_budget), lod_method, marker_size, log_scale
+                )
+            recorder.payload("analytics.figure", fig)
+            if len(positions) < len(plot_data):
+                st.caption(f"Showing {len(positions):,} of {len(plot_data):,} points.")
 
-with tab5:
-    st.subheader("🖼️ Element Gallery")
-    st.markdown("Browse visual representations of elements with their properties.")
+            # Points carry no extra data; details are looked up for the hovered one by its point number.
+            from streamlit_plotly_events import plotly_events
 
-    elements_per_row = st.selectbox("Elements per row", [10, 15, 20], index=0)
-    elements = filtered_data.sort_values("AtomicNumber")["Element"].unique()
-    num_rows = int(np.ceil(len(elements) / elements_per_row))
-
-    for row in range(num_rows):
-        cols = st.columns(elements_per_row)
-        for idx in range(elements_per_row):
-            element_idx = row * elements_per_row + idx
-            if element_idx < len(elements):
-                element_name = elements[element_idx]
-                element_data = filtered_data[filtered_data["Element"] == element_name].iloc[0]
-                with cols[idx]:
-                    if image_data[element_data["AtomicNumber"]]:
-                        st.image(image_data[element_data["AtomicNumber"]], use_container_width=True)
-                    else:
-                        st.write("No image available")
-                    st.markdown(f"""
-                    <div style="background: rgba(255, 255, 255, 0.1); padding: 10px; border-radius: 8px; text-align: center;">
-                        <p><strong>{element_data['Symbol']}</strong></p>
-                        <p style="font-size: 12px; color: white;">{element_data['Element']}</p>
-                        <p style="font-size: 12px; color: white;">{element_data['AtomicNumber']}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
+            hovered = plotly_events(fig, hover_event=True, click_event=False, override_height=600, key="analytics_3d")
+            if hovered:
+                point = hovered[0]
+                details = hover_details(plot_data, positions[point["pointNumber"]])
+                st.markdown(" · ".join(f"**{name}:** {value}" for name, value in details.items()))
+            else:
+                st.caption("Hover over a point to see its details.")
 
+with tab4:
+    analytics_tab(df, filter_mask, filter_spec, filtered_data)
 
+@st.fragment
+@instrumented("gallery")
+def gallery_tab(df, filter_mask, filter_spec):
+    st.subheader("🖼️ Element Gallery")
+    st.markdown("Browse visual representations of elements with their properties.")
 
+    gallery_cols = st.columns(2)
+    with gallery_cols[0]:
+        elements_per_row = st.selectbox("Elements per row", [10, 15, 20], index=0)
+    with gallery_cols[1]:
+        rows_per_page = st.selectbox("Rows per page", [2, 4, 6, 12], index=1)
+    page_size = elements_per_row * rows_per_page
+
+    gallery_index = dataset_index(GalleryIndex)
+    gallery_total = int(filter_mask[gallery_index.order].sum())
+    page_count = max(1, -(-gallery_total // page_size))
+    if st.session_state.get("gallery_page", 1) > page_count:
+        st.session_state["gallery_page"] = page_count
+    gallery_page_number = st.number_input("Page", min_value=1, max_value=page_count, key="gallery_page")
+    st.caption(f"Page {gallery_page_number} of {page_count} · {gallery_total} elements")
+
+    with recorder.section("gallery.images"):
+        page_html = gallery_page_html(
+            gallery_index, filter_mask, loaded.key, filter_spec, gallery_page_number, page_size, elements_per_row
+        )
+    st.markdown(recorder.payload("gallery.page_html", page_html), unsafe_allow_html=True)
 
-with tab6:
+with tab5:
+    gallery_tab(df, filter_mask, filter_spec)
+
+@st.fragment
+@instrumented("details")
+def details_tab(df):
     st.subheader("🔎 Element-Level Details")
 
+    element_index = dataset_index(ElementIndex)
+    # Deep links: ?element=Fe (name, symbol or atomic number) preselects an element.
+    linked = element_index.position(st.query_params.get("element"))
+    if linked is not None and "element_details" not in st.session_state:
+        st.session_state["element_details"] = element_index.df.iloc[linked]["Element"]
+
     selected_element = st.selectbox(
         "Choose an Element for Details", 
-        df["Element"].unique(), 
+        element_index.names, 
         key="element_details"
     )
+    selected_position = element_index.position(selected_element)
+    if linked is not None and linked != selected_position:
+        st.query_params["element"] = element_index.df.iloc[selected_position]["Symbol"]
+
+    details_html = element_details_html(element_index, loaded.key, selected_position)
+    st.markdown(recorder.payload("details.html", details_html), unsafe_allow_html=True)
+    st.markdown(ELEMENT_DEFINITIONS_HTML, unsafe_allow_html=True)
 
- 
-    element_data = df[df["Element"] == selected_element].iloc[0]
-
-
-    st.markdown(f"""
-    <div style="background-color:#f1f1f1; padding: 20px; border-radius: 10px; border: 2px solid #ddd;">
-        <h3 style='color: #2a7d8e; font-weight: bold; text-align: center;'>Element: {element_data['Element']}</h3>
-        <div style="display: flex; flex-wrap: wrap; justify-content: space-between;">
-            <div style="flex-basis: 45%; margin-bottom: 10px;">
-                <p style='font-size: 16px; color: #333;'><strong>Symbol:</strong> {element_data['Symbol']}</p>
-                <p style='font-size: 16px; color: #333;'><strong>Atomic Number:</strong> {element_data['AtomicNumber']}</p>
-                <p style='font-size: 16px; color: #333;'><strong>Atomic Mass:</strong> {element_data['AtomicMass']} g/mol</p>
-                <p style='font-size: 16px; color: #333;'><strong>Density:</strong> {element_data['Density']} g/cm³</p>
-                <p style='font-size: 16px; color: #333;'><strong>Boiling Point:</strong> {element_data['BoilingPoint']} °C</p>
-            </div>
-            <div style="flex-basis: 45%; margin-bottom: 10px;">
-                <p style='font-size: 16px; color: #333;'><strong>Melting Point:</strong> {element_data['MeltingPoint']} °C</p>
-                <p style='font-size: 16px; color: #333;'><strong>Ionization Energy:</strong> {element_data.get('IonizationEnergy', 'N/A')} eV</p>
-                <p style='font-size: 16px; color: #333;'><strong>Electron Affinity:</strong> {element_data.get('ElectronAffinity', 'N/A')} eV</p>
-                <p style='font-size: 16px; color: #333;'><strong>Number of Shells:</strong> {element_data['NumberofShells']}</p>
-                <p style='font-size: 16px; color: #333;'><strong>Valence Electrons:</strong> {element_data['NumberofValence']}</p>
-            </div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-
-    st.markdown("""
-        <hr style='border: 1px solid #ddd;' />
-        <h4 style='color: #2a7d8e;'>Definitions:</h4>
-        <ul>
-            <li><strong>Atomic Number</strong>: The number of protons in the nucleus of an atom, determines the element.</li>
-            <li><strong>Atomic Mass</strong>: The weighted average mass of the atoms in an element.</li>
-            <li><strong>Density</strong>: The mass per unit volume of a substance.</li>
-            <li><strong>Boiling Point</strong>: The temperature at which a substance changes from liquid to gas.</li>
-            <li><strong>Melting Point</strong>: The temperature at which a solid turns into a liquid.</li>
-            <li><strong>Ionization Energy</strong>: The energy required to remove an electron from an atom.</li>
-            <li><strong>Electron Affinity</strong>: The amount of energy released when an electron is added to a neutral atom.</li>
-            <li><strong>Number of Shells</strong>: The number of electron energy levels in an atom.</li>
-            <li><strong>Valence Electrons</strong>: Electrons in the outermost shell of an atom, crucial for chemical bonding.</li>
-        </ul>
-    """, unsafe_allow_html=True)
-
-
-    
+with tab6:
+    details_tab(df)
 
 st.markdown("---")
-st.write("✨ Discover the wonders of chemistry with interactive exploration!")
\ No newline at end of file
+st.write("✨ Discover the wonders of chemistry with interactive exploration!")
+
+if recorder.enabled:
+    with st.expander(f"🛠️ Debug: this run took {recorder.total_ms():.1f} ms", expanded=False):
+        st.caption(f"Session {recorder.session} · run {recorder.run} · section runs {st.session_state.get('section_runs', {})}")
+        st.dataframe(
+            pd.DataFrame(recorder.summary(), columns=["Section / payload", "ms", "bytes"]).astype({"bytes": "Int64"}),
+            use_container_width=True,
+            hide_index=True
+        )
\ No newline at end of file
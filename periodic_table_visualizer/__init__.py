@@ -0,0 +1 @@
+"""Helpers behind the Periodic Table Explorer Streamlit app."""
@@ -0,0 +1,5 @@
+import sys
+
+from periodic_table_visualizer.warmup import main
+
+sys.exit(main())
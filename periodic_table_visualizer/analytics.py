@@ -0,0 +1,137 @@
+"""Scalable 3D scatter rendering for the Analytics tab.
+
+Large datasets are reduced to a point budget before they reach the browser
+(``downsample``) and coordinates are shipped as float32 arrays. Points carry
+no per-row extras: the hovered point's number indexes the sampled row
+positions, and its details are looked up on the server (``hover_details``)
+once the user actually hovers it.
+"""
+import numpy as np
+import pandas as pd
+
+DEFAULT_POINT_BUDGET = 20_000
+LOD_METHODS = ("voxel", "stratified")
+HOVER_COLUMNS = ("Element", "Symbol", "AtomicNumber", "AtomicMass", "Density", "IonizationEnergy")
+
+# Mirrors plotly express: bubble areas are scaled so the largest is this many pixels across
+# at the default marker scale; the Bubble Size slider scales it from there.
+MAX_BUBBLE_PX = 20
+DEFAULT_MARKER_SCALE = 10
+
+
+def _as_float32(series):
+    return series.to_numpy(dtype=np.float32, na_value=np.nan)
+
+
+def voxel_sample(coords, budget, rng, max_cells_per_axis=1024):
+    """Keep one point per occupied cell of a cubic grid.
+
+    The grid starts at about ``budget`` cells and is refined while clustered
+    data leaves less than half of the budget used.
+    """
+    if len(coords) <= budget:
+        return np.arange(len(coords))
+    low = np.nanmin(coords, axis=0)
+    span = np.nanmax(coords, axis=0) - low
+    span[span == 0] = 1
+    unit = (coords - low) / span
+    # Shuffle first so the representative of each voxel is a random member, not the first row.
+    order = rng.permutation(len(coords))
+
+    cells_per_axis = max(1, int(np.floor(budget ** (1 / 3))))
+    while True:
+        cells = np.minimum((unit[order] * cells_per_axis).astype(np.int64), cells_per_axis - 1)
+        voxel_ids = (cells[:, 0] * cells_per_axis + cells[:, 1]) * cells_per_axis + cells[:, 2]
+        _, first = np.unique(voxel_ids, return_index=True)
+        if len(first) >= budget // 2 or cells_per_axis * 2 > max_cells_per_axis:
+            break
+        cells_per_axis *= 2
+
+    kept = order[first]
+    if len(kept) > budget:
+        kept = rng.choice(kept, budget, replace=False)
+    return np.sort(kept)
+
+
+def stratified_sample(strata, budget, rng):
+    """Random sample with each stratum kept in proportion to its size (at least one point each)."""
+    n = len(strata)
+    if n <= budget:
+        return np.arange(n)
+    codes, uniques = pd.factorize(strata, use_na_sentinel=False)
+    counts = np.bincount(codes, minlength=len(uniques))
+    quotas = np.maximum(1, np.floor(counts * budget / n)).astype(np.int64)
+    order = rng.permutation(n)
+    ranks = pd.Series(codes[order]).groupby(codes[order]).cumcount().to_numpy()
+    return np.sort(order[ranks < quotas[codes[order]]])
+
+
+def downsample(df, columns, budget=DEFAULT_POINT_BUDGET, method="voxel", strata="Type", seed=0):
+    """Row positions of ``df`` to plot, at most roughly ``budget`` of them.
+
+    ``columns`` are the (x, y, z) columns used for voxel sampling; rows with a
+    missing coordinate must already have been dropped.
+    """
+    rng = np.random.default_rng(seed)
+    if method == "stratified" and strata in df:
+        return stratified_sample(df[strata].to_numpy(), budget, rng)
+    coords = np.column_stack([_as_float32(df[column]) for column in columns])
+    return voxel_sample(coords, budget, rng)
+
+
+def build_scatter_figure(df, positions, x, y, z, size, color, marker_scale=10, log_scale=False):
+    """3D scatter of ``df.iloc[positions]`` with float32 data.
+
+    The largest bubble is ``MAX_BUBBLE_PX * marker_scale / DEFAULT_MARKER_SCALE`` pixels across.
+    """
+    import plotly.graph_objects as go
+
+    sample = df.iloc[positions]
+    sizes = np.clip(np.nan_to_num(_as_float32(sample[size])), 0, None)
+    max_size = float(np.nanmax(sizes)) if len(sizes) else 0.0
+    max_px = MAX_BUBBLE_PX * marker_scale / DEFAULT_MARKER_SCALE
+
+    fig = go.Figure(go.Scatter3d(
+        x=_as_float32(sample[x]),
+        y=_as_float32(sample[y]),
+        z=_as_float32(sample[z]),
+        mode="markers",
+        marker=dict(
+            size=sizes,
+            sizemode="area",
+            sizeref=2.0 * max_size / max_px ** 2 if max_size > 0 else 1,
+            color=_as_float32(sample[color]),
+            colorbar=dict(title=color),
+            opacity=0.8,
+        ),
+        hovertemplate=f"{x}: %{{x}}<br>{y}: %{{y}}<br>{z}: %{{z}}<extra></extra>",
+    ))
+
+    scene = dict(
+        xaxis_title=x,
+        yaxis_title=y,
+        zaxis_title=z,
+        bgcolor="rgba(0,0,0,0)"
+    )
+    if log_scale:
+        for axis in ("xaxis", "yaxis", "zaxis"):
+            scene[axis] = dict(type="log", title=scene.pop(f"{axis}_title"))
+
+    fig.update_layout(
+        title=dict(
+            text="3D Property Relationships",
+            font=dict(size=24, color="white"),
+            x=0.5
+        ),
+        scene=scene,
+        margin=dict(l=0, r=0, b=0, t=50),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+
+def hover_details(df, position, columns=HOVER_COLUMNS):
+    """The hover fields for one row, looked up only when that point is hovered."""
+    row = df.iloc[int(position)]
+    return {column: row[column] for column in columns if column in row.index}
@@ -0,0 +1,384 @@
+"""Read-only JSON API over the element datasets.
+
+Other tools can query the same data the app shows without scraping it. The
+API loads datasets through ``DatasetCache`` and filters them with the
+sidebar's ``FilterEngine``, the Data Analysis tab's ``SearchIndex`` and
+``TableIndex`` and the Trend tab's ``trend_series``, so the answers match
+the app::
+
+    python -m periodic_table_visualizer.api --port 8503 --workers 8
+
+Endpoints (all ``GET``; each accepts ``dataset=<name>``, default the bundled
+table; ``PTV_DATASETS`` adds datasets as for the app)::
+
+    /datasets                  names of the available datasets
+    /columns                   column names and dtypes
+    /elements/<key>            one element by name, symbol or atomic number
+    /elements                  filtered rows, one page at a time
+    /trends?properties=a,b     trend series of the filtered rows (``sigma`` smooths)
+
+``/elements`` and ``/trends`` take the sidebar filters ``name``, ``group``
+and ``period`` (repeatable or comma-separated), ``type`` and
+``radioactive`` (``true``/``false``), plus a search query ``q`` in the
+Data Analysis syntax. ``/elements`` also takes ``columns`` (comma-separated),
+``sort``, ``order`` (``asc``/``desc``), ``page`` and ``page_size``.
+
+Rendered responses are kept in an LRU keyed on the dataset version and
+the normalized query. Each response has a strong ETag and ``If-None-Match``
+is answered with 304 Not Modified. Bodies are gzipped for clients that
+accept it. Requests are handled by a fixed pool of worker threads.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import NamedTuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from periodic_table_visualizer.caching import LRUCache
+from periodic_table_visualizer.datatable import PAGE_SIZES, TableIndex
+from periodic_table_visualizer.filters import FilterEngine, FilterSpec
+from periodic_table_visualizer.lookup import ElementIndex
+from periodic_table_visualizer.registry import DatasetCache, cache_budget, dataset_name, discover_datasets
+from periodic_table_visualizer.search import SearchIndex, SearchQueryError
+from periodic_table_visualizer.trends import trend_series
+
+DEFAULT_PAGE_SIZE = PAGE_SIZES[1]
+MAX_PAGE_SIZE = 1000
+RESPONSE_CACHE_ENTRIES = 256
+# Smaller bodies are not worth the gzip header and CPU time.
+MIN_GZIP_BYTES = 512
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+logger = logging.getLogger(__name__)
+
+FLAGS = {"true": True, "yes": True, "1": True, "false": False, "no": False, "0": False}
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Response(NamedTuple):
+    status: int
+    body: bytes
+    etag: str
+    gzipped: bytes = None
+
+
+def _response(status, payload, compress=True):
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
+    etag = f'"{hashlib.sha1(body).hexdigest()[:32]}"'
+    gzipped = gzip.compress(body, compresslevel=6, mtime=0) if compress and len(body) >= MIN_GZIP_BYTES else None
+    return Response(status, body, etag, gzipped)
+
+
+def _records(rows):
+    """JSON-ready dicts for ``rows``; float32 values keep their short form (0.79, not 0.790000021)."""
+    rows = rows.copy()
+    for column in rows.columns:
+        if rows[column].dtype == np.float32:
+            rows[column] = rows[column].to_numpy().astype(str).astype(np.float64)
+    return json.loads(rows.to_json(orient="records", double_precision=15, force_ascii=False))
+
+
+def _numbers(values):
+    values = np.asarray(values, dtype=np.float64)
+    return [None if math.isnan(value) else value for value in values.tolist()]
+
+
+def _list_param(params, name):
+    return [item.strip() for value in params.get(name, ()) for item in value.split(",") if item.strip()]
+
+
+def _int_param(params, name, default):
+    values = params.get(name)
+    if not values:
+        return default
+    try:
+        return int(values[-1])
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"{name} must be an integer") from None
+
+
+def _ints(params, name):
+    try:
+        return tuple(sorted({int(value) for value in _list_param(params, name)}))
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"{name} must be integers") from None
+
+
+def filter_spec(params):
+    """The ``FilterSpec`` the sidebar would build for these query parameters."""
+    radioactive = params.get("radioactive", [""])[-1].strip().lower()
+    if radioactive and radioactive not in FLAGS:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "radioactive must be true or false")
+    element_type = params.get("type", [""])[-1].strip()
+    return FilterSpec(
+        name=params.get("name", [""])[-1].strip(),
+        groups=_ints(params, "group"),
+        periods=_ints(params, "period"),
+        element_type=element_type or None,
+        radioactive=FLAGS[radioactive] if radioactive else None,
+    )
+
+
+class QueryIndexes:
+    """The indexes the app builds per dataset, built once per dataset version."""
+
+    def __init__(self, loaded):
+        self.dataset = loaded
+        self.df = loaded.df
+        self.filters = FilterEngine(loaded.df)
+        self.search = SearchIndex(loaded.df)
+        self.elements = ElementIndex(loaded.df)
+        self.table = TableIndex(loaded.df)
+
+    def mask(self, params):
+        mask = self.filters.mask(filter_spec(params))
+        query = params.get("q", [""])[-1].strip()
+        if query:
+            try:
+                mask = mask & self.search.mask(query)
+            except SearchQueryError as e:
+                raise ApiError(HTTPStatus.BAD_REQUEST, str(e)) from None
+        return mask
+
+    def columns(self, names):
+        unknown = [name for name in names if name not in self.df]
+        if unknown:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"Unknown columns: {', '.join(unknown)}")
+        return names or list(self.df.columns)
+
+
+class ElementApi:
+    """Answers API requests; thread-safe, shared by all worker threads."""
+
+    def __init__(self, datasets=None, dataset_cache=None, cache_entries=RESPONSE_CACHE_ENTRIES):
+        from periodic_table_visualizer.core import DATA_PATH
+
+        if datasets is None:
+            # The same choice of datasets as the app's sidebar.
+            datasets = discover_datasets()
+            datasets = {dataset_name(DATA_PATH): DATA_PATH, **datasets}
+        self.datasets = dict(datasets)
+        self.default_dataset = next(iter(self.datasets))
+        self.dataset_cache = dataset_cache or DatasetCache(max_bytes=cache_budget())
+        self.cache_entries = cache_entries
+        self._responses = LRUCache(max_entries=cache_entries)
+        self._lock = threading.Lock()  # guards the hit and miss counters
+        self.hits = self.misses = 0
+
+    def respond(self, target):
+        """The (cached) ``Response`` for a request target such as ``/elements?group=1``."""
+        url = urlsplit(target)
+        path = "/" + unquote(url.path).strip("/")
+        params = {}
+        for name, value in parse_qsl(url.query, keep_blank_values=True):
+            params.setdefault(name, []).append(value)
+        try:
+            indexes = self._dataset_indexes(params.get("dataset", [self.default_dataset])[-1])
+            key = (indexes.dataset.key, path, tuple(sorted((name, tuple(v)) for name, v in params.items())))
+            cached = self._responses.get(key)
+            if cached is not None:
+                with self._lock:
+                    self.hits += 1
+                return cached
+            response = _response(HTTPStatus.OK, self.handle(indexes, path, params))
+        except ApiError as e:
+            return _response(e.status, {"error": str(e)}, compress=False)
+        except Exception:
+            logger.exception("Error answering %s", target)
+            return _response(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal server error"}, compress=False)
+
+        with self._lock:
+            self.misses += 1
+        self._responses.put(key, response)
+        return response
+
+    def handle(self, indexes, path, params):
+        if path == "/datasets":
+            return {"datasets": list(self.datasets), "default": self.default_dataset}
+        if path == "/columns":
+            return {"columns": [{"name": name, "dtype": str(dtype)} for name, dtype in indexes.df.dtypes.items()]}
+        if path == "/elements":
+            return self.elements(indexes, params)
+        if path.startswith("/elements/"):
+            position = indexes.elements.position(path[len("/elements/"):])
+            if position is None:
+                raise ApiError(HTTPStatus.NOT_FOUND, f"Unknown element: {path[len('/elements/'):]}")
+            return _records(indexes.df.iloc[[position]])[0]
+        if path == "/trends":
+            return self.trends(indexes, params)
+        raise ApiError(HTTPStatus.NOT_FOUND, f"Unknown endpoint: {path}")
+
+    def elements(self, indexes, params):
+        columns = indexes.columns(_list_param(params, "columns"))
+        sort_by = params.get("sort", [""])[-1].strip() or None
+        if sort_by is not None:
+            indexes.columns([sort_by])
+        order = params.get("order", ["asc"])[-1].strip().lower()
+        if order not in ("asc", "desc"):
+            raise ApiError(HTTPStatus.BAD_REQUEST, "order must be asc or desc")
+        page_size = _int_param(params, "page_size", DEFAULT_PAGE_SIZE)
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+
+        sorted_rows = indexes.table.sort_order(sort_by, order == "asc")
+        visible = sorted_rows[indexes.mask(params)[sorted_rows]]
+        page_count = max(1, math.ceil(len(visible) / page_size))
+        page = min(max(_int_param(params, "page", 1), 1), page_count)
+        positions = visible[(page - 1) * page_size:page * page_size]
+        return {
+            "dataset": indexes.dataset.name,
+            "total": len(visible),
+            "page": page,
+            "page_count": page_count,
+            "page_size": page_size,
+            "columns": columns,
+            "rows": _records(indexes.df.iloc[positions][columns]),
+        }
+
+    def trends(self, indexes, params):
+        properties = _list_param(params, "properties")
+        if not properties:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "properties is required")
+        indexes.columns(properties)
+        non_numeric = [prop for prop in properties if not pd.api.types.is_numeric_dtype(indexes.df[prop])]
+        if non_numeric:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"Not numeric: {', '.join(non_numeric)}")
+        sigma = params.get("sigma", [""])[-1].strip()
+        try:
+            sigma = float(sigma) if sigma else None
+        except ValueError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "sigma must be a number") from None
+        if sigma is not None and not (math.isfinite(sigma) and sigma >= 0):
+            raise ApiError(HTTPStatus.BAD_REQUEST, "sigma must be a finite number >= 0")
+
+        series = trend_series(indexes.filters.take(indexes.mask(params)), properties, sigma)
+        return {
+            "dataset": indexes.dataset.name,
+            "x": series.x.astype(np.int64).tolist(),
+            "properties": list(series.properties),
+            "values": {prop: _numbers(series.values[:, i]) for i, prop in enumerate(series.properties)},
+            "sigma": series.sigma,
+        }
+
+    def _dataset_indexes(self, name):
+        path = self.datasets.get(name)
+        if path is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"Unknown dataset: {name}")
+        try:
+            loaded = self.dataset_cache.get(path, name)
+        except (OSError, ValueError) as e:
+            raise ApiError(HTTPStatus.SERVICE_UNAVAILABLE, f"Could not load dataset {name}: {e}") from None
+        # Kept with the cached dataset, so they are rebuilt when it is reloaded and freed when it is evicted.
+        return self.dataset_cache.index(loaded, QueryIndexes, lambda: QueryIndexes(loaded))
+
+
+class ApiRequestHandler(BaseHTTPRequestHandler):
+    api = None  # set by ``make_server``
+
+    def do_GET(self):
+        self._send(head_only=False)
+
+    def do_HEAD(self):
+        self._send(head_only=True)
+
+    def _send(self, head_only):
+        response = self.api.respond(self.path)
+        use_gzip = response.gzipped is not None and "gzip" in self.headers.get("Accept-Encoding", "")
+        etag = f'{response.etag[:-1]}-gzip"' if use_gzip else response.etag
+        if response.status == HTTPStatus.OK and _matches(self.headers.get("If-None-Match", ""), response.etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return
+
+        body = response.gzipped if use_gzip else response.body
+        self.send_response(response.status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        if response.status == HTTPStatus.OK:
+            self.send_header("ETag", etag)
+            # Clients may cache, but must revalidate: a changed dataset file changes the answers.
+            self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(body)
+
+
+def _matches(if_none_match, etag):
+    """True if ``If-None-Match`` lists ``etag`` or its gzip variant."""
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags or f'{etag[:-1]}-gzip"' in tags
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTP server that handles requests on a fixed pool of worker threads."""
+
+    # socketserver's default backlog of 5 drops connections under modest bursts.
+    request_queue_size = 128
+
+    def __init__(self, address, handler, workers=DEFAULT_WORKERS):
+        super().__init__(address, handler)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ptv-api")
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=True)
+
+
+def make_server(api, host="127.0.0.1", port=8503, workers=DEFAULT_WORKERS):
+    handler = type("BoundApiRequestHandler", (ApiRequestHandler,), {"api": api})
+    return PooledHTTPServer((host, port), handler, workers)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the element datasets as a cached JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8503)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="request worker threads")
+    parser.add_argument("--cache-entries", type=int, default=RESPONSE_CACHE_ENTRIES,
+                        help="rendered responses kept in memory")
+    args = parser.parse_args(argv)
+    server = make_server(ElementApi(cache_entries=args.cache_entries), args.host, args.port, args.workers)
+    print(f"Serving the element API at http://{args.host}:{server.server_port}/ with {args.workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Element images published as content-hashed static files.
+
+``publish_assets`` copies every original image and thumbnail into
+``static/elements`` under a name that contains a hash of its bytes, e.g.
+``26-128.3f9a1c2e5d7b.webp``, and writes a ``manifest.json`` mapping atomic
+numbers and widths to those names. With ``server.enableStaticServing`` (see
+``.streamlit/config.toml``) Streamlit serves the directory at
+``app/static/``. A URL only changes when the image does, so browsers and
+proxies can keep it for good: Tornado answers with an ETag, and because the
+URL carries ``?v=<hash>`` it also sends a ten-year Cache-Control.
+``static_server`` serves the same files stand-alone, e.g. as a CDN origin;
+point ``PTV_ASSET_BASE_URL`` at it.
+
+Optionally (``PTV_IMAGE_ATLAS=1``) the thumbnails of each width are also
+packed into one sprite sheet with an offsets manifest, so a whole gallery
+page needs a single image request.
+"""
+import json
+import math
+import os
+import shutil
+from typing import NamedTuple
+
+from periodic_table_visualizer.caching import file_digest
+from periodic_table_visualizer.images import IMAGE_DIR
+from periodic_table_visualizer.thumbnails import (
+    THUMBNAIL_DIR,
+    THUMBNAIL_EXTENSION,
+    THUMBNAIL_FORMAT,
+    THUMBNAIL_QUALITY,
+    THUMBNAIL_WIDTHS,
+    thumbnail_path,
+)
+
+STATIC_DIR = "static"
+ASSET_DIR = os.path.join(STATIC_DIR, "elements")
+MANIFEST_NAME = "manifest.json"
+STATIC_URL = "app/static/elements"
+ASSET_BASE_URL_ENV = "PTV_ASSET_BASE_URL"
+ATLAS_ENV = "PTV_IMAGE_ATLAS"
+HASH_LENGTH = 12
+
+
+class AtlasSlot(NamedTuple):
+    """Where one image sits in a sprite sheet, in pixels."""
+
+    url: str
+    x: int
+    y: int
+    width: int
+    height: int
+    sheet_width: int
+    sheet_height: int
+
+
+def atlas_enabled(environ=os.environ):
+    return environ.get(ATLAS_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _publish(source, stem, asset_dir):
+    """Copy ``source`` to ``<stem>.<hash><ext>`` in ``asset_dir`` unless already there."""
+    name = f"{stem}.{file_digest(source)[:HASH_LENGTH]}{os.path.splitext(source)[1].lower()}"
+    target = os.path.join(asset_dir, name)
+    if not os.path.exists(target):
+        partial = f"{target}.partial"
+        shutil.copyfile(source, partial)
+        os.replace(partial, target)
+    return name
+
+
+def build_atlas(sources, asset_dir, width):
+    """Pack ``{atomic_number: image path}`` into one sheet; return its manifest entry."""
+    from PIL import Image
+
+    images = {}
+    for atomic_number, path in sorted(sources.items()):
+        with Image.open(path) as image:
+            images[atomic_number] = image.convert("RGBA")
+    if not images:
+        return None
+    columns = math.ceil(math.sqrt(len(images)))
+    cell_width = max(image.width for image in images.values())
+    cell_height = max(image.height for image in images.values())
+    rows = math.ceil(len(images) / columns)
+    sheet = Image.new("RGBA", (columns * cell_width, rows * cell_height), (0, 0, 0, 0))
+    slots = {}
+    for index, (atomic_number, image) in enumerate(images.items()):
+        x, y = (index % columns) * cell_width, (index // columns) * cell_height
+        sheet.paste(image, (x, y))
+        slots[str(atomic_number)] = [x, y, image.width, image.height]
+
+    partial = os.path.join(asset_dir, f"atlas-{width}.partial{THUMBNAIL_EXTENSION}")
+    sheet.save(partial, THUMBNAIL_FORMAT, quality=THUMBNAIL_QUALITY, method=4)
+    name = f"atlas-{width}.{file_digest(partial)[:HASH_LENGTH]}{THUMBNAIL_EXTENSION}"
+    os.replace(partial, os.path.join(asset_dir, name))
+    return {"file": name, "width": sheet.width, "height": sheet.height, "slots": slots}
+
+
+def publish_assets(image_dir=IMAGE_DIR, thumbnail_dir=THUMBNAIL_DIR, asset_dir=ASSET_DIR,
+                   widths=THUMBNAIL_WIDTHS, atlas=False, originals=True):
+    """Publish hashed copies of the images (and optionally sprite sheets); return the manifest.
+
+    Without ``originals`` only the thumbnails are published (an original is
+    still used for an image that has no thumbnail).
+    """
+    os.makedirs(asset_dir, exist_ok=True)
+    manifest = {"images": {}, "atlases": {}}
+    if os.path.isdir(image_dir):
+        for filename in sorted(os.listdir(image_dir)):
+            stem, ext = os.path.splitext(filename)
+            if ext.lower() != ".png" or not stem.isdigit():
+                continue
+            entry = manifest["images"][str(int(stem))] = {}
+            for width in widths:
+                thumbnail = thumbnail_path(stem, width, thumbnail_dir)
+                if os.path.exists(thumbnail):
+                    entry[str(width)] = _publish(thumbnail, f"{stem}-{width}", asset_dir)
+            if originals or not entry:
+                entry["original"] = _publish(os.path.join(image_dir, filename), stem, asset_dir)
+
+    if atlas:
+        for width in widths:
+            sources = {
+                int(number): thumbnail_path(number, width, thumbnail_dir)
+                for number, entry in manifest["images"].items() if str(width) in entry
+            }
+            sheet = build_atlas(sources, asset_dir, width)
+            if sheet:
+                manifest["atlases"][str(width)] = sheet
+
+    # Drop files left over from earlier versions of the images.
+    published = {name for entry in manifest["images"].values() for name in entry.values()}
+    published.update(sheet["file"] for sheet in manifest["atlases"].values())
+    for filename in os.listdir(asset_dir):
+        if filename != MANIFEST_NAME and filename not in published:
+            os.remove(os.path.join(asset_dir, filename))
+
+    partial = os.path.join(asset_dir, f"{MANIFEST_NAME}.partial")
+    with open(partial, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(partial, os.path.join(asset_dir, MANIFEST_NAME))
+    return manifest
+
+
+def _versioned(base_url, name):
+    digest = name.rsplit(".", 2)[-2]
+    return f"{base_url}/{name}?v={digest}"
+
+
+class AssetManifest:
+    """URLs of the published images, as listed in ``manifest.json``."""
+
+    def __init__(self, manifest, base_url=None):
+        self.images = manifest.get("images", {})
+        self.atlases = manifest.get("atlases", {})
+        self.base_url = (base_url or os.environ.get(ASSET_BASE_URL_ENV) or STATIC_URL).rstrip("/")
+
+    @classmethod
+    def load(cls, asset_dir=ASSET_DIR, base_url=None):
+        """The manifest in ``asset_dir``, or None if nothing has been published there."""
+        try:
+            with open(os.path.join(asset_dir, MANIFEST_NAME), encoding="utf-8") as f:
+                return cls(json.load(f), base_url)
+        except (OSError, ValueError):
+            return None
+
+    def __len__(self):
+        return len(self.images)
+
+    def url(self, atomic_number, width=None):
+        """URL of the smallest published variant at least ``width`` wide (or the original)."""
+        entry = self.images.get(str(int(atomic_number)))
+        if not entry:
+            return None
+        if width is not None:
+            for candidate in sorted(int(key) for key in entry if key.isdigit()):
+                if candidate >= width:
+                    return _versioned(self.base_url, entry[str(candidate)])
+        if "original" not in entry:
+            return _versioned(self.base_url, entry[str(max(int(key) for key in entry if key.isdigit()))])
+        return _versioned(self.base_url, entry["original"])
+
+    def slot(self, atomic_number, width):
+        """The image's place in the ``width`` sprite sheet, or None without one."""
+        sheet = self.atlases.get(str(width))
+        position = sheet and sheet["slots"].get(str(int(atomic_number)))
+        if not position:
+            return None
+        return AtlasSlot(_versioned(self.base_url, sheet["file"]), *position, sheet["width"], sheet["height"])
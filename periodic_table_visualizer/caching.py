@@ -0,0 +1,111 @@
+"""Caching helpers shared by the data layer, the API and the asset pipeline.
+
+``LRUCache`` is the one bounded, thread-safe LRU behind the dataset, image,
+response, ETag and statistics caches. ``file_digest`` is the content hash
+used for dataset caches, published asset names and ETags. ``readonly``
+marks arrays that are cached and shared between callers.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """Hex SHA-256 of the file at ``path``, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def readonly(array):
+    """``array``, made read-only so a cached result cannot be changed by one of its users."""
+    array.flags.writeable = False
+    return array
+
+
+class LRUCache:
+    """Thread-safe mapping that drops its least recently used items.
+
+    Items beyond ``max_entries``, or beyond ``max_bytes`` as measured by
+    ``size(value)``, are evicted oldest first. The item stored last is always
+    kept, even if it alone exceeds ``max_bytes``.
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None, size=len):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._size = size
+        self._items = OrderedDict()  # key -> (value, size)
+        self._resident_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def resident_bytes(self):
+        return self._resident_bytes
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, default=None):
+        """The value for ``key`` (now the most recently used), or ``default``."""
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return default
+            self._items.move_to_end(key)
+            return item[0]
+
+    def put(self, key, value):
+        nbytes = self._size(value) if self.max_bytes is not None else 0
+        with self._lock:
+            self._discard(key)
+            self._items[key] = (value, nbytes)
+            self._resident_bytes += nbytes
+            self._evict()
+
+    def refresh(self, key):
+        """Measure ``key``'s value again, e.g. after it grew; it becomes the most recently used."""
+        item = self._items.get(key)
+        if item is None or self.max_bytes is None:
+            return
+        nbytes = self._size(item[0])
+        with self._lock:
+            if self._items.get(key) is not item:
+                return  # replaced or evicted meanwhile
+            self._items[key] = (item[0], nbytes)
+            self._items.move_to_end(key)
+            self._resident_bytes += nbytes - item[1]
+            self._evict()
+
+    def pop(self, key, default=None):
+        with self._lock:
+            item = self._items.get(key)
+            self._discard(key)
+        return default if item is None else item[0]
+
+    def values(self):
+        with self._lock:
+            return [value for value, _ in self._items.values()]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._resident_bytes = 0
+
+    def _evict(self):
+        # Oldest first; the most recently used item always stays.
+        while len(self._items) > 1 and (
+            (self.max_entries is not None and len(self._items) > self.max_entries)
+            or (self.max_bytes is not None and self._resident_bytes > self.max_bytes)
+        ):
+            self._discard(next(iter(self._items)))
+
+    def _discard(self, key):
+        item = self._items.pop(key, None)
+        if item is not None:
+            self._resident_bytes -= item[1]
@@ -0,0 +1,296 @@
+"""Static text and styles shown by the Streamlit app."""
+
+APP_CSS = """<style>
+body {
+    background-color: #1a1a1a;
+    color: white;
+}
+
+.periodic-table {
+    overflow-x: auto;
+    padding: 15px;
+    background: #1a1a1a;
+    border-radius: 10px;
+}
+
+.grid {
+    display: grid;
+    grid-template-columns: repeat(18, 70px);
+    gap: 5px;
+    padding: 10px;
+    background: #1a1a1a;
+}
+
+.lanthanides, .actinides {
+    display: grid;
+    grid-template-columns: repeat(15, 70px);
+    gap: 5px;
+    margin-top: 20px;
+    padding: 10px;
+    background: #1a1a1a;
+}
+
+.element {
+    position: relative;
+    width: 70px;
+    height: 70px;
+    border-radius: 5px;
+    cursor: pointer;
+    transition: transform 0.3s ease, box-shadow 0.3s ease;
+    display: flex;
+    flex-direction: column;
+    justify-content: center;
+    align-items: center;
+    font-family: Arial, sans-serif;
+    box-shadow: 0 2px 5px rgba(0, 0, 0, 0.3);
+}
+
+.element:hover {
+    transform: scale(1.1);
+    z-index: 10;
+    box-shadow: 0 5px 15px rgba(0, 0, 0, 0.5);
+}
+
+.element-name {
+    font-size: 10px;
+    margin-top: 2px;
+    color: inherit;
+}
+
+.element-symbol {
+    font-size: 24px;
+    font-weight: bold;
+    color: inherit;
+}
+
+.element-atomic {
+    font-size: 12px;
+    color: inherit;
+}
+
+.element-image {
+    position: absolute;
+    width: 100%;
+    height: 100%;
+    object-fit: cover;
+    opacity: 0;
+    transition: opacity 0.3s ease;
+}
+
+.element:hover .element-image {
+    opacity: 1;
+}
+
+/* Element gallery */
+.gallery {
+    display: grid;
+    gap: 10px;
+}
+
+.gallery-card {
+    background: rgba(255, 255, 255, 0.1);
+    padding: 10px;
+    border-radius: 8px;
+    text-align: center;
+}
+
+.gallery-card img {
+    width: 100%;
+    height: auto;
+    border-radius: 4px;
+}
+
+.gallery-sprite {
+    width: 100%;
+    background-repeat: no-repeat;
+    border-radius: 4px;
+}
+
+.gallery-card p {
+    margin: 4px 0;
+}
+
+.gallery-caption, .gallery-missing {
+    font-size: 12px;
+    color: white;
+}
+
+/* Element category colors */
+.Alkali-Metal {
+    background-color: #ff7f7f;
+}
+
+.Alkaline-Earth-Metal {
+    background-color: #ffa57f;
+}
+
+.Transition-Metal {
+    background-color: #e6e6fa;
+}
+
+.Post-Transition-Metal {
+    background-color: #b3d9ff;
+}
+
+.Metalloid {
+    background-color: #ffffb3;
+}
+
+.Nonmetal {
+    background-color: #ffb3b3;
+}
+
+.Halogen {
+    background-color: #ffb3ff;
+}
+
+.Noble-Gas {
+    background-color: #b3ffb3;
+}
+
+.Lanthanide {
+    background-color: #b3ffff;
+}
+
+.Actinide {
+    background-color: #ffb3e6;
+}
+
+.Unknown {
+    background-color: #d3d3d3;
+}
+
+/* Sidebar styles */
+.stSidebar {
+    background-color: #2d2d2d;
+}
+
+/* Button styles */
+.stButton>button {
+    min-height: 45px;
+    font-size: 18px;
+    border-radius: 8px;
+    background: #4a90e2;
+    color: white;
+    transition: background 0.3s ease;
+}
+
+.stButton>button:hover {
+    background: #357abd;
+}
+
+/* Input styles */
+.stTextInput>input, .stSelectbox, .stMultiselect {
+    font-size: 16px;
+    border-radius: 8px;
+    padding: 10px;
+    background-color: #333;
+    color: white;
+}
+
+/* Dataframe styles */
+[data-bbox~="0, 0, 960, 780"] {
+    background-color: #222;
+}
+
+/* Tab styles */
+[data-testid="stTab"] {
+    background-color: #222;
+}
+
+/* Expander styles */
+[data-testid="stExpander"] {
+    background-color: #222;
+}
+</style>
+"""
+
+HISTORY_OF_PERIODIC_TABLE = """
+## History of the Periodic Table
+
+The periodic table of elements is one of the most significant scientific achievements in history. It organizes all known elements based on their atomic number, electron configurations, and recurring chemical properties. The table was first proposed by **Dmitri Mendeleev** in 1869, who arranged the elements by atomic mass and noticed periodic trends in their properties.
+
+### **Key Milestones:**
+- **1669:** Hennig Brand discovers phosphorus, marking the beginning of systematic chemical research into the elements.
+- **1789:** Antoine Lavoisier publishes the first extensive list of elements, distinguishing between metals and non-metals.
+- **1869:** Dmitri Mendeleev publishes the first version of the periodic table, predicting undiscovered elements based on gaps in the table.
+- **1913:** Henry Moseley refines the table by arranging elements based on atomic number rather than atomic mass.
+- **1940s–Present:** Synthetic elements, such as plutonium and seaborgium, are created in laboratories, expanding the periodic table.
+
+Mendeleev’s original periodic table was remarkable for its predictive power. He left gaps in his table for elements that were not yet discovered but accurately predicted their properties. For example, his prediction of **eka-aluminum** corresponded almost exactly to the properties of gallium, which was discovered later.
+
+The periodic table continues to evolve as new elements are discovered and as the atomic model becomes more refined. Today, the periodic table not only serves as a tool for chemists but also represents the culmination of centuries of scientific inquiry into the building blocks of matter.
+"""
+
+BASIC_INFO_PERIODIC_TABLE = """
+## Basic Information About the Periodic Table
+
+The periodic table is a tabular arrangement of all known chemical elements. The elements are ordered by their atomic number (the number of protons in the nucleus of an atom), with each element also having a specific electron configuration. It is widely used in chemistry, physics, biology, and engineering.
+
+### **Structure of the Periodic Table:**
+1. **Groups (Columns):** The vertical columns of the periodic table. There are 18 groups, and elements in the same group often have similar chemical properties.
+    - **Group 1:** Alkali metals (e.g., Lithium, Sodium)
+    - **Group 2:** Alkaline Earth metals (e.g., Magnesium, Calcium)
+    - **Groups 3–12:** Transition metals (e.g., Iron, Copper, Zinc)
+    - **Group 17:** Halogens (e.g., Fluorine, Chlorine)
+    - **Group 18:** Noble gases (e.g., Helium, Neon)
+
+2. **Periods (Rows):** The horizontal rows of the periodic table. There are 7 periods. As you move across a period from left to right, elements transition from metals to nonmetals, and their properties gradually change.
+
+3. **Blocks of the Periodic Table:**
+    - **s-block:** Includes Groups 1 and 2, along with Helium.
+    - **p-block:** Includes Groups 13 to 18.
+    - **d-block:** Transition metals, which occupy the center of the table.
+    - **f-block:** Lanthanides and Actinides, often displayed separately at the bottom.
+
+4. **Categories of Elements:**
+    - **Metals:** Found on the left and center of the table, metals are generally shiny, conductive, malleable, and ductile.
+    - **Nonmetals:** Found on the right side of the table, nonmetals are often brittle and are insulators of electricity.
+    - **Metalloids:** Elements with properties intermediate between metals and nonmetals. Examples include boron and silicon.
+
+5. **Periodic Trends:**
+    - **Atomic Radius:** Decreases across a period and increases down a group.
+    - **Ionization Energy:** Increases across a period and decreases down a group.
+    - **Electronegativity:** Increases across a period and decreases down a group.
+"""
+
+FUN_FACTS_ABOUT_PERIODIC_TABLE = """
+## Fun Facts About the Periodic Table
+1. **Ununseptium to Oganesson:** The most recently discovered elements, including **Oganesson (Og)**, are synthetic and only exist momentarily in laboratories.
+2. **Gold and Platinum:** These metals are so unreactive that they are often found in their pure forms in nature, unlike most elements.
+3. **Carbon:** Known as the "King of Elements," carbon forms the backbone of organic chemistry and is the basis for all known life.
+4. **Helium:** The second most abundant element in the universe is used in everything from party balloons to cooling superconducting magnets in MRI machines.
+5. **Periodic Table Song:** There is a famous song by Tom Lehrer that lists all the known elements at the time, set to the tune of "The Major General's Song" from Gilbert and Sullivan's *The Pirates of Penzance*.
+"""
+
+FEATURES_MODERN_CHEMISTRY = """
+##  Features of Modern Chemistry
+1. **Synthetic Elements:** As of today, there are 118 elements in the periodic table, with elements beyond uranium (92) being man-made in particle accelerators. These include **plutonium**, **americium**, and **seaborgium**.
+2. **Isotopes:** Many elements have isotopes, which are atoms of the same element with different numbers of neutrons. Some isotopes, like **Carbon-14**, are used in radiocarbon dating to estimate the age of fossils and artifacts.
+3. **Superheavy Elements:** Scientists are working to create and study "island of stability" elements, hypothesized to be more stable than other synthetic elements.
+4. **Element Naming:** The naming of new elements is governed by the International Union of Pure and Applied Chemistry (IUPAC). Names often honor scientists or places, such as **Einsteinium (Es)** or **Moscovium (Mc)**.
+"""
+
+PERIODIC_TABLE_IN_EVERYDAY_LIFE = """
+## The Periodic Table in Everyday Life
+1. **In Medicine:** Elements like **Iodine** and **Technetium** are used in medical imaging and treatments.
+2. **In Technology:** Elements like **Silicon** power the semiconductor industry, while **Lithium** is essential for rechargeable batteries.
+3. **In Environment:** Noble gases like **Argon** are used in energy-efficient windows, and **Oxygen** is critical for life and industrial processes.
+4. **In Food and Health:** Trace elements like **Zinc** and **Iron** are crucial for human health, supporting functions like enzyme activity and oxygen transport.
+"""
+
+ELEMENT_DEFINITIONS_HTML = """
+<hr style='border: 1px solid #ddd;' />
+<h4 style='color: #2a7d8e;'>Definitions:</h4>
+<ul>
+    <li><strong>Atomic Number</strong>: The number of protons in the nucleus of an atom, determines the element.</li>
+    <li><strong>Atomic Mass</strong>: The weighted average mass of the atoms in an element.</li>
+    <li><strong>Density</strong>: The mass per unit volume of a substance.</li>
+    <li><strong>Boiling Point</strong>: The temperature at which a substance changes from liquid to gas.</li>
+    <li><strong>Melting Point</strong>: The temperature at which a solid turns into a liquid.</li>
+    <li><strong>Ionization Energy</strong>: The energy required to remove an electron from an atom.</li>
+    <li><strong>Electron Affinity</strong>: The amount of energy released when an electron is added to a neutral atom.</li>
+    <li><strong>Number of Shells</strong>: The number of electron energy levels in an atom.</li>
+    <li><strong>Valence Electrons</strong>: Electrons in the outermost shell of an atom, crucial for chemical bonding.</li>
+</ul>
+"""
@@ -0,0 +1,77 @@
+"""Headless API over the periodic table data layer.
+
+Everything here works without Streamlit, so batch jobs, benchmarks and load
+tests can drive the same code paths as the app::
+
+    from periodic_table_visualizer import core
+
+    df = core.load_dataset()
+    halogens = core.filter_elements(df, element_type="Halogen")
+    grid, lanthanides, actinides = core.layout_grid(df)
+    series = core.trend_series(halogens, ["AtomicRadius"], sigma=2)
+    page = core.gallery_page(df, page=1, page_size=20)
+
+``main.py`` is a thin Streamlit view over these functions.
+"""
+import os
+
+from periodic_table_visualizer import dataset
+from periodic_table_visualizer.filters import FilterEngine, FilterSpec
+from periodic_table_visualizer.gallery import GalleryIndex, GalleryPage
+from periodic_table_visualizer.layout import layout_grid, render_periodic_table_html
+from periodic_table_visualizer.registry import DatasetCache, discover_datasets
+from periodic_table_visualizer.trends import trend_series
+
+__all__ = [
+    "DATA_PATH",
+    "DatasetCache",
+    "FilterEngine",
+    "FilterSpec",
+    "GalleryIndex",
+    "GalleryPage",
+    "discover_datasets",
+    "filter_elements",
+    "gallery_page",
+    "layout_grid",
+    "load_dataset",
+    "render_periodic_table_html",
+    "trend_series",
+]
+
+DATA_PATH = os.path.join("data", "Periodic Table of Elements.csv")
+
+
+def load_dataset(path=DATA_PATH, cache_dir=dataset.DATASET_CACHE_DIR):
+    """Load a dataset with typed columns (see ``dataset.load_dataset``)."""
+    return dataset.load_dataset(path, cache_dir)
+
+
+def filter_elements(df, spec=None, engine=None, **filters):
+    """Rows of ``df`` matching the sidebar filters.
+
+    Pass either a ``FilterSpec`` or its fields as keyword arguments
+    (``name``, ``groups``, ``periods``, ``element_type``, ``radioactive``).
+    Building the indexes is the expensive part, so callers filtering the
+    same frame repeatedly should pass a ``FilterEngine`` built on it.
+    """
+    if spec is None:
+        spec = FilterSpec(**{key: tuple(value) if isinstance(value, list) else value for key, value in filters.items()})
+    elif filters:
+        raise TypeError("Pass either a FilterSpec or filter keyword arguments, not both")
+    if engine is None:
+        engine = FilterEngine(df)
+    elif engine.df is not df:
+        raise ValueError("engine was built for a different DataFrame")
+    return engine.filter(spec)
+
+
+def gallery_page(df, page=1, page_size=None, index=None):
+    """One page of gallery entries (one per element, in atomic-number order).
+
+    ``page`` is 1-based and clamped to the available pages; without a
+    ``page_size`` every element is on a single page. Pass a ``GalleryIndex``
+    built on ``df`` to avoid re-sorting it on every call.
+    """
+    if index is None:
+        index = GalleryIndex(df)
+    return index.page(page, page_size)
@@ -0,0 +1,128 @@
+"""Typed loading of the element CSV with a columnar on-disk cache.
+
+``load_dataset`` parses the CSV once, converts it to the compact dtypes in
+``ELEMENT_SCHEMA`` and stores the result as an uncompressed Feather file
+next to the other caches, named after the CSV's path and content hash.
+Later loads of the same CSV read that binary file instead of parsing text
+again; the columns are still converted to the same NumPy-backed pandas
+dtypes, so this is a fast cache rather than a zero-copy view. Writing a new
+cache for a CSV removes the one for its previous contents. Columns not
+listed in the schema keep pandas' inferred dtype, so other CSVs can be
+loaded too.
+"""
+import glob
+import hashlib
+import os
+
+import pandas as pd
+
+from periodic_table_visualizer.caching import file_digest
+
+DATASET_CACHE_DIR = os.path.join(".cache", "datasets")
+
+# Bump when ELEMENT_SCHEMA or the conversion rules change, to invalidate old caches.
+SCHEMA_VERSION = 1
+
+TRUE_FLAGS = ("yes", "true", "1")
+
+ELEMENT_SCHEMA = {
+    "AtomicNumber": "int16",
+    "Element": "string",
+    "Symbol": "string",
+    "AtomicMass": "float64",
+    "NumberofNeutrons": "int16",
+    "NumberofProtons": "int16",
+    "NumberofElectrons": "int16",
+    "Period": "Int8",
+    "Group": "Int8",
+    "Phase": "category",
+    "Radioactive": "bool",
+    "Natural": "bool",
+    "Metal": "bool",
+    "Nonmetal": "bool",
+    "Metalloid": "bool",
+    "Type": "category",
+    "AtomicRadius": "float32",
+    "Electronegativity": "float32",
+    "IonizationEnergy": "float32",
+    "Density": "float32",
+    "MeltingPoint": "float32",
+    "BoilingPoint": "float32",
+    "NumberOfIsotopes": "Int16",
+    "Discoverer": "string",
+    "Year": "Int16",
+    "SpecificHeat": "float32",
+    "NumberofShells": "Int8",
+    "NumberofValence": "Int8",
+}
+
+# Applied before the dtype conversion.
+FILL_VALUES = {"Type": "Unknown"}
+
+
+def flag_values(series):
+    """Interpret a yes/no style column as booleans (missing counts as "no")."""
+    if pd.api.types.is_bool_dtype(series):
+        return series.fillna(False).to_numpy(dtype=bool)
+    return series.astype("string").str.strip().str.lower().isin(TRUE_FLAGS).to_numpy(dtype=bool)
+
+
+def apply_schema(df, schema=ELEMENT_SCHEMA):
+    """Return ``df`` with the columns listed in ``schema`` converted to their dtypes."""
+    converted = {}
+    for column, dtype in schema.items():
+        if column not in df:
+            continue
+        values = df[column]
+        if column in FILL_VALUES:
+            values = values.fillna(FILL_VALUES[column])
+        if dtype == "bool":
+            converted[column] = pd.Series(flag_values(values), index=df.index, name=column)
+        else:
+            converted[column] = values.astype(dtype)
+    return df.assign(**converted)
+
+
+def read_csv_typed(path, schema=ELEMENT_SCHEMA):
+    return apply_schema(pd.read_csv(path), schema)
+
+
+def _cache_prefix(path, cache_dir):
+    # The source path is part of the name so that CSVs with the same file name don't share caches.
+    stem = os.path.splitext(os.path.basename(path))[0].replace(" ", "_")
+    source = hashlib.sha256(os.path.abspath(path).encode("utf-8")).hexdigest()[:8]
+    return os.path.join(cache_dir, f"{stem}-{source}-")
+
+
+def cache_path(path, cache_dir=DATASET_CACHE_DIR):
+    return f"{_cache_prefix(path, cache_dir)}v{SCHEMA_VERSION}-{file_digest(path)[:16]}.feather"
+
+
+def _remove_stale_caches(path, cache_dir, current):
+    for stale in glob.glob(f"{glob.escape(_cache_prefix(path, cache_dir))}v*.feather"):
+        if stale != current:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+
+def load_dataset(path, cache_dir=DATASET_CACHE_DIR, schema=ELEMENT_SCHEMA):
+    """Load ``path`` with typed columns, going through the Feather cache when possible."""
+    from pyarrow import feather
+
+    cached = cache_path(path, cache_dir)
+    if os.path.exists(cached):
+        return feather.read_table(cached, memory_map=True).to_pandas()
+
+    df = read_csv_typed(path, schema)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        partial = f"{cached}.partial"
+        feather.write_feather(df, partial, compression="uncompressed")
+        os.replace(partial, cached)
+        _remove_stale_caches(path, cache_dir, cached)
+    except OSError:
+        # A read-only checkout still works, it just parses the CSV every time.
+        pass
+    return df
@@ -0,0 +1,63 @@
+"""Server-side sorting and pagination for the Data Analysis table.
+
+Instead of styling every cell with a pandas ``Styler``, the table sends the
+typed columns of one page to ``st.dataframe``. Sorting uses a per-column
+order computed once per dataset; for a given filter mask the visible order
+is a vectorized selection from it, so sorting a filtered table never
+re-sorts. Radioactive rows are marked by a flag column computed from the
+whole column at once rather than by per-row cell styles.
+"""
+import math
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+from periodic_table_visualizer.caching import readonly
+from periodic_table_visualizer.dataset import flag_values
+
+RADIOACTIVE_MARKER = "☢️"
+MARKER_COLUMN = " "
+PAGE_SIZES = (50, 100, 250, 500)
+
+
+class TablePage(NamedTuple):
+    rows: object  # pandas.DataFrame
+    page: int
+    page_count: int
+    total: int
+
+
+class TableIndex:
+    def __init__(self, df):
+        self.df = df
+        self._sort_order = lru_cache(maxsize=64)(self._compute_sort_order)
+        self._markers = None
+        if "Radioactive" in df:
+            self._markers = np.where(flag_values(df["Radioactive"]), RADIOACTIVE_MARKER, "")
+
+    def sort_order(self, column=None, ascending=True):
+        """Row positions of the whole dataset sorted by ``column`` (missing values last)."""
+        return self._sort_order(column, ascending)
+
+    def _compute_sort_order(self, column, ascending):
+        if column is None:
+            return np.arange(len(self.df))
+        order = self.df[column].reset_index(drop=True).sort_values(
+            ascending=ascending, kind="stable", na_position="last"
+        ).index.to_numpy()
+        return readonly(order)
+
+    def page(self, mask, columns, page=1, page_size=PAGE_SIZES[1], sort_by=None, ascending=True):
+        """One page of ``columns`` for the rows in ``mask``, in sorted order."""
+        order = self.sort_order(sort_by, ascending)
+        visible = order[mask[order]]
+        total = len(visible)
+        page_count = max(1, math.ceil(total / page_size))
+        page = min(max(int(page), 1), page_count)
+        positions = visible[(page - 1) * page_size:page * page_size]
+
+        rows = self.df.iloc[positions][list(columns)]
+        if self._markers is not None:
+            rows.insert(0, MARKER_COLUMN, self._markers[positions])
+        return TablePage(rows, page, page_count, total)
@@ -0,0 +1,95 @@
+"""Chunked export of the filtered Data Analysis table.
+
+An export is only produced when it is requested. Rows are written in
+chunks of ``CHUNK_ROWS`` straight into the output buffer (through gzip for
+compressed CSV, or as Parquet row groups), so the full CSV text or a full
+copy of the filtered frame never exists alongside the output.
+"""
+import gzip
+import io
+from typing import NamedTuple
+
+import numpy as np
+
+CHUNK_ROWS = 50_000
+
+
+class ExportFormat(NamedTuple):
+    extension: str
+    mime: str
+
+
+EXPORT_FORMATS = {
+    "CSV": ExportFormat(".csv", "text/csv"),
+    "CSV (gzip)": ExportFormat(".csv.gz", "application/gzip"),
+    "Parquet": ExportFormat(".parquet", "application/vnd.apache.parquet"),
+    "JSON Lines": ExportFormat(".jsonl", "application/x-ndjson"),
+}
+
+
+def iter_chunks(df, mask, columns, chunk_rows=CHUNK_ROWS):
+    """The ``columns`` of the rows in ``mask``, ``chunk_rows`` rows at a time."""
+    positions = np.flatnonzero(mask)
+    columns = list(columns)
+    if not len(positions):
+        yield df.iloc[:0][columns]
+    for start in range(0, len(positions), chunk_rows):
+        yield df.iloc[positions[start:start + chunk_rows]][columns]
+
+
+def _write_csv(chunks, binary):
+    text = io.TextIOWrapper(binary, encoding="utf-8", newline="")
+    for number, chunk in enumerate(chunks):
+        chunk.to_csv(text, header=number == 0, index=False)
+    text.flush()
+    text.detach()
+
+
+def _write_jsonl(chunks, binary):
+    for chunk in chunks:
+        if len(chunk):
+            lines = chunk.to_json(orient="records", lines=True, date_format="iso")
+            binary.write(lines.encode("utf-8"))
+            if not lines.endswith("\n"):
+                binary.write(b"\n")
+
+
+def _write_parquet(chunks, binary):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    for chunk in chunks:
+        if writer is None:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            writer = pq.ParquetWriter(binary, table.schema, compression="zstd")
+        else:
+            table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+        writer.write_table(table)
+    writer.close()
+
+
+def write_export(df, mask, columns, fmt, binary, chunk_rows=CHUNK_ROWS):
+    """Write the selected rows and columns of ``df`` to the binary file ``binary``."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {', '.join(EXPORT_FORMATS)}")
+    chunks = iter_chunks(df, mask, columns, chunk_rows)
+    if fmt == "CSV":
+        _write_csv(chunks, binary)
+    elif fmt == "CSV (gzip)":
+        with gzip.GzipFile(fileobj=binary, mode="wb", mtime=0) as compressed:
+            _write_csv(chunks, compressed)
+    elif fmt == "Parquet":
+        _write_parquet(chunks, binary)
+    else:
+        _write_jsonl(chunks, binary)
+
+
+def export_bytes(df, mask, columns, fmt, chunk_rows=CHUNK_ROWS):
+    buffer = io.BytesIO()
+    write_export(df, mask, columns, fmt, buffer, chunk_rows)
+    return buffer.getvalue()
+
+
+def export_file_name(stem, fmt):
+    return stem + EXPORT_FORMATS[fmt].extension
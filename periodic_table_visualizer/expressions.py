@@ -0,0 +1,272 @@
+"""Derived numeric columns defined by formulas over a dataset's columns.
+
+A formula is an arithmetic expression over numeric column names, e.g.::
+
+    AtomicMass / Density                          molar volume
+    NumberofNeutrons / NumberofProtons            neutron/proton ratio
+    Electronegativity - group_mean(Electronegativity)
+    (MeltingPoint - mean(MeltingPoint)) / std(MeltingPoint)
+
+Supported are ``+ - * / ** %``, numbers, the element-wise functions in
+``FUNCTIONS`` and the aggregates ``mean``, ``std``, ``group_mean`` and
+``period_mean``. The group and period means are per ``Group`` and per
+``Period`` value. Aggregates are taken over the whole dataset, so a derived
+column does not change with the filters. Column names that are not
+identifiers can be quoted with backticks: ```Some Column` * 2``.
+
+Formulas are parsed once with ``ast``; anything other than the constructs
+above is rejected, so user input is never executed as Python, and so are
+formulas too long or too deeply nested to compile safely. The element-wise part is evaluated over whole columns with ``numexpr`` when it
+is installed and with NumPy otherwise. ``ExpressionEngine`` is built once
+per dataset and caches both parsed formulas and results. Division by zero
+and other undefined results become missing values (NaN).
+"""
+import ast
+import hashlib
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from periodic_table_visualizer.caching import readonly
+
+FUNCTIONS = {
+    "abs": np.abs,
+    "sqrt": np.sqrt,
+    "exp": np.exp,
+    "log": np.log,
+    "log10": np.log10,
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+}
+AGGREGATES = ("mean", "std", "group_mean", "period_mean")
+GROUP_COLUMNS = {"group_mean": "Group", "period_mean": "Period"}
+MAX_EXPRESSION_LENGTH = 500
+MAX_EXPRESSION_DEPTH = 100
+
+_QUOTED = re.compile(r"`([^`]+)`")
+_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod)
+
+
+class ExpressionError(ValueError):
+    """Raised for formulas that are malformed or reference unknown columns."""
+
+
+class Aggregate(NamedTuple):
+    function: str
+    source: str  # element-wise expression over the placeholders
+    code: object
+
+
+class Expression(NamedTuple):
+    text: str
+    columns: tuple  # (column name, placeholder) pairs read by the formula
+    aggregates: tuple  # placeholder "a<n>" is the n-th Aggregate, inner ones first
+    source: str
+    code: object
+
+
+class _Compiler:
+    def __init__(self, columns, quoted):
+        self.available = columns
+        self.quoted = quoted
+        self.columns = {}
+        self.aggregates = []
+        self.depth = 0
+
+    def compile(self, node):
+        # Bounded so that compiling and evaluating the formula cannot exhaust the stack.
+        self.depth += 1
+        if self.depth > MAX_EXPRESSION_DEPTH:
+            raise ExpressionError(f"Formulas are limited to {MAX_EXPRESSION_DEPTH} levels of nesting")
+        try:
+            return self._compile(node)
+        finally:
+            self.depth -= 1
+
+    def _compile(self, node):
+        if isinstance(node, ast.BinOp) and isinstance(node.op, _OPERATORS):
+            return ast.BinOp(self.compile(node.left), node.op, self.compile(node.right))
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            return ast.UnaryOp(node.op, self.compile(node.operand))
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+            return ast.Constant(float(node.value))
+        if isinstance(node, ast.Name):
+            if node.id not in self.quoted and node.id.startswith("__"):
+                raise ExpressionError(f"Unsupported name in formula: {node.id} (quote column names with backticks)")
+            return ast.Name(self.column(self.quoted.get(node.id, node.id)), ast.Load())
+        if isinstance(node, ast.Call):
+            return self.call(node)
+        raise ExpressionError(f"Unsupported syntax in formula: {ast.unparse(node)}")
+
+    def column(self, name):
+        if name not in self.available:
+            raise ExpressionError(f"Unknown or non-numeric column in formula: {name}")
+        if name not in self.columns:
+            self.columns[name] = f"c{len(self.columns)}"
+        return self.columns[name]
+
+    def call(self, node):
+        name = node.func.id if isinstance(node.func, ast.Name) else None
+        if name not in FUNCTIONS and name not in AGGREGATES:
+            raise ExpressionError(f"Unknown function in formula: {ast.unparse(node.func)}")
+        if len(node.args) != 1 or node.keywords:
+            raise ExpressionError(f"{name}() takes exactly one argument")
+        argument = self.compile(node.args[0])
+        if name in FUNCTIONS:
+            return ast.Call(ast.Name(name, ast.Load()), [argument], [])
+        source = ast.unparse(argument)
+        self.aggregates.append(Aggregate(name, source, _code(source)))
+        return ast.Name(f"a{len(self.aggregates) - 1}", ast.Load())
+
+
+def _code(source):
+    return compile(source, "<formula>", "eval")
+
+
+def parse_expression(text, columns):
+    """Parse ``text`` into an ``Expression`` over the numeric ``columns``; raises ExpressionError."""
+    text = text.strip()
+    if not text:
+        raise ExpressionError("The formula is empty")
+    if len(text) > MAX_EXPRESSION_LENGTH:
+        raise ExpressionError(f"Formulas are limited to {MAX_EXPRESSION_LENGTH} characters")
+    quoted = {}
+
+    def quote(match):
+        placeholder = f"_q{len(quoted)}"
+        quoted[placeholder] = match.group(1)
+        return placeholder
+
+    compiler = _Compiler(set(columns), quoted)
+    try:
+        tree = ast.parse(_QUOTED.sub(quote, text), mode="eval")
+        source = ast.unparse(compiler.compile(tree.body))
+        code = _code(source)
+    except SyntaxError as e:
+        raise ExpressionError(f"Could not parse formula: {e.msg}") from None
+    except ExpressionError:
+        raise
+    except RecursionError:
+        raise ExpressionError("The formula is nested too deeply") from None
+    except (OverflowError, ValueError) as e:
+        # e.g. an integer literal too large for a float
+        raise ExpressionError(f"Could not parse formula: {e}") from None
+    return Expression(text, tuple(compiler.columns.items()), tuple(compiler.aggregates), source, code)
+
+
+def _evaluate_elementwise(source, code, arrays):
+    try:
+        import numexpr
+    except ImportError:
+        numexpr = None
+    try:
+        if numexpr is None:
+            return eval(code, {"__builtins__": {}, **FUNCTIONS}, arrays)
+        return numexpr.evaluate(source, local_dict=arrays)
+    except RecursionError:
+        raise ExpressionError("The formula is nested too deeply") from None
+
+
+def _group_means(values, codes, group_count):
+    """Mean of ``values`` per group code, ignoring NaNs, broadcast back to the rows."""
+    valid = (codes >= 0) & ~np.isnan(values)
+    sums = np.bincount(codes[valid], weights=values[valid], minlength=group_count)
+    counts = np.bincount(codes[valid], minlength=group_count)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+    return np.where(codes >= 0, means[np.maximum(codes, 0)], np.nan)
+
+
+class ExpressionEngine:
+    """Parses and evaluates formulas over one dataset, caching both."""
+
+    def __init__(self, df):
+        self.df = df
+        self.size = len(df)
+        self.columns = tuple(
+            column for column in df.columns
+            if pd.api.types.is_numeric_dtype(df[column]) or pd.api.types.is_bool_dtype(df[column])
+        )
+        self._arrays = {}
+        self._groups = {}
+        self.parse = lru_cache(maxsize=256)(self._parse)
+        self._values = lru_cache(maxsize=64)(self._compute)
+
+    def _parse(self, text):
+        return parse_expression(text, self.columns)
+
+    def evaluate(self, text):
+        """Read-only float64 values of the formula for every row."""
+        return self._values(text.strip())
+
+    def with_columns(self, definitions):
+        """``df`` plus one column per ``(name, formula)`` pair; raises ExpressionError.
+
+        The result shares ``df``'s columns rather than copying them; only the
+        derived columns take new memory.
+        """
+        derived = {}
+        for name, formula in definitions:
+            validate_name(name, self.df)
+            derived[name] = self.evaluate(formula)
+        if not derived:
+            return self.df
+        frame = self.df.copy(deep=False)
+        for name, values in derived.items():
+            frame[name] = values
+        return frame
+
+    def column(self, name):
+        values = self._arrays.get(name)
+        if values is None:
+            values = self._arrays[name] = self.df[name].to_numpy(dtype=np.float64, na_value=np.nan)
+        return values
+
+    def _compute(self, text):
+        expression = self.parse(text)
+        arrays = {placeholder: self.column(name) for name, placeholder in expression.columns}
+        with np.errstate(all="ignore"):
+            for number, aggregate in enumerate(expression.aggregates):
+                values = self._broadcast(_evaluate_elementwise(aggregate.source, aggregate.code, arrays))
+                arrays[f"a{number}"] = self._aggregate(aggregate.function, values)
+            values = self._broadcast(_evaluate_elementwise(expression.source, expression.code, arrays))
+        values[~np.isfinite(values)] = np.nan
+        return readonly(values)
+
+    def _broadcast(self, values):
+        # Constant formulas evaluate to a scalar.
+        return np.array(np.broadcast_to(values, (self.size,)), dtype=np.float64)
+
+    def _aggregate(self, function, values):
+        if function in GROUP_COLUMNS:
+            column = GROUP_COLUMNS[function]
+            if column not in self.df:
+                raise ExpressionError(f"{function}() needs a {column} column")
+            groups = self._groups.get(column)
+            if groups is None:
+                codes, uniques = pd.factorize(self.df[column], use_na_sentinel=True)
+                groups = self._groups[column] = (codes, len(uniques))
+            return _group_means(values, *groups)
+        if not np.isfinite(values).any():
+            return np.full(self.size, np.nan)
+        statistic = np.nanmean if function == "mean" else np.nanstd
+        return np.full(self.size, statistic(np.where(np.isfinite(values), values, np.nan)))
+
+
+def validate_name(name, df):
+    """Raise ExpressionError unless ``name`` can be used for a new column of ``df``."""
+    if not name or not name.strip():
+        raise ExpressionError("The column needs a name")
+    if name != name.strip() or "`" in name:
+        raise ExpressionError("Column names cannot start or end with spaces or contain backticks")
+    if name in df:
+        raise ExpressionError(f"There is already a column named {name}")
+
+
+def definitions_digest(definitions):
+    """Short, stable key for a set of ``(name, formula)`` pairs, for caching per derived dataset."""
+    return hashlib.sha1(repr(tuple(definitions)).encode("utf-8")).hexdigest()[:12]
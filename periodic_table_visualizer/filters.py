@@ -0,0 +1,228 @@
+"""Index-backed row filtering for the element dataset.
+
+``FilterEngine`` is built once per loaded dataset. It keeps one boolean
+row mask per category value of the filterable columns and a trigram index
+over element names, so a filter is answered by OR-ing and AND-ing
+precomputed masks instead of chaining ``df.copy()`` / ``isin`` calls.
+Results are memoized on the (hashable) ``FilterSpec``.
+
+All masks handed out are read-only NumPy arrays aligned with the rows of
+``engine.df``; copy them before combining in place.
+"""
+import hashlib
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from periodic_table_visualizer.caching import readonly
+from periodic_table_visualizer.dataset import flag_values
+
+TRIGRAM = 3
+
+
+@dataclass(frozen=True)
+class FilterSpec:
+    """The sidebar filters; ``None`` / empty means "don't filter on this"."""
+
+    name: str = ""
+    groups: tuple = ()
+    periods: tuple = ()
+    element_type: str = None
+    radioactive: bool = None
+
+
+def mask_digest(mask):
+    """Short, stable key for a row mask, for caching results per filter state."""
+    return hashlib.sha1(np.packbits(mask).tobytes()).hexdigest()[:16]
+
+
+class CategoryIndex:
+    """Row masks for each distinct value of one column."""
+
+    def __init__(self, series):
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        self.size = len(series)
+        self._masks = {value: readonly(codes == code) for code, value in enumerate(uniques)}
+
+    @property
+    def values(self):
+        return list(self._masks)
+
+    def mask(self, values):
+        result = np.zeros(self.size, dtype=bool)
+        for value in values:
+            value_mask = self._masks.get(value)
+            if value_mask is not None:
+                result |= value_mask
+        return readonly(result)
+
+
+class TextIndex:
+    """Case-insensitive substring search over one or more text columns.
+
+    Queries of at least three bytes (UTF-8) are narrowed down with a trigram
+    index and only the candidate rows are checked; shorter queries fall back
+    to a single vectorized scan. The postings are built with NumPy from the
+    Arrow string buffer: a byte trigram and a row number pack into one
+    integer, so a single sort groups the rows of each trigram.
+    """
+
+    def __init__(self, series):
+        import pyarrow as pa
+
+        text = pa.array(series.astype("string[pyarrow]").fillna("").str.lower(), type=pa.large_string())
+        if isinstance(text, pa.ChunkedArray):
+            text = text.combine_chunks()  # one chunk keeps taking the candidate rows cheap
+        self._text = pd.Series(pd.arrays.ArrowStringArray(text))
+        data, owners = _utf8_bytes(text)
+        within_row = owners[:-2] == owners[2:]  # trigrams spanning two rows' texts are dropped
+        self._row_bits = max(len(self._text).bit_length(), 1)
+        keys = np.sort((_trigrams(data)[within_row].astype(np.int64) << self._row_bits) | owners[:-2][within_row])
+        keys = keys[np.r_[True, keys[1:] != keys[:-1]]] if len(keys) else keys
+        grams = keys >> self._row_bits
+        starts = np.flatnonzero(np.r_[True, grams[1:] != grams[:-1]]) if len(grams) else np.empty(0, dtype=np.int64)
+        self._grams = grams[starts]
+        self._offsets = np.append(starts, len(keys))
+        self._rows = (keys & ((1 << self._row_bits) - 1)).astype(np.int32)
+
+    def __len__(self):
+        return len(self._text)
+
+    @property
+    def text(self):
+        """The indexed texts, lower-cased."""
+        return self._text
+
+    def rows(self, query):
+        """Sorted numbers of the rows whose text contains ``query``."""
+        query = query.lower()
+        encoded = np.frombuffer(query.encode("utf-8"), dtype=np.uint8)
+        if len(encoded) < TRIGRAM:
+            return np.flatnonzero(self._text.str.contains(query, regex=False).to_numpy(dtype=bool))
+
+        candidates = None
+        for gram in _trigrams(encoded):
+            position = np.searchsorted(self._grams, gram)
+            if position == len(self._grams) or self._grams[position] != gram:
+                return np.empty(0, dtype=np.int64)
+            rows = self._rows[self._offsets[position]:self._offsets[position + 1]]
+            candidates = rows if candidates is None else np.intersect1d(candidates, rows, assume_unique=True)
+            if not len(candidates):
+                return np.empty(0, dtype=np.int64)
+        if len(encoded) == TRIGRAM:
+            return candidates
+        found = self._text.iloc[candidates].str.contains(query, regex=False).to_numpy(dtype=bool)
+        return candidates[found]
+
+    def mask(self, query):
+        result = np.zeros(len(self._text), dtype=bool)
+        result[self.rows(query)] = True
+        return readonly(result)
+
+
+def _utf8_bytes(array):
+    """The UTF-8 bytes of an Arrow large string array without nulls, and the row of each byte."""
+    _, offsets, data = array.buffers()
+    offsets = np.frombuffer(offsets, dtype=np.int64)[array.offset:array.offset + len(array) + 1]
+    if data is None or not len(array):
+        return np.empty(0, dtype=np.uint8), np.empty(0, dtype=np.int32)
+    owners = np.repeat(np.arange(len(array), dtype=np.int32), np.diff(offsets))
+    return np.frombuffer(data, dtype=np.uint8)[offsets[0]:offsets[-1]], owners
+
+
+def _trigrams(data):
+    data = data.astype(np.int32)
+    return (data[:-2] << 16) | (data[1:-1] << 8) | data[2:]
+
+
+class FilterEngine:
+    """Precomputed indexes over ``df`` for fast, memoized filtering."""
+
+    def __init__(self, df, name_column="Element", symbol_column="Symbol"):
+        self.df = df
+        self.size = len(df)
+        self.name_column = name_column
+        self.symbol_column = symbol_column
+        self._categories = {}
+        self._flags = {}
+        self._lock = threading.Lock()
+        self._names = TextIndex(df[name_column]) if name_column in df else None
+        self._symbols = None
+        if symbol_column in df:
+            self._symbols = CategoryIndex(df[symbol_column].astype("string").str.lower())
+        self._spec_mask = lru_cache(maxsize=256)(self._compute_mask)
+
+    def all_rows(self):
+        return readonly(np.ones(self.size, dtype=bool))
+
+    def category_index(self, column):
+        index = self._categories.get(column)
+        if index is None:
+            if column not in self.df:
+                raise KeyError(f"Column not found in dataset: {column}")
+            with self._lock:
+                index = self._categories.get(column)
+                if index is None:
+                    index = self._categories[column] = CategoryIndex(self.df[column])
+        return index
+
+    def category_mask(self, column, values):
+        """Rows whose ``column`` is any of ``values``."""
+        return self.category_index(column).mask(values)
+
+    def flag_mask(self, column, value=True):
+        """Rows whose yes/no ``column`` equals ``value``."""
+        flags = self._flags.get(column)
+        if flags is None:
+            if column not in self.df:
+                raise KeyError(f"Column not found in dataset: {column}")
+            flags = self._flags[column] = readonly(flag_values(self.df[column]))
+        return flags if value else readonly(~flags)
+
+    def name_mask(self, query):
+        """Rows whose name contains ``query`` or whose symbol equals it (case-insensitive)."""
+        if self._names is None:
+            raise KeyError(f"Column not found in dataset: {self.name_column}")
+        result = self._names.mask(query)
+        if self._symbols is not None:
+            result = readonly(result | self._symbols.mask([query.strip().lower()]))
+        return result
+
+    def mask(self, spec):
+        """Boolean row mask for ``spec`` (memoized)."""
+        return self._spec_mask(spec)
+
+    def positions(self, spec):
+        return np.flatnonzero(self.mask(spec))
+
+    def filter(self, spec):
+        """Rows of ``df`` matching ``spec``, taken in one pass.
+
+        When nothing is filtered out the dataset itself is returned, so
+        callers must treat the result as read-only.
+        """
+        return self.take(self.mask(spec))
+
+    def take(self, mask, df=None):
+        """The rows of ``df`` in ``mask``; ``df`` defaults to ``self.df`` and must have the same rows."""
+        df = self.df if df is None else df
+        if mask.all():
+            return df
+        return df.iloc[np.flatnonzero(mask)]
+
+    def _compute_mask(self, spec):
+        mask = np.ones(self.size, dtype=bool)
+        if spec.name:
+            mask &= self.name_mask(spec.name)
+        if spec.groups:
+            mask &= self.category_mask("Group", spec.groups)
+        if spec.periods:
+            mask &= self.category_mask("Period", spec.periods)
+        if spec.element_type is not None:
+            mask &= self.category_mask("Type", [spec.element_type])
+        if spec.radioactive is not None:
+            mask &= self.flag_mask("Radioactive", spec.radioactive)
+        return readonly(mask)
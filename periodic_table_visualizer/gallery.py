@@ -0,0 +1,90 @@
+"""Paginated Element Gallery.
+
+``GalleryIndex`` is built once per dataset: it holds the row position of
+each element in atomic-number order and an AtomicNumber -> row lookup. A
+page for any filter mask is then a slice of that order, and only the rows on
+the page are materialized, so rendering cost depends on the page size rather
+than on the size of the dataset.
+"""
+import html
+import math
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+
+class GalleryPage(NamedTuple):
+    rows: pd.DataFrame
+    page: int
+    page_count: int
+    total: int
+
+
+class GalleryIndex:
+    def __init__(self, df):
+        self.df = df
+        atomic_numbers = df["AtomicNumber"].to_numpy()
+        # One card per element: first row of each Element, ordered by atomic number.
+        first = ~df["Element"].duplicated().to_numpy()
+        candidates = np.flatnonzero(first)
+        self.order = candidates[np.argsort(atomic_numbers[candidates], kind="stable")]
+        self.by_atomic_number = {int(atomic_numbers[row]): int(row) for row in self.order[::-1]}
+
+    def position(self, atomic_number):
+        """Row position of the element with ``atomic_number``, or None."""
+        return self.by_atomic_number.get(int(atomic_number))
+
+    def page(self, page=1, page_size=None, mask=None):
+        """Rows for one 1-based page (clamped to the available pages) of the rows in ``mask``."""
+        order = self.order if mask is None else self.order[mask[self.order]]
+        total = len(order)
+        if not page_size:
+            return GalleryPage(self.df.iloc[order], 1, 1, total)
+        page_count = max(1, math.ceil(total / page_size))
+        page = min(max(int(page), 1), page_count)
+        start = (page - 1) * page_size
+        return GalleryPage(self.df.iloc[order[start:start + page_size]], page, page_count, total)
+
+
+def _sprite_html(slot, label):
+    """A sprite-sheet cell scaled to the card width (see ``assets.AtlasSlot``)."""
+    spare_x, spare_y = slot.sheet_width - slot.width, slot.sheet_height - slot.height
+    position_x = 100 * slot.x / spare_x if spare_x else 0
+    position_y = 100 * slot.y / spare_y if spare_y else 0
+    return (
+        f'<div class="gallery-sprite" role="img" aria-label="{html.escape(label)}" style="'
+        f"aspect-ratio: {slot.width} / {slot.height}; "
+        f"background-image: url('{html.escape(slot.url)}'); "
+        f"background-size: {100 * slot.sheet_width / slot.width:.4f}% auto; "
+        f'background-position: {position_x:.4f}% {position_y:.4f}%;"></div>'
+    )
+
+
+def render_gallery_html(rows, image_uri, columns=10):
+    """Render one page of cards as a single HTML block.
+
+    ``image_uri(atomic_number)`` returns the image source for a card (a URL,
+    or an ``AtlasSlot`` for a sprite-sheet cell), or None.
+    """
+    cards = []
+    for record in rows[["AtomicNumber", "Symbol", "Element"]].itertuples(index=False):
+        uri = image_uri(record.AtomicNumber)
+        if hasattr(uri, "sheet_width"):
+            image = _sprite_html(uri, str(record.Element))
+        elif uri:
+            image = f'<img src="{html.escape(uri)}" alt="{html.escape(str(record.Element))}" loading="lazy">'
+        else:
+            image = '<div class="gallery-missing">No image available</div>'
+        cards.append(
+            '<div class="gallery-card">'
+            f"{image}"
+            f"<p><strong>{html.escape(str(record.Symbol))}</strong></p>"
+            f'<p class="gallery-caption">{html.escape(str(record.Element))}</p>'
+            f'<p class="gallery-caption">{record.AtomicNumber}</p>'
+            "</div>"
+        )
+    return (
+        f'<div class="gallery" style="grid-template-columns: repeat({int(columns)}, minmax(0, 1fr));">'
+        f'{"".join(cards)}</div>'
+    )
@@ -0,0 +1,82 @@
+"""Lazily loaded, size-bounded cache of element images.
+
+Images are only read and base64-encoded the first time an element is
+actually displayed. Encoded data URIs are kept in an LRU keyed on the file
+path and its modification time, so an image that changes on disk is picked
+up on the next request, and the total resident size never exceeds
+``max_bytes``.
+
+When a thumbnail directory is configured (see ``thumbnails``), callers can
+ask for a downscaled variant by width; the original is used only when that
+variant has not been built.
+"""
+import base64
+import os
+
+from periodic_table_visualizer.caching import LRUCache
+from periodic_table_visualizer.thumbnails import thumbnail_path
+
+IMAGE_DIR = os.path.join("images", "elements")
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+MIME_TYPES = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".webp": "image/webp",
+}
+
+
+class ImageStore:
+    """Thread-safe LRU of element images encoded as data URIs."""
+
+    def __init__(self, image_dir=IMAGE_DIR, thumbnail_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.image_dir = image_dir
+        self.thumbnail_dir = thumbnail_dir
+        # path -> (mtime, data URI); a changed file replaces the entry of its previous version.
+        self._entries = LRUCache(max_bytes=max_bytes, size=lambda entry: len(entry[1]))
+
+    @property
+    def max_bytes(self):
+        return self._entries.max_bytes
+
+    @property
+    def resident_bytes(self):
+        return self._entries.resident_bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def path_for(self, atomic_number):
+        return os.path.join(self.image_dir, f"{int(atomic_number)}.png")
+
+    def data_uri(self, atomic_number, width=None):
+        """Return the element's image as a data URI, or None if it has no image.
+
+        With ``width``, the thumbnail of that width is preferred over the original.
+        """
+        if width is not None and self.thumbnail_dir:
+            uri = self.load(thumbnail_path(atomic_number, width, self.thumbnail_dir))
+            if uri is not None:
+                return uri
+        return self.load(self.path_for(atomic_number))
+
+    def load(self, path):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+
+        with open(path, "rb") as f:
+            encoded = base64.b64encode(f.read()).decode("utf-8")
+        mime = MIME_TYPES.get(os.path.splitext(path)[1].lower(), "application/octet-stream")
+        uri = f"data:{mime};base64,{encoded}"
+        self._entries.put(path, (mtime, uri))
+        return uri
+
+    def clear(self):
+        self._entries.clear()
@@ -0,0 +1,114 @@
+"""Opt-in timing and payload-size instrumentation for app reruns.
+
+A ``Recorder`` collects one record per timed section (data load, sidebar
+filter, each tab, figure construction, ...) and per payload sent to the
+browser, and writes each record as one JSON line to the
+``periodic_table_visualizer.instrumentation`` logger as soon as it is made.
+Set ``PTV_DEBUG=1`` (or open the app with ``?debug=1``) to turn it on;
+``PTV_DEBUG_LOG=<path>`` appends the JSON lines to a file instead of
+stderr. A disabled recorder does no timing and never measures payloads.
+"""
+import json
+import logging
+import os
+import time
+import uuid
+from contextlib import contextmanager
+
+DEBUG_ENV = "PTV_DEBUG"
+DEBUG_LOG_ENV = "PTV_DEBUG_LOG"
+DEBUG_QUERY_PARAM = "debug"
+TRUE_VALUES = ("1", "true", "yes", "on")
+
+logger = logging.getLogger(__name__)
+
+
+def new_id():
+    return uuid.uuid4().hex[:12]
+
+
+def debug_enabled(query_params=None, environ=os.environ):
+    """True if instrumentation was asked for by environment variable or ``?debug=1``."""
+    if environ.get(DEBUG_ENV, "").strip().lower() in TRUE_VALUES:
+        return True
+    value = (query_params or {}).get(DEBUG_QUERY_PARAM, "")
+    return str(value).strip().lower() in TRUE_VALUES
+
+
+def configure_logging(path=None):
+    """Send the JSON lines to ``path`` (default: ``$PTV_DEBUG_LOG``, else stderr), once per process."""
+    if logger.handlers:
+        return logger
+    path = path or os.environ.get(DEBUG_LOG_ENV)
+    handler = logging.FileHandler(path, encoding="utf-8") if path else logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+def payload_size(obj):
+    """Approximate bytes sent to the browser for ``obj``.
+
+    Text is measured as UTF-8, DataFrames as the Arrow IPC stream Streamlit
+    sends and Plotly figures as their JSON.
+    """
+    if obj is None:
+        return 0
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return len(obj)
+    if isinstance(obj, str):
+        return len(obj.encode("utf-8"))
+    if hasattr(obj, "to_plotly_json"):
+        return len(obj.to_json().encode("utf-8"))
+    if hasattr(obj, "memory_usage"):
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(obj)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().size
+    return len(str(obj).encode("utf-8"))
+
+
+class Recorder:
+    def __init__(self, enabled=False, session=None):
+        self.enabled = enabled
+        self.session = session
+        self.run = new_id()
+        self.records = []
+        self._started = time.perf_counter()
+        if enabled:
+            configure_logging()
+
+    def _emit(self, record):
+        record = {"ts": round(time.time(), 3), "session": self.session, "run": self.run, **record}
+        self.records.append(record)
+        logger.info(json.dumps(record, default=str))
+
+    @contextmanager
+    def section(self, name):
+        """Time the enclosed block as ``name``."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._emit({"kind": "section", "name": name, "ms": round((time.perf_counter() - start) * 1000, 3)})
+
+    def payload(self, name, obj):
+        """Record the size of ``obj`` as sent for ``name``; returns ``obj`` unchanged."""
+        if self.enabled:
+            self._emit({"kind": "payload", "name": name, "bytes": payload_size(obj)})
+        return obj
+
+    def total_ms(self):
+        return (time.perf_counter() - self._started) * 1000
+
+    def summary(self):
+        """``[(name, ms, bytes), ...]`` for a results table; missing values are None."""
+        return [(record["name"], record.get("ms"), record.get("bytes")) for record in self.records]
@@ -0,0 +1,113 @@
+"""Period/group placement and HTML rendering of the periodic table grid."""
+import html
+
+import pandas as pd
+
+MAX_GROUP = 18
+MAX_PERIOD = 7
+
+LANTHANIDE_RANGE = (57, 71)
+ACTINIDE_RANGE = (89, 103)
+
+DEFAULT_COLOR = "#FFFFFF"
+
+ELEMENT_COLORS = {
+    "Alkali Metal": "#ff7f7f",
+    "Alkaline Earth Metal": "#ffa57f",
+    "Transition Metal": "#e6e6fa",
+    "Post-Transition Metal": "#b3d9ff",
+    "Metalloid": "#ffffb3",
+    "Nonmetal": "#ffb3b3",
+    "Halogen": "#ffb3ff",
+    "Noble Gas": "#b3ffb3",
+    "Lanthanide": "#b3ffff",
+    "Actinide": "#ffb3e6",
+    "Unknown": "#d3d3d3"
+}
+
+
+def _in_range(atomic_number, bounds):
+    return bounds[0] <= atomic_number <= bounds[1]
+
+
+def layout_grid(df):
+    """Place elements on the periodic table.
+
+    Returns ``(grid, lanthanides, actinides)`` where ``grid`` is a
+    ``MAX_PERIOD`` x ``MAX_GROUP`` list of lists holding one record dict per
+    occupied cell (``None`` elsewhere), and the f-block series are lists of
+    records in atomic-number order.
+    """
+    grid = [[None for _ in range(MAX_GROUP)] for _ in range(MAX_PERIOD)]
+    lanthanides = []
+    actinides = []
+
+    for record in df.sort_values("AtomicNumber").to_dict("records"):
+        atomic_number = record["AtomicNumber"]
+        if _in_range(atomic_number, LANTHANIDE_RANGE):
+            lanthanides.append(record)
+            continue
+        if _in_range(atomic_number, ACTINIDE_RANGE):
+            actinides.append(record)
+            continue
+        if pd.isnull(record["Group"]) or pd.isnull(record["Period"]):
+            continue
+        group = int(record["Group"]) - 1
+        period = int(record["Period"]) - 1
+        if 0 <= group < MAX_GROUP and 0 <= period < MAX_PERIOD:
+            grid[period][group] = record
+
+    return grid, lanthanides, actinides
+
+
+def _element_cell(record, color, row=None, column=None, link=None):
+    position = ""
+    if row is not None:
+        position = f"grid-row: {row}; grid-column: {column}; "
+    cell = (
+        f'<div class="element" style="{position}background-color: {color}; color: #000000;" '
+        f'title="{html.escape(str(record["Element"]))}">'
+        f'<span class="element-atomic">{record["AtomicNumber"]}</span>'
+        f'<span class="element-symbol">{html.escape(str(record["Symbol"]))}</span>'
+        f'<span class="element-name">{html.escape(str(record["Element"]))}</span>'
+        "</div>"
+    )
+    if link is None:
+        return cell
+    # display: contents keeps the cell itself as the grid item.
+    return f'<a href="{html.escape(link(record))}" style="display: contents;">{cell}</a>'
+
+
+def _series_block(title, css_class, records, color, link=None):
+    parts = [f"<h3>{title}</h3>"]
+    if records:
+        cells = "".join(_element_cell(record, color, link=link) for record in records)
+        parts.append(f'<div class="{css_class}">{cells}</div>')
+    else:
+        parts.append(f"<p>No {title.lower()} data available.</p>")
+    return "".join(parts)
+
+
+def render_periodic_table_html(df, colors=ELEMENT_COLORS, link=None):
+    """Render the whole table as a single HTML block using the ``.grid`` CSS classes.
+
+    ``colors`` maps an element ``Type`` to a CSS colour; the lanthanide and
+    actinide rows use the ``"Lanthanide"`` and ``"Actinide"`` entries. With
+    ``link(record) -> URL`` every cell links to that URL.
+    """
+    grid, lanthanides, actinides = layout_grid(df)
+
+    cells = []
+    for period, row in enumerate(grid, start=1):
+        for group, record in enumerate(row, start=1):
+            if record is not None:
+                color = colors.get(record["Type"], DEFAULT_COLOR)
+                cells.append(_element_cell(record, color, period, group, link))
+
+    return "".join([
+        '<div class="periodic-table">',
+        f'<div class="grid">{"".join(cells)}</div>',
+        _series_block("Lanthanides", "lanthanides", lanthanides, colors.get("Lanthanide", DEFAULT_COLOR), link),
+        _series_block("Actinides", "actinides", actinides, colors.get("Actinide", DEFAULT_COLOR), link),
+        "</div>",
+    ])
@@ -0,0 +1,67 @@
+"""Constant-time element lookup and the Element Details card.
+
+``ElementIndex`` is built once per dataset and resolves an element by name,
+symbol or atomic number (case-insensitive) to its row position with a
+dictionary lookup, e.g. for ``?element=Fe`` deep links.
+"""
+import html
+
+
+class ElementIndex:
+    def __init__(self, df):
+        self.df = df
+        self._positions = {}
+        names = []
+        # Later rows never shadow earlier ones, matching ``df[df.Element == x].iloc[0]``.
+        columns = [df[column].tolist() for column in ("Element", "Symbol", "AtomicNumber")]
+        for row, (name, symbol, atomic_number) in enumerate(zip(*columns)):
+            if str(name).lower() not in self._positions:
+                names.append(name)
+            for key in (name, symbol, atomic_number):
+                self._positions.setdefault(str(key).strip().lower(), row)
+        self.names = tuple(names)
+
+    def position(self, key):
+        """Row position for a name, symbol or atomic number, or None if unknown."""
+        if key is None:
+            return None
+        return self._positions.get(str(key).strip().lower())
+
+    def __contains__(self, key):
+        return self.position(key) is not None
+
+    def record(self, key):
+        position = self.position(key)
+        if position is None:
+            raise KeyError(f"Unknown element: {key}")
+        return self.df.iloc[position]
+
+
+def _field(element_data, column, unit=""):
+    value = element_data.get(column, "N/A")
+    return f"{html.escape(str(value))}{unit}"
+
+
+def render_details_html(element_data):
+    """The details card for one element row."""
+    return f"""
+    <div style="background-color:#f1f1f1; padding: 20px; border-radius: 10px; border: 2px solid #ddd;">
+        <h3 style='color: #2a7d8e; font-weight: bold; text-align: center;'>Element: {_field(element_data, 'Element')}</h3>
+        <div style="display: flex; flex-wrap: wrap; justify-content: space-between;">
+            <div style="flex-basis: 45%; margin-bottom: 10px;">
+                <p style='font-size: 16px; color: #333;'><strong>Symbol:</strong> {_field(element_data, 'Symbol')}</p>
+                <p style='font-size: 16px; color: #333;'><strong>Atomic Number:</strong> {_field(element_data, 'AtomicNumber')}</p>
+                <p style='font-size: 16px; color: #333;'><strong>Atomic Mass:</strong> {_field(element_data, 'AtomicMass', ' g/mol')}</p>
+                <p style='font-size: 16px; color: #333;'><strong>Density:</strong> {_field(element_data, 'Density', ' g/cm³')}</p>
+                <p style='font-size: 16px; color: #333;'><strong>Boiling Point:</strong> {_field(element_data, 'BoilingPoint', ' °C')}</p>
+            </div>
+            <div style="flex-basis: 45%; margin-bottom: 10px;">
+                <p style='font-size: 16px; color: #333;'><strong>Melting Point:</strong> {_field(element_data, 'MeltingPoint', ' °C')}</p>
+                <p style='font-size: 16px; color: #333;'><strong>Ionization Energy:</strong> {_field(element_data, 'IonizationEnergy', ' eV')}</p>
+                <p style='font-size: 16px; color: #333;'><strong>Electron Affinity:</strong> {_field(element_data, 'ElectronAffinity', ' eV')}</p>
+                <p style='font-size: 16px; color: #333;'><strong>Number of Shells:</strong> {_field(element_data, 'NumberofShells')}</p>
+                <p style='font-size: 16px; color: #333;'><strong>Valence Electrons:</strong> {_field(element_data, 'NumberofValence')}</p>
+            </div>
+        </div>
+    </div>
+    """
@@ -0,0 +1,346 @@
+"""Correlation, PCA and clustering over numeric columns for the Analytics tab.
+
+``MultivariateIndex`` is built once per dataset. For a set of columns it
+keeps the column matrix (float64, NaN for missing values) and the pairwise
+sums that correlation and covariance are computed from: for every pair of
+columns, the number of rows where both are present and the sums, sums of
+squares and cross products over those rows. When the filter changes, the
+sums are updated by adding the rows that entered the filter and subtracting
+the rows that left it, rather than recomputed over every row. PCA is
+derived from the same sums. Clustering always starts from the same seed, so
+the same columns, filter and number of clusters give the same clusters in
+every session and process, whatever was viewed before.
+
+Missing values are skipped pairwise for correlation and replaced by the
+column mean (0 after standardizing) for PCA and clustering.
+"""
+import threading
+from typing import NamedTuple
+
+import numpy as np
+
+from periodic_table_visualizer.caching import readonly
+
+CLUSTER_METHODS = ("kmeans", "hierarchical")
+KMEANS_MAX_ITER = 100
+KMEANS_TOL = 1e-8
+# Ward linkage needs O(n^2) memory; larger selections are clustered on a sample
+# and the remaining rows join the nearest cluster centre.
+MAX_HIERARCHICAL_ROWS = 2000
+
+
+class Moments(NamedTuple):
+    """Pairwise sums over the rows where both columns ``i`` and ``j`` are present."""
+
+    count: np.ndarray  # [i, j]: number of such rows
+    sums: np.ndarray  # [i, j]: sum of column i
+    squares: np.ndarray  # [i, j]: sum of column i squared
+    products: np.ndarray  # [i, j]: sum of column i * column j
+    rows: int
+
+    @classmethod
+    def of(cls, values, present):
+        filled = np.where(present, values, 0.0)
+        weights = present.astype(np.float64)
+        return cls(
+            weights.T @ weights,
+            filled.T @ weights,
+            (filled * filled).T @ weights,
+            filled.T @ filled,
+            len(values),
+        )
+
+    def plus(self, other, sign=1):
+        return Moments(*(mine + sign * theirs for mine, theirs in zip(self, other)))
+
+    def minus(self, other):
+        return self.plus(other, sign=-1)
+
+
+class PCAResult(NamedTuple):
+    components: np.ndarray  # (columns, n_components), unit vectors
+    explained: np.ndarray  # share of the total variance per component
+    mean: np.ndarray
+    scale: np.ndarray
+
+
+class Clusters(NamedTuple):
+    labels: np.ndarray  # one label per selected row, 0 = largest cluster
+    centers: np.ndarray  # in standardized units
+    inertia: float
+    iterations: int
+
+
+def correlation_from_moments(moments):
+    """Pearson correlation over pairwise-complete rows; NaN where undefined."""
+    n = moments.count
+    sums, squares = moments.sums, moments.squares
+    with np.errstate(invalid="ignore", divide="ignore"):
+        covariance = n * moments.products - sums * sums.T
+        variance = np.clip(n * squares - sums * sums, 0, None) * np.clip(n * squares.T - sums.T * sums.T, 0, None)
+        result = covariance / np.sqrt(variance)
+    result[(n < 2) | (variance <= 0)] = np.nan
+    return np.clip(result, -1.0, 1.0)
+
+
+def _mean_and_covariance(moments):
+    """Column means and the covariance of the mean-imputed data."""
+    n = moments.count
+    present = np.diag(n)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(present > 0, np.diag(moments.sums) / present, 0.0)
+    # Imputed values sit at the mean, so only pairwise-complete rows contribute.
+    centered = (
+        moments.products
+        - mean[None, :] * moments.sums
+        - mean[:, None] * moments.sums.T
+        + np.outer(mean, mean) * n
+    )
+    covariance = centered / max(moments.rows - 1, 1)
+    return mean, covariance
+
+
+def pca_from_moments(moments, n_components=3):
+    """Principal components of the standardized, mean-imputed columns."""
+    mean, covariance = _mean_and_covariance(moments)
+    scale = np.sqrt(np.clip(np.diag(covariance), 0, None))
+    scale[scale == 0] = 1.0
+    eigenvalues, eigenvectors = np.linalg.eigh(covariance / np.outer(scale, scale))
+    eigenvalues = np.clip(eigenvalues, 0, None)
+    order = np.argsort(eigenvalues, kind="stable")[::-1][:n_components]
+    components = eigenvectors[:, order]
+    # Eigenvector signs are arbitrary; fix them so projections don't flip between reruns.
+    signs = np.sign(components[np.abs(components).argmax(axis=0), np.arange(components.shape[1])])
+    components = components * np.where(signs == 0, 1, signs)
+    total = eigenvalues.sum() or 1.0
+    return PCAResult(components, eigenvalues[order] / total, mean, scale)
+
+
+def standardize(values, mean, scale):
+    """``(values - mean) / scale`` with missing values at 0, as float64."""
+    result = (values - mean) / scale
+    result[np.isnan(result)] = 0.0
+    return result
+
+
+def _relabel_by_size(labels, centers):
+    """Renumber clusters from largest to smallest so colors stay stable between reruns."""
+    order = np.argsort(-np.bincount(labels, minlength=len(centers)), kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return rank[labels], centers[order]
+
+
+def _squared_distances(points, centers):
+    distances = (
+        np.einsum("ij,ij->i", points, points)[:, None]
+        - 2 * points @ centers.T
+        + np.einsum("ij,ij->i", centers, centers)[None, :]
+    )
+    # The expansion can go slightly negative through rounding.
+    return np.maximum(distances, 0, out=distances)
+
+
+def _kmeans_plus_plus(points, k, rng):
+    centers = [points[rng.integers(len(points))]]
+    closest = _squared_distances(points, np.asarray(centers))[:, 0]
+    for _ in range(1, k):
+        total = closest.sum()
+        if total <= 0:
+            centers.append(points[rng.integers(len(points))])
+        else:
+            centers.append(points[rng.choice(len(points), p=closest / total)])
+        closest = np.minimum(closest, _squared_distances(points, centers[-1][None, :])[:, 0])
+    return np.asarray(centers)
+
+
+def kmeans(points, k, init=None, seed=0, max_iter=KMEANS_MAX_ITER, tol=KMEANS_TOL):
+    """Lloyd's algorithm, started from ``init`` when it has the right shape (warm start)."""
+    rng = np.random.default_rng(seed)
+    k = min(k, len(points))
+    if init is not None and init.shape == (k, points.shape[1]):
+        centers = init.copy()
+    else:
+        centers = _kmeans_plus_plus(points, k, rng)
+
+    iterations = 0
+    for iterations in range(1, max_iter + 1):
+        distances = _squared_distances(points, centers)
+        labels = distances.argmin(axis=1)
+        counts = np.bincount(labels, minlength=k)
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            # Typical after a warm start on a different filter: move empty clusters to the worst-fit points.
+            worst = np.argsort(distances[np.arange(len(points)), labels])[::-1][:len(empty)]
+            centers = centers.copy()
+            centers[empty[:len(worst)]] = points[worst]
+            labels = _squared_distances(points, centers).argmin(axis=1)
+            counts = np.bincount(labels, minlength=k)
+        sums = np.stack([np.bincount(labels, weights=points[:, d], minlength=k) for d in range(points.shape[1])], 1)
+        updated = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], centers)
+        shift = float(((updated - centers) ** 2).sum())
+        centers = updated
+        if shift <= tol:
+            break
+    distances = _squared_distances(points, centers)
+    labels = distances.argmin(axis=1)
+    inertia = float(distances[np.arange(len(points)), labels].sum())
+    labels, centers = _relabel_by_size(labels, centers)
+    return Clusters(labels, centers, inertia, iterations)
+
+
+def hierarchical(points, k, seed=0, max_rows=MAX_HIERARCHICAL_ROWS):
+    """Ward clustering into ``k`` clusters, fitted on at most ``max_rows`` rows."""
+    from scipy.cluster.hierarchy import fcluster, linkage
+
+    k = min(k, len(points))
+    sample = points
+    if len(points) > max_rows:
+        sample = points[np.random.default_rng(seed).choice(len(points), max_rows, replace=False)]
+    sample_labels = fcluster(linkage(sample, method="ward"), t=k, criterion="maxclust") - 1
+    found = sample_labels.max() + 1
+    centers = np.stack([sample[sample_labels == label].mean(axis=0) for label in range(found)])
+    distances = _squared_distances(points, centers)
+    labels = distances.argmin(axis=1)
+    inertia = float(distances[np.arange(len(points)), labels].sum())
+    labels, centers = _relabel_by_size(labels, centers)
+    return Clusters(labels, centers, inertia, 0)
+
+
+class MultivariateIndex:
+    def __init__(self, df):
+        self.df = df
+        self.size = len(df)
+        self.columns = tuple(df.select_dtypes(include=["number"]).columns)
+        self._matrices = {}
+        self._moments = {}  # columns -> (mask, Moments) of the last filter seen
+        self._lock = threading.Lock()
+
+    def matrix(self, columns):
+        """``(values, present)`` for ``columns``: a float64 matrix and its not-NaN mask."""
+        columns = tuple(columns)
+        cached = self._matrices.get(columns)
+        if cached is None:
+            unknown = [column for column in columns if column not in self.columns]
+            if unknown:
+                raise KeyError(f"Not numeric columns: {', '.join(unknown)}")
+            values = np.column_stack([
+                self.df[column].to_numpy(dtype="float64", na_value=np.nan) for column in columns
+            ]) if columns else np.empty((self.size, 0))
+            cached = self._matrices[columns] = (readonly(values), readonly(~np.isnan(values)))
+        return cached
+
+    def moments(self, columns, mask):
+        """Pairwise sums over the rows in ``mask``, updated from the previous filter when cheaper."""
+        columns = tuple(columns)
+        values, present = self.matrix(columns)
+        with self._lock:
+            previous = self._moments.get(columns)
+
+        result = None
+        if previous is not None:
+            old_mask, old = previous
+            entered = mask & ~old_mask
+            left = old_mask & ~mask
+            changed = int(entered.sum() + left.sum())
+            if changed == 0:
+                return old
+            if changed < int(mask.sum()):
+                result = old.plus(Moments.of(values[entered], present[entered]))
+                result = result.minus(Moments.of(values[left], present[left]))
+                result = result._replace(rows=int(mask.sum()))
+        if result is None:
+            result = Moments.of(values[mask], present[mask])
+
+        stored = readonly(np.array(mask, dtype=bool))
+        with self._lock:
+            self._moments[columns] = (stored, result)
+        return result
+
+    def correlation(self, columns, mask):
+        return correlation_from_moments(self.moments(columns, mask))
+
+    def pca(self, columns, mask, n_components=3):
+        return pca_from_moments(self.moments(columns, mask), n_components)
+
+    def standardized(self, columns, mask, pca=None):
+        """The rows in ``mask`` standardized with the PCA mean and scale."""
+        pca = pca or self.pca(columns, mask)
+        values, _ = self.matrix(columns)
+        return standardize(values[mask], pca.mean, pca.scale)
+
+    def project(self, columns, mask, pca=None):
+        """PCA scores of the rows in ``mask``."""
+        pca = pca or self.pca(columns, mask)
+        return self.standardized(columns, mask, pca) @ pca.components
+
+    def cluster(self, columns, mask, k, method="kmeans", seed=0, pca=None):
+        if method not in CLUSTER_METHODS:
+            raise ValueError(f"Unknown clustering method {method!r}; expected one of {CLUSTER_METHODS}")
+        columns = tuple(columns)
+        points = self.standardized(columns, mask, pca)
+        if not len(points):
+            return Clusters(np.zeros(0, dtype=np.int64), np.zeros((0, len(columns))), 0.0, 0)
+        if method == "hierarchical":
+            return hierarchical(points, k, seed)
+        return kmeans(points, k, seed=seed)
+
+
+def build_correlation_heatmap(matrix, columns):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Heatmap(
+        z=np.round(matrix, 3).astype(np.float32),
+        x=list(columns),
+        y=list(columns),
+        zmin=-1,
+        zmax=1,
+        zmid=0,
+        colorscale="RdBu",
+        colorbar=dict(title="r"),
+        hovertemplate="%{y} vs %{x}: %{z}<extra></extra>",
+    ))
+    fig.update_layout(
+        title=dict(text="Property Correlations", font=dict(size=24, color="white"), x=0.5),
+        yaxis=dict(autorange="reversed"),
+        height=max(400, 28 * len(columns) + 150),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+
+def build_projection_figure(scores, labels, names, explained, dimensions=2):
+    """2D or 3D scatter of PCA scores coloured by cluster; ``names`` label the points."""
+    import plotly.graph_objects as go
+
+    dimensions = min(dimensions, scores.shape[1])
+    titles = [f"PC{axis + 1} ({explained[axis]:.0%})" for axis in range(dimensions)]
+    fig = go.Figure()
+    for label in np.unique(labels):
+        members = labels == label
+        coords = scores[members].astype(np.float32)
+        common = dict(name=f"Cluster {label + 1}", mode="markers", text=np.asarray(names)[members],
+                      hovertemplate="%{text}<extra>%{fullData.name}</extra>")
+        if dimensions == 3:
+            fig.add_trace(go.Scatter3d(x=coords[:, 0], y=coords[:, 1], z=coords[:, 2],
+                                       marker=dict(size=4, opacity=0.8), **common))
+        else:
+            fig.add_trace(go.Scattergl(x=coords[:, 0], y=coords[:, 1] if dimensions > 1 else np.zeros(len(coords)),
+                                       marker=dict(size=7, opacity=0.8), **common))
+
+    layout = dict(
+        title=dict(text="Principal Components", font=dict(size=24, color="white"), x=0.5),
+        height=600,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)'
+    )
+    if dimensions == 3:
+        layout["scene"] = dict(xaxis_title=titles[0], yaxis_title=titles[1], zaxis_title=titles[2],
+                               bgcolor="rgba(0,0,0,0)")
+    else:
+        layout["xaxis_title"] = titles[0]
+        if dimensions > 1:
+            layout["yaxis_title"] = titles[1]
+    fig.update_layout(**layout)
+    return fig
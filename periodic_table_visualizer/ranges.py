@@ -0,0 +1,110 @@
+"""Cached column statistics and range filtering for numeric columns.
+
+``RangeFilter`` is built once per dataset. It keeps each numeric column as a
+float64 array (missing values as NaN), caches min/max/null count and a
+histogram per column and filter state (``sparkline`` draws it under the
+app's sliders), and caches the row mask of each
+``low <= value <= high`` predicate. Moving one slider therefore evaluates
+only that predicate, and the combined mask is a single AND over the cached
+predicate masks into one output buffer.
+"""
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from periodic_table_visualizer.caching import LRUCache, readonly
+from periodic_table_visualizer.filters import mask_digest
+
+HISTOGRAM_BINS = 20
+STATS_CACHE_SIZE = 512
+SPARK_BLOCKS = " ▁▂▃▄▅▆▇█"
+
+
+class ColumnStats(NamedTuple):
+    min: float
+    max: float
+    count: int
+    nulls: int
+    bin_edges: np.ndarray
+    histogram: np.ndarray
+
+    @property
+    def has_range(self):
+        return self.count > 0 and self.min < self.max
+
+
+def sparkline(histogram):
+    """``histogram`` as a row of block characters, scaled to its largest bin."""
+    if not len(histogram) or histogram.max() == 0:
+        return ""
+    levels = np.ceil(histogram / histogram.max() * (len(SPARK_BLOCKS) - 1)).astype(int)
+    return "".join(SPARK_BLOCKS[level] for level in levels)
+
+
+def is_range_column(series):
+    return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+
+
+class RangeFilter:
+    def __init__(self, df):
+        self.df = df
+        self.size = len(df)
+        self.columns = tuple(column for column in df.columns if is_range_column(df[column]))
+        self._values = {}
+        self._stats = LRUCache(max_entries=STATS_CACHE_SIZE)
+        self._predicate = lru_cache(maxsize=256)(self._compute_predicate)
+
+    def values(self, column):
+        """``column`` as a read-only float64 array with NaN for missing values."""
+        values = self._values.get(column)
+        if values is None:
+            if column not in self.columns:
+                raise KeyError(f"Not a numeric column: {column}")
+            values = self._values[column] = readonly(
+                self.df[column].to_numpy(dtype="float64", na_value=np.nan)
+            )
+        return values
+
+    def stats(self, column, mask=None):
+        """Statistics of ``column`` over the rows in ``mask`` (memoized per filter state)."""
+        key = (column, None if mask is None else mask_digest(mask))
+        cached = self._stats.get(key)
+        if cached is not None:
+            return cached
+
+        values = self.values(column)
+        selected = values if mask is None else values[mask]
+        present = selected[~np.isnan(selected)]
+        if len(present):
+            histogram, edges = np.histogram(present, bins=HISTOGRAM_BINS)
+            low, high = float(present.min()), float(present.max())
+        else:
+            histogram, edges = np.zeros(0, dtype=np.int64), np.zeros(0)
+            low = high = float("nan")
+        stats = ColumnStats(low, high, len(present), len(selected) - len(present),
+                            readonly(edges), readonly(histogram))
+
+        self._stats.put(key, stats)
+        return stats
+
+    def predicate(self, column, low, high):
+        """Rows with ``low <= column <= high``; missing values never match."""
+        return self._predicate(column, float(low), float(high))
+
+    def _compute_predicate(self, column, low, high):
+        values = self.values(column)
+        result = np.greater_equal(values, low)
+        result &= np.less_equal(values, high)
+        return readonly(result)
+
+    def mask(self, ranges, base=None):
+        """Rows in ``base`` (default: all rows) matching every ``{column: (low, high)}`` range.
+
+        Returns a new, writable mask owned by the caller.
+        """
+        result = np.ones(self.size, dtype=bool) if base is None else np.array(base, dtype=bool)
+        for column, (low, high) in ranges.items():
+            np.logical_and(result, self.predicate(column, low, high), out=result)
+        return result
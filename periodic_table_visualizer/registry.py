@@ -0,0 +1,203 @@
+"""Selectable datasets and a process-wide, memory-bounded dataset cache.
+
+``discover_datasets`` lists the CSVs the app can switch between: every CSV
+in ``data/`` plus the entries of ``PTV_DATASETS`` (``name=path`` or just
+``path``, separated by ``os.pathsep``). ``DatasetCache`` holds one typed
+copy of each loaded dataset for the whole process, so all sessions share
+it. Entries are checked against the file's modification time and size on
+every access and reloaded when the file changes; the least recently used
+datasets are evicted once their total size exceeds ``max_bytes``
+(``PTV_DATASET_CACHE_MB`` sets it for the app).
+
+Indexes over a dataset (filter engines, search indexes, ...) hold on to its
+frame, so they are kept with the cache entry through ``DatasetCache.index``
+rather than in caches of their own: evicting or reloading a dataset drops
+its indexes too. Each entry keeps its ``MAX_INDEXES`` most recently used
+indexes. The byte budget counts the frames and what their indexes and
+derived frames hold (arrays, pandas and Arrow data, but not the dataset
+columns they share); memoized query results inside ``lru_cache`` are not
+counted. Entries are measured again whenever an index is built and, while
+in use, at most every ``RESIZE_INTERVAL_S`` seconds, as indexes fill their
+caches lazily.
+"""
+import os
+import threading
+import time
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from periodic_table_visualizer import dataset
+from periodic_table_visualizer.caching import LRUCache
+
+DATA_DIR = "data"
+DATASETS_ENV = "PTV_DATASETS"
+CACHE_BUDGET_ENV = "PTV_DATASET_CACHE_MB"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+MAX_INDEXES = 32
+RESIZE_INTERVAL_S = 5.0
+# The app's tabs need these; datasets without them are rejected with a clear error.
+REQUIRED_COLUMNS = ("AtomicNumber", "Element", "Symbol", "Group", "Period", "Type", "Radioactive")
+
+
+class Dataset(NamedTuple):
+    name: str
+    path: str
+    key: str  # "<path>@<version>", changes whenever the file does
+    df: pd.DataFrame
+    nbytes: int  # of ``df``; ``entry_nbytes`` adds the indexes
+    indexes: LRUCache  # built by ``DatasetCache.index``, dropped with the entry
+
+
+def dataset_name(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def discover_datasets(data_dir=DATA_DIR, environ=os.environ):
+    """``{name: path}`` of the datasets available to the app, in a stable order."""
+    found = {}
+    if os.path.isdir(data_dir):
+        for entry in sorted(os.listdir(data_dir)):
+            if entry.lower().endswith(".csv"):
+                found[dataset_name(entry)] = os.path.join(data_dir, entry)
+    for item in environ.get(DATASETS_ENV, "").split(os.pathsep):
+        item = item.strip()
+        if not item:
+            continue
+        name, separator, path = item.partition("=")
+        if not separator:
+            name, path = dataset_name(item), item
+        found[name.strip()] = path.strip()
+    return found
+
+
+def cache_budget(environ=os.environ):
+    """Byte budget for ``DatasetCache``: ``$PTV_DATASET_CACHE_MB`` megabytes, or the default."""
+    value = environ.get(CACHE_BUDGET_ENV, "").strip()
+    return int(float(value) * 1024 * 1024) if value else DEFAULT_MAX_BYTES
+
+
+def file_version(path):
+    """Cheap change token for ``path``; raises FileNotFoundError if it is missing."""
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def _nbytes(value, frame, seen):
+    """Approximate memory held by ``value`` apart from the columns of ``frame``."""
+    if id(value) in seen or value is None or callable(value) or isinstance(value, (bool, int, float, str)):
+        return 0
+    seen.add(id(value))
+    if isinstance(value, np.ndarray):
+        # Views are owned by (and counted with) another array, or are views of ``frame``.
+        return value.nbytes if value.base is None else 0
+    if isinstance(value, pd.DataFrame):
+        extra = [column for column in value.columns if column not in frame.columns]
+        return int(value[extra].memory_usage(deep=True, index=False).sum()) if extra else 0
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, bytes) or type(value).__module__.startswith("pyarrow"):
+        return getattr(value, "nbytes", len(value) if isinstance(value, bytes) else 0)
+    if isinstance(value, LRUCache):
+        items = value.values()
+    elif isinstance(value, dict):
+        items = list(value.values())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = list(value)
+    elif hasattr(value, "__dict__"):
+        items = list(vars(value).values())
+    else:
+        return 0
+    return sum(_nbytes(item, frame, seen) for item in items)
+
+
+def entry_nbytes(entry):
+    """Bytes held by a cached dataset: its frame plus its indexes and derived frames."""
+    seen = {id(entry.df)}
+    return entry.nbytes + sum(_nbytes(index, entry.df, seen) for index in entry.indexes.values())
+
+
+class DatasetCache:
+    """Thread-safe LRU of loaded datasets, bounded by their in-memory size."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, cache_dir=dataset.DATASET_CACHE_DIR,
+                 required_columns=REQUIRED_COLUMNS):
+        self.cache_dir = cache_dir
+        self.required_columns = tuple(required_columns)
+        self._entries = LRUCache(max_bytes=max_bytes, size=entry_nbytes)  # path -> Dataset
+        self._lock = threading.Lock()  # guards ``_load_locks`` and ``_measured``
+        self._load_locks = {}
+        self._measured = {}  # path -> time.monotonic() of the last ``entry_nbytes``
+
+    @property
+    def max_bytes(self):
+        return self._entries.max_bytes
+
+    @property
+    def resident_bytes(self):
+        return self._entries.resident_bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, path):
+        return path in self._entries
+
+    def get(self, path, name=None):
+        """The dataset at ``path``, loaded at most once per file version across all sessions."""
+        key = f"{path}@{file_version(path)}"
+        cached = self._lookup(path, key)
+        if cached is not None:
+            with self._lock:
+                stale = time.monotonic() - self._measured.get(path, 0.0) > RESIZE_INTERVAL_S
+            if stale:
+                self._resize(path)
+            return cached
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(path, threading.Lock())
+        with load_lock:
+            # Another session may have loaded it while we waited.
+            cached = self._lookup(path, key)
+            if cached is not None:
+                return cached
+            df = dataset.load_dataset(path, self.cache_dir)
+            missing = [column for column in self.required_columns if column not in df]
+            if missing:
+                raise ValueError(f"{path} is missing required columns: {', '.join(missing)}")
+            entry = Dataset(name or dataset_name(path), path, key, df, int(df.memory_usage(deep=True).sum()),
+                            LRUCache(max_entries=MAX_INDEXES))
+            # Always kept, even if it alone exceeds the budget.
+            self._entries.put(path, entry)
+            with self._lock:
+                self._measured[path] = time.monotonic()
+        return entry
+
+    def index(self, entry, key, build):
+        """``build()``, called once per ``entry`` and ``key`` and kept with the entry."""
+        index = entry.indexes.get(key)
+        if index is not None:
+            return index
+        with self._lock:
+            # Reentrant: building one index may ask for another of the same dataset.
+            build_lock = self._load_locks.setdefault(("index", entry.path), threading.RLock())
+        with build_lock:
+            index = entry.indexes.get(key)
+            if index is None:
+                index = build()
+                entry.indexes.put(key, index)
+                self._resize(entry.path)
+        return index
+
+    def clear(self):
+        self._entries.clear()
+
+    def _resize(self, path):
+        with self._lock:
+            self._measured[path] = time.monotonic()
+        self._entries.refresh(path)
+
+    def _lookup(self, path, key):
+        entry = self._entries.get(path)
+        return entry if entry is not None and entry.key == key else None
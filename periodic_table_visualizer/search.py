@@ -0,0 +1,176 @@
+"""Prebuilt full-text and column-scoped search over a dataset.
+
+A ``SearchIndex`` is built once per loaded dataset. Each column is reduced
+to its distinct values, formatted and lower-cased once; the values of all
+columns share one trigram ``TextIndex``. A query is matched against the
+distinct values and mapped back to rows through per-column codes, never by
+formatting rows on the fly. Yes/no columns read "yes" where set, as in the
+source CSV.
+
+Query syntax (terms are separated by whitespace and AND-ed; quote terms
+that contain spaces)::
+
+    iron            rows where any value contains "iron"
+    ir*             rows where any value starts with "ir"
+    Symbol:Fe       rows whose Symbol is exactly "fe" (case-insensitive)
+    Type:noble*     rows whose Type starts with "noble"
+    Year>1900       numeric comparison; also >=, <, <=, =, !=
+"""
+import re
+import shlex
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from periodic_table_visualizer.caching import readonly
+from periodic_table_visualizer.filters import TextIndex
+
+# Starts each value in the text index, so a prefix term is a substring search and even a
+# one-letter prefix spans a full trigram.
+VALUE_START = "\x1f\x1f"
+TEXT_DTYPE = "string[pyarrow]"
+
+_COMPARISON = re.compile(r"^(?P<column>[^<>=!:]+?)\s*(?P<op>>=|<=|!=|>|<|=)\s*(?P<value>.+)$")
+_SCOPED = re.compile(r"^(?P<column>[^:]+):(?P<value>.*)$")
+
+_OPERATORS = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    "=": np.equal,
+    "!=": np.not_equal,
+}
+
+
+class SearchQueryError(ValueError):
+    """Raised for queries that reference unknown columns or are malformed."""
+
+
+def _text(values):
+    """Lower-cased search text of ``values``; missing values are empty."""
+    if pd.api.types.is_bool_dtype(values):
+        return pd.Series(np.where(values.to_numpy(dtype=bool, na_value=False), "yes", ""), dtype=TEXT_DTYPE)
+    if pd.api.types.is_float_dtype(values):
+        return _float_text(values)
+    return values.astype(str).where(values.notna(), "").str.lower().astype(TEXT_DTYPE)
+
+
+def _float_text(values):
+    """``str()`` of each float, as ``astype(str)`` writes it."""
+    import pyarrow as pa
+
+    # Arrow formats floats far faster than ``astype(str)``, but writes whole numbers without
+    # ".0" and has its own exponent notation; those values are patched.
+    numbers = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    text = pd.Series(pd.arrays.ArrowStringArray(pa.array(values, from_pandas=True).cast(pa.string())))
+    with np.errstate(invalid="ignore"):
+        magnitude = np.abs(numbers)
+        exponent = ((magnitude < 1e-4) & (magnitude > 0)) | (magnitude >= 1e16)
+        whole = (numbers == np.floor(numbers)) & ~exponent
+    if whole.any():
+        text[whole] = text[whole] + ".0"
+    if exponent.any():
+        text[exponent] = values[exponent].astype(str).str.lower().to_numpy()
+    return text.fillna("")
+
+
+class SearchIndex:
+    def __init__(self, df):
+        self.size = len(df)
+        self._columns = {column.lower(): column for column in df.columns}
+        # Row -> distinct value codes per column; the values of column ``i`` sit at
+        # ``bounds[i]:bounds[i + 1]`` in the shared text index.
+        self._order = tuple(df.columns)
+        self._codes = {}
+        values = []
+        for column in self._order:
+            codes, uniques = pd.factorize(df[column], use_na_sentinel=False)
+            self._codes[column] = codes.astype(np.min_scalar_type(max(len(uniques) - 1, 0)))
+            values.append(VALUE_START + _text(pd.Series(uniques, dtype=df[column].dtype)))
+        self._bounds = np.cumsum([0] + [len(text) for text in values])
+        self._values = TextIndex(pd.concat(values, ignore_index=True) if values else pd.Series([], dtype=TEXT_DTYPE))
+        # float32 columns stay float32 so that e.g. ``IonizationEnergy=13.5984`` compares at
+        # the precision the value is stored in; everything else is compared as float64.
+        self._numeric_columns = {
+            column: df[column].to_numpy(
+                dtype=np.float32 if df[column].dtype == np.float32 else np.float64, na_value=np.nan
+            )
+            for column in df.columns
+            if pd.api.types.is_numeric_dtype(df[column]) and not pd.api.types.is_bool_dtype(df[column])
+        }
+
+        self._query_mask = lru_cache(maxsize=256)(self._compute_mask)
+
+    def mask(self, query):
+        """Read-only boolean row mask for ``query``; an empty query matches everything."""
+        return self._query_mask(query.strip())
+
+    def _column(self, name):
+        column = self._columns.get(name.strip().lower())
+        if column is None:
+            raise SearchQueryError(f"Unknown column in search: {name.strip()}")
+        return column
+
+    def _compute_mask(self, query):
+        try:
+            terms = shlex.split(query)
+        except ValueError as e:
+            raise SearchQueryError(f"Malformed search query: {e}") from e
+
+        mask = np.ones(self.size, dtype=bool)
+        for term in terms:
+            mask &= self._term_mask(term)
+        return readonly(mask)
+
+    def _term_mask(self, term):
+        match = _COMPARISON.match(term)
+        if match and match.group("column").strip().lower() in self._columns:
+            return self._comparison_mask(match.group("column"), match.group("op"), match.group("value"))
+
+        match = _SCOPED.match(term)
+        if match and match.group("column").strip().lower() in self._columns:
+            column = self._column(match.group("column"))
+            value = VALUE_START + match.group("value").lower()
+            if value.endswith("*"):
+                return self._value_mask(column, self._column_text(column).str.startswith(value[:-1]))
+            return self._value_mask(column, self._column_text(column) == value)
+
+        value = term.lower()
+        if value.endswith("*"):
+            value = VALUE_START + value[:-1]
+        return self._rows_mask(self._values.rows(value))
+
+    def _column_text(self, column):
+        number = self._order.index(column)
+        return self._values.text.iloc[self._bounds[number]:self._bounds[number + 1]]
+
+    def _value_mask(self, column, matches):
+        """Rows of ``column`` whose distinct value is flagged in ``matches``."""
+        return matches.to_numpy(dtype=bool, na_value=False)[self._codes[column]]
+
+    def _rows_mask(self, positions):
+        """Rows holding any of the distinct values at ``positions`` in the text index."""
+        mask = np.zeros(self.size, dtype=bool)
+        owners = np.searchsorted(self._bounds, positions, side="right") - 1
+        for number in np.unique(owners):
+            hits = np.zeros(self._bounds[number + 1] - self._bounds[number], dtype=bool)
+            hits[positions[owners == number] - self._bounds[number]] = True
+            mask |= hits[self._codes[self._order[number]]]
+        return mask
+
+    def _comparison_mask(self, name, op, raw_value):
+        column = self._column(name)
+        values = self._numeric_columns.get(column)
+        if values is None:
+            if op not in ("=", "!="):
+                raise SearchQueryError(f"Column {column} is not numeric")
+            result = self._value_mask(column, self._column_text(column) == VALUE_START + raw_value.strip().lower())
+            return ~result if op == "!=" else result
+        try:
+            value = float(raw_value)
+        except ValueError as e:
+            raise SearchQueryError(f"Expected a number after {column}{op}, got {raw_value!r}") from e
+        with np.errstate(invalid="ignore"):
+            return _OPERATORS[op](values, values.dtype.type(value))
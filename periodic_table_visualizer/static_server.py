@@ -0,0 +1,116 @@
+"""Stand-alone server for the published element images.
+
+Streamlit's own static serving is enough for a single app server. For a CDN
+origin, or to take image traffic off the Streamlit process, this serves
+``static/`` on its own port::
+
+    python -m periodic_table_visualizer.static_server --port 8502
+    PTV_ASSET_BASE_URL=http://localhost:8502/elements streamlit run main.py
+
+Content-hashed files are sent with ``Cache-Control: public, max-age=31536000,
+immutable``; everything else (e.g. ``manifest.json``) must be revalidated.
+Every response carries a strong ETag and ``If-None-Match`` is answered with
+304 Not Modified.
+"""
+import argparse
+import mimetypes
+import os
+import re
+import shutil
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from periodic_table_visualizer.assets import HASH_LENGTH, STATIC_DIR
+from periodic_table_visualizer.caching import LRUCache, file_digest
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+HASHED_NAME = re.compile(rf"\.[0-9a-f]{{{HASH_LENGTH}}}\.[A-Za-z0-9]+$")
+
+# Not in every Python version's default table.
+mimetypes.add_type("image/webp", ".webp")
+
+ETAG_CACHE_SIZE = 4096
+
+_etags = LRUCache(max_entries=ETAG_CACHE_SIZE)
+
+
+def etag_for(path):
+    """Strong ETag for ``path``, cached per (path, mtime, size)."""
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    etag = _etags.get(key)
+    if etag is None:
+        etag = f'"{file_digest(path)[:32]}"'
+        _etags.put(key, etag)
+    return etag
+
+
+class AssetRequestHandler(SimpleHTTPRequestHandler):
+    def do_GET(self):
+        source = self._send_head()
+        if source:
+            try:
+                shutil.copyfileobj(source, self.wfile)
+            finally:
+                source.close()
+
+    def do_HEAD(self):
+        source = self._send_head()
+        if source:
+            source.close()
+
+    def _send_head(self):
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+
+        etag = etag_for(path)
+        cache_control = IMMUTABLE if HASHED_NAME.search(path) else REVALIDATE
+        if etag in (tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", cache_control)
+            self.end_headers()
+            return None
+
+        source = open(path, "rb")
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", mimetypes.guess_type(path)[0] or "application/octet-stream")
+        self.send_header("Content-Length", str(os.fstat(source.fileno()).st_size))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", cache_control)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("X-Content-Type-Options", "nosniff")
+        self.end_headers()
+        return source
+
+    def list_directory(self, path):
+        self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+        return None
+
+
+def serve(directory=STATIC_DIR, host="127.0.0.1", port=8502):
+    handler = lambda *args, **kwargs: AssetRequestHandler(*args, directory=directory, **kwargs)
+    server = ThreadingHTTPServer((host, port), handler)
+    print(f"Serving {directory} at http://{host}:{server.server_port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the published element images with long-lived caching.")
+    parser.add_argument("--directory", default=STATIC_DIR)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    args = parser.parse_args(argv)
+    serve(args.directory, args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Pre-rendered static copy of the explorer for CDN hosting.
+
+The periodic table, the element details cards, the gallery and the default
+trend charts need no server once rendered. ``export_site`` writes them as
+plain files that any static host or CDN can serve, leaving the Streamlit app
+for interactive analysis::
+
+    python -m periodic_table_visualizer.static_site --output build/site
+
+The bundle contains ``index.html`` (the periodic table and the introductory
+text, every cell linking to its element), ``elements/<Symbol>.html`` (the
+card the Element Details tab shows), ``gallery.html``, ``trends.html`` (the
+charts as embedded Plotly JSON, drawn by a local copy of plotly.js) and
+``assets/`` with content-hashed CSS, JavaScript and images. A ``_headers``
+file marks ``assets/`` as immutable for hosts that read it (Netlify,
+Cloudflare Pages); other hosts should be configured the same way.
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import shutil
+
+from periodic_table_visualizer import content
+from periodic_table_visualizer.assets import AssetManifest, publish_assets
+from periodic_table_visualizer.dataset import load_dataset
+from periodic_table_visualizer.gallery import GalleryIndex, render_gallery_html
+from periodic_table_visualizer.images import IMAGE_DIR
+from periodic_table_visualizer.layout import ELEMENT_COLORS, render_periodic_table_html
+from periodic_table_visualizer.lookup import render_details_html
+from periodic_table_visualizer.thumbnails import THUMBNAIL_DIR, build_thumbnails, width_for_columns
+from periodic_table_visualizer.trends import build_trend_figure, style_trend_figure, trend_series
+
+DEFAULT_OUTPUT = os.path.join("build", "site")
+GALLERY_COLUMNS = 10
+# None stands for the Trend tab's default selection (its first two numeric columns).
+TREND_CHARTS = (None, ("AtomicRadius",), ("Electronegativity",), ("IonizationEnergy",), ("Density",))
+INTRO_SECTIONS = (
+    content.HISTORY_OF_PERIODIC_TABLE,
+    content.BASIC_INFO_PERIODIC_TABLE,
+)
+OUTRO_SECTIONS = (
+    content.FUN_FACTS_ABOUT_PERIODIC_TABLE,
+    content.FEATURES_MODERN_CHEMISTRY,
+    content.PERIODIC_TABLE_IN_EVERYDAY_LIFE,
+)
+NAVIGATION = (("index.html", "Periodic Table"), ("gallery.html", "Gallery"), ("trends.html", "Trends"))
+HEADERS = "/assets/*\n  Cache-Control: public, max-age=31536000, immutable\n/*\n  Cache-Control: public, max-age=300\n"
+
+PAGE_CSS = """
+body { font-family: Arial, sans-serif; max-width: 1400px; margin: 0 auto; padding: 20px; }
+a { color: #7fd3e6; }
+nav { display: flex; gap: 20px; margin-bottom: 20px; }
+.pager { display: flex; justify-content: space-between; margin: 20px 0; }
+.trend-chart { height: 520px; margin-bottom: 30px; }
+"""
+
+
+def markdown_to_html(text):
+    """Render the app's Markdown text (markdown-it ships with Streamlit's dependencies)."""
+    try:
+        from markdown_it import MarkdownIt
+    except ImportError:
+        return f"<pre>{html.escape(text)}</pre>"
+    return MarkdownIt("commonmark").render(text)
+
+
+def _write_hashed(directory, stem, ext, data):
+    """Write ``data`` (bytes) as ``<stem>.<hash><ext>`` and return the file name."""
+    name = f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, name), "wb") as f:
+        f.write(data)
+    return name
+
+
+def _write_page(path, body):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(body)
+
+
+class SiteWriter:
+    def __init__(self, output, css_name, plotly_name):
+        self.output = output
+        self.css_name = css_name
+        self.plotly_name = plotly_name
+
+    def page(self, relative_path, title, body, depth=0, scripts=False):
+        root = "../" * depth
+        links = " ".join(f'<a href="{root}{href}">{label}</a>' for href, label in NAVIGATION)
+        script = f'<script src="{root}assets/{self.plotly_name}"></script>' if scripts else ""
+        _write_page(os.path.join(self.output, relative_path), (
+            "<!DOCTYPE html>\n"
+            '<html lang="en"><head><meta charset="utf-8">'
+            '<meta name="viewport" content="width=device-width, initial-scale=1">'
+            f"<title>{html.escape(title)} · Periodic Table Explorer</title>"
+            f'<link rel="stylesheet" href="{root}assets/{self.css_name}">{script}</head>'
+            f"<body><nav>{links}</nav><h1>⚛️ {html.escape(title)}</h1>{body}</body></html>\n"
+        ))
+
+
+def _figure_html(fig, element_id):
+    figure = json.dumps(fig.to_plotly_json(), cls=_plotly_encoder()).replace("</", "<\\/")
+    return (
+        f'<div id="{element_id}" class="trend-chart"></div>'
+        f'<script>(function () {{ var f = {figure}; '
+        f'Plotly.newPlot("{element_id}", f.data, f.layout, {{responsive: true}}); }})();</script>'
+    )
+
+
+def _plotly_encoder():
+    from plotly.utils import PlotlyJSONEncoder
+
+    return PlotlyJSONEncoder
+
+
+def default_trend_properties(df):
+    """The Trend tab's initial selection."""
+    return tuple(df.select_dtypes(include=["number"]).columns[:2])
+
+
+def export_site(output=DEFAULT_OUTPUT, data_path=None, image_dir=IMAGE_DIR, thumbnail_dir=THUMBNAIL_DIR):
+    """Write the static bundle to ``output`` (replacing it) and return the number of pages."""
+    from plotly.offline import get_plotlyjs
+
+    from periodic_table_visualizer.core import DATA_PATH
+
+    df = load_dataset(data_path or DATA_PATH)
+    if os.path.isdir(output):
+        shutil.rmtree(output)
+    assets = os.path.join(output, "assets")
+    css = content.APP_CSS.replace("<style>", "").replace("</style>", "") + PAGE_CSS
+    site = SiteWriter(
+        output,
+        _write_hashed(assets, "site", ".css", css.encode("utf-8")),
+        _write_hashed(assets, "plotly", ".min.js", get_plotlyjs().encode("utf-8")),
+    )
+    with open(os.path.join(output, "_headers"), "w", encoding="utf-8") as f:
+        f.write(HEADERS)
+    pages = 0
+
+    # Element pages, linked from the table and from each other.
+    records = df.sort_values("AtomicNumber").drop_duplicates("Element")
+    symbols = records["Symbol"].astype(str).tolist()
+    for index, (_, record) in enumerate(records.iterrows()):
+        pager = []
+        if index > 0:
+            pager.append(f'<a href="{html.escape(symbols[index - 1])}.html">← {html.escape(symbols[index - 1])}</a>')
+        pager.append('<a href="../index.html">Periodic table</a>')
+        if index + 1 < len(symbols):
+            pager.append(f'<a href="{html.escape(symbols[index + 1])}.html">{html.escape(symbols[index + 1])} →</a>')
+        body = render_details_html(record) + f'<div class="pager">{"".join(pager)}</div>' + content.ELEMENT_DEFINITIONS_HTML
+        site.page(os.path.join("elements", f"{symbols[index]}.html"), str(record["Element"]), body, depth=1)
+        pages += 1
+
+    table = render_periodic_table_html(df, ELEMENT_COLORS, link=lambda record: f"elements/{record['Symbol']}.html")
+    site.page("index.html", "Periodic Table Explorer", (
+        "".join(markdown_to_html(section) for section in INTRO_SECTIONS)
+        + table
+        + "".join(markdown_to_html(section) for section in OUTRO_SECTIONS)
+    ))
+    pages += 1
+
+    # Only the thumbnail width the gallery shows is published.
+    width = width_for_columns(GALLERY_COLUMNS)
+    build_thumbnails(image_dir, thumbnail_dir)
+    publish_assets(image_dir, thumbnail_dir, os.path.join(assets, "elements"), widths=(width,), originals=False)
+    manifest = AssetManifest.load(os.path.join(assets, "elements"), base_url="assets/elements")
+    gallery = render_gallery_html(
+        GalleryIndex(df).page().rows, lambda atomic_number: manifest.url(atomic_number, width), GALLERY_COLUMNS
+    )
+    site.page("gallery.html", "Element Gallery", gallery)
+    pages += 1
+
+    charts = []
+    for number, properties in enumerate(TREND_CHARTS):
+        properties = default_trend_properties(df) if properties is None else properties
+        properties = tuple(prop for prop in properties if prop in df)
+        if properties:
+            fig = style_trend_figure(build_trend_figure(trend_series(df, properties)))
+            charts.append(_figure_html(fig, f"trend-{number}"))
+    site.page("trends.html", "Trend Visualization", "".join(charts), scripts=True)
+    pages += 1
+    return pages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a static, CDN-ready copy of the explorer.")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="directory to write (replaced if it exists)")
+    parser.add_argument("--data", help="dataset CSV (default: the bundled element table)")
+    args = parser.parse_args(argv)
+    pages = export_site(args.output, args.data)
+    print(f"Wrote {pages} pages to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Downscaled element image variants for the gallery.
+
+The originals in ``images/elements`` are up to several hundred KB each, far
+more than a gallery cell needs. ``build_thumbnails`` writes recompressed WebP
+copies at a few fixed widths into a cache directory; it only rebuilds a
+variant when its source image is newer, so it is cheap to call on every
+start-up. It can also be run ahead of time::
+
+    python -m periodic_table_visualizer.thumbnails [--force]
+"""
+import argparse
+import math
+import os
+
+THUMBNAIL_DIR = os.path.join(".cache", "thumbnails")
+THUMBNAIL_WIDTHS = (96, 128, 256)
+THUMBNAIL_FORMAT = "WEBP"
+THUMBNAIL_EXTENSION = ".webp"
+THUMBNAIL_QUALITY = 80
+
+# Used to translate "elements per row" into a pixel width for a gallery cell.
+GALLERY_WIDTH_PX = 1200
+DEVICE_PIXEL_RATIO = 1.5
+
+
+def thumbnail_path(atomic_number, width, cache_dir=THUMBNAIL_DIR):
+    return os.path.join(cache_dir, str(width), f"{int(atomic_number)}{THUMBNAIL_EXTENSION}")
+
+
+def width_for_columns(elements_per_row, widths=THUMBNAIL_WIDTHS):
+    """Smallest thumbnail width that covers one gallery cell at ``elements_per_row``."""
+    needed = math.ceil(GALLERY_WIDTH_PX / max(int(elements_per_row), 1) * DEVICE_PIXEL_RATIO)
+    for width in sorted(widths):
+        if width >= needed:
+            return width
+    return max(widths)
+
+
+def build_thumbnail(source, atomic_number, widths=THUMBNAIL_WIDTHS, cache_dir=THUMBNAIL_DIR, force=False):
+    """Write every missing or outdated variant of one image; return how many were written."""
+    source_mtime = os.stat(source).st_mtime
+    pending = []
+    for width in widths:
+        target = thumbnail_path(atomic_number, width, cache_dir)
+        if force or not os.path.exists(target) or os.stat(target).st_mtime < source_mtime:
+            pending.append((width, target))
+    if not pending:
+        return 0
+
+    from PIL import Image
+
+    with Image.open(source) as image:
+        image = image.convert("RGBA")
+        for width, target in pending:
+            variant = image
+            if image.width > width:
+                height = max(1, round(image.height * width / image.width))
+                variant = image.resize((width, height), Image.LANCZOS)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            # Write to a temporary name first so concurrent readers never see a partial file.
+            partial = f"{target}.partial"
+            variant.save(partial, THUMBNAIL_FORMAT, quality=THUMBNAIL_QUALITY, method=4)
+            os.replace(partial, target)
+    return len(pending)
+
+
+def build_thumbnails(image_dir, cache_dir=THUMBNAIL_DIR, widths=THUMBNAIL_WIDTHS, force=False):
+    """Build thumbnails for every ``<atomic number>.png`` in ``image_dir``."""
+    built = 0
+    if not os.path.isdir(image_dir):
+        return built
+    for filename in os.listdir(image_dir):
+        stem, ext = os.path.splitext(filename)
+        if ext.lower() != ".png" or not stem.isdigit():
+            continue
+        built += build_thumbnail(os.path.join(image_dir, filename), int(stem), widths, cache_dir, force)
+    return built
+
+
+def main(argv=None):
+    from periodic_table_visualizer.images import IMAGE_DIR
+
+    parser = argparse.ArgumentParser(description="Build downscaled element images for the gallery.")
+    parser.add_argument("--image-dir", default=IMAGE_DIR)
+    parser.add_argument("--cache-dir", default=THUMBNAIL_DIR)
+    parser.add_argument("--force", action="store_true", help="rebuild variants that are already up to date")
+    args = parser.parse_args(argv)
+
+    built = build_thumbnails(args.image_dir, args.cache_dir, force=args.force)
+    print(f"Wrote {built} thumbnail(s) to {args.cache_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Property trend series and their line charts.
+
+The expensive part of the Trend Visualization tab, pulling the selected
+columns out as arrays and smoothing them, lives in ``trend_series`` and
+depends only on the rows, the properties and the smoothing sigma. The chart
+is built from a series by ``build_trend_figure`` and purely cosmetic options
+(markers, dash style) are applied afterwards by ``style_trend_figure``, so a
+cached figure can be restyled without being rebuilt.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+X_COLUMN = "AtomicNumber"
+DEFAULT_SIGMA = 2.0
+LINE_STYLES = ("solid", "dash", "dot", "dashdot")
+
+
+class TrendSeries(NamedTuple):
+    x: np.ndarray
+    properties: tuple
+    values: np.ndarray  # shape (len(x), len(properties)), NaN where data is missing
+    sigma: float = None
+
+
+def smooth(values, sigma=DEFAULT_SIGMA):
+    """Gaussian-smooth every column of ``values`` in one call, ignoring NaNs.
+
+    Missing points neither pull their neighbours towards zero nor get filled
+    in: each output is the weighted mean of the valid inputs around it
+    (normalized convolution) and stays NaN where the input was NaN.
+    """
+    from scipy.ndimage import gaussian_filter1d
+
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    weighted = gaussian_filter1d(np.where(valid, values, 0.0), sigma, axis=0)
+    weights = gaussian_filter1d(valid.astype(np.float64), sigma, axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        smoothed = weighted / weights
+    smoothed[~valid] = np.nan
+    return smoothed
+
+
+def trend_series(df, properties, sigma=None):
+    """Extract ``properties`` against atomic number, smoothed when ``sigma`` is given."""
+    properties = tuple(properties)
+    x = df[X_COLUMN].to_numpy(dtype=np.float64)
+    values = np.empty((len(df), len(properties)), dtype=np.float64)
+    for i, prop in enumerate(properties):
+        values[:, i] = df[prop].to_numpy(dtype=np.float64, na_value=np.nan)
+    if sigma and len(df):
+        values = smooth(values, sigma)
+    return TrendSeries(x, properties, values, sigma)
+
+
+def build_trend_figure(series):
+    import plotly.graph_objects as go
+    from plotly.colors import qualitative
+
+    fig = go.Figure()
+    palette = qualitative.Bold
+    for i, prop in enumerate(series.properties):
+        fig.add_trace(go.Scatter(
+            x=series.x,
+            y=series.values[:, i],
+            name=prop,
+            mode="lines+markers",
+            line=dict(color=palette[i % len(palette)]),
+        ))
+
+    fig.update_layout(
+        title=dict(
+            text="Property Trends Across Elements",
+            font=dict(size=24, color="white"),
+            x=0.5,
+            y=0.95
+        ),
+        xaxis_title="Atomic Number",
+        yaxis_title="Property Value",
+        legend=dict(
+            title="Properties",
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        ),
+        hovermode="x unified",
+        template="plotly_dark",
+        margin=dict(l=0, r=0, b=0, t=50),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+
+def style_trend_figure(fig, show_markers=True, line_style="solid"):
+    """Apply the cosmetic chart options in place and return ``fig``."""
+    fig.update_traces(mode="lines+markers" if show_markers else "lines", line_dash=line_style)
+    return fig
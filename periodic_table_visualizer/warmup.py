@@ -0,0 +1,143 @@
+"""Start-up helpers: cache warm-up and an import-time report.
+
+``warm_up`` fills the on-disk caches a fresh container would otherwise
+build during its first session (the typed Feather copy of the dataset, the
+gallery thumbnails and their published static copies) and builds the
+in-memory indexes once to check and time them. ``import_times`` imports
+each module in a fresh interpreter and reports how long it took, so the
+start-up import budget can be checked::
+
+    python -m periodic_table_visualizer --warmup
+    python -m periodic_table_visualizer --import-times
+"""
+import subprocess
+import sys
+import time
+
+# Imported when main.py starts; everything else should be imported lazily.
+STARTUP_MODULES = (
+    "streamlit",
+    "pandas",
+    "numpy",
+    "periodic_table_visualizer.core",
+    "periodic_table_visualizer.analytics",
+    "periodic_table_visualizer.assets",
+    "periodic_table_visualizer.datatable",
+    "periodic_table_visualizer.export",
+    "periodic_table_visualizer.expressions",
+    "periodic_table_visualizer.gallery",
+    "periodic_table_visualizer.images",
+    "periodic_table_visualizer.instrumentation",
+    "periodic_table_visualizer.lookup",
+    "periodic_table_visualizer.multivariate",
+    "periodic_table_visualizer.ranges",
+    "periodic_table_visualizer.registry",
+    "periodic_table_visualizer.search",
+    "periodic_table_visualizer.thumbnails",
+    "periodic_table_visualizer.trends",
+)
+# Only needed once a tab actually uses them. (plotly.graph_objects is not listed:
+# Streamlit itself imports it, and it only loads the figure classes on first use.)
+DEFERRED_MODULES = (
+    "pyarrow.feather",
+    "pyarrow.parquet",
+    "scipy.ndimage",
+    "scipy.cluster.hierarchy",
+    "streamlit_plotly_events",
+    "PIL.Image",
+)
+STARTUP_BUDGET_S = 2.5
+
+_TIMER = "import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+_LEAK_CHECK = "import sys; import {startup}; print(' '.join(m for m in {deferred!r} if m in sys.modules))"
+
+
+def _timed(label, func, report):
+    start = time.perf_counter()
+    result = func()
+    report.append((label, time.perf_counter() - start))
+    return result
+
+
+def warm_up(data_path=None):
+    """Populate the on-disk caches and return ``[(step, seconds), ...]``."""
+    from periodic_table_visualizer import core
+    from periodic_table_visualizer.assets import atlas_enabled, publish_assets
+    from periodic_table_visualizer.gallery import GalleryIndex
+    from periodic_table_visualizer.images import IMAGE_DIR
+    from periodic_table_visualizer.lookup import ElementIndex
+    from periodic_table_visualizer.search import SearchIndex
+    from periodic_table_visualizer.thumbnails import THUMBNAIL_DIR, build_thumbnails
+
+    report = []
+    df = _timed("dataset (typed load + Feather cache)", lambda: core.load_dataset(data_path or core.DATA_PATH), report)
+    _timed("filter indexes", lambda: core.FilterEngine(df), report)
+    _timed("search index", lambda: SearchIndex(df), report)
+    _timed("element and gallery indexes", lambda: (ElementIndex(df), GalleryIndex(df)), report)
+    _timed("thumbnails", lambda: build_thumbnails(IMAGE_DIR, THUMBNAIL_DIR), report)
+    _timed("static image assets", lambda: publish_assets(IMAGE_DIR, THUMBNAIL_DIR, atlas=atlas_enabled()), report)
+    return report
+
+
+def import_time(module):
+    """Seconds needed to import ``module`` in a fresh interpreter, or None if it fails."""
+    result = subprocess.run(
+        [sys.executable, "-c", _TIMER.format(module=module)], capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        return None
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def import_times(modules=STARTUP_MODULES + DEFERRED_MODULES):
+    return [(module, import_time(module)) for module in modules]
+
+
+def eagerly_imported(startup=STARTUP_MODULES, deferred=DEFERRED_MODULES):
+    """Deferred modules that get pulled in anyway by importing the start-up set."""
+    result = subprocess.run(
+        [sys.executable, "-c", _LEAK_CHECK.format(startup=", ".join(startup), deferred=deferred)],
+        capture_output=True, text=True, check=True
+    )
+    return result.stdout.split()
+
+
+def _print_rows(rows):
+    for label, seconds in rows:
+        shown = "   failed" if seconds is None else f"{seconds * 1000:8.1f} ms"
+        print(f"  {label:<40} {shown}")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m periodic_table_visualizer")
+    parser.add_argument("--warmup", action="store_true", help="populate the dataset, index and thumbnail caches")
+    parser.add_argument("--data", help="dataset to warm up (default: the bundled element table)")
+    parser.add_argument("--import-times", action="store_true", help="report per-module import times")
+    args = parser.parse_args(argv)
+    if not (args.warmup or args.import_times):
+        parser.print_help()
+        return 1
+
+    if args.warmup:
+        print("Warm-up:")
+        _print_rows(warm_up(args.data))
+    if args.import_times:
+        print("Start-up imports (each measured alone in a fresh interpreter):")
+        _print_rows(import_times(STARTUP_MODULES))
+        print("Deferred until a tab needs them:")
+        _print_rows(import_times(DEFERRED_MODULES))
+
+        total = import_time(", ".join(STARTUP_MODULES))
+        leaked = eagerly_imported()
+        if total is None:
+            print("Importing the start-up modules failed")
+            return 1
+        status = "within" if total <= STARTUP_BUDGET_S else "OVER"
+        print(f"All start-up imports together: {total:.2f}s, {status} the {STARTUP_BUDGET_S:.1f}s budget")
+        if leaked:
+            print(f"Deferred modules imported at start-up: {', '.join(leaked)}")
+        if status == "OVER" or leaked:
+            return 1
+    return 0
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from periodic_table_visualizer.expressions import ExpressionEngine, ExpressionError, parse_expression
+
+COLUMNS = ("AtomicMass", "Density", "Group", "Some Column", "__dunder__")
+
+
+@pytest.fixture
+def engine():
+    return ExpressionEngine(pd.DataFrame({
+        "Element": ["Hydrogen", "Helium", "Lithium", "Sodium"],
+        "AtomicMass": [1.007, 4.002, 6.941, 22.99],
+        "Density": [0.0000899, 0.000179, 0.534, 0.0],
+        "Group": pd.array([1, 18, 1, 1], dtype="Int8"),
+    }))
+
+
+@pytest.mark.parametrize("formula", [
+    # attributes
+    "Density.real",
+    "AtomicMass.__class__",
+    "(1).__class__.__bases__",
+    # calls to names outside the allow-list
+    "eval(Density)",
+    "open(Density)",
+    "__import__(Density)",
+    "Density(1)",
+    "sqrt(Density, Density)",
+    "sqrt(x=Density)",
+    "abs.__call__(Density)",
+    # subscripts
+    "Density[0]",
+    "AtomicMass[1:2]",
+    "sqrt[0](Density)",
+    # lambdas
+    "lambda: Density",
+    "(lambda x: x)(Density)",
+    # dunder names
+    "__builtins__",
+    "__import__",
+    "__dunder__ * 2",
+    "Density + __name__",
+    # other statements and expressions
+    "[Density]",
+    "Density if Group else AtomicMass",
+    "Density > 1",
+    "not Density",
+    "'text'",
+    "True + Density",
+    "Density; AtomicMass",
+    "",
+    "Unknown * 2",
+    # too large or too deeply nested to compile
+    "1" * 400,
+    "-" * 450 + "Density",
+])
+def test_rejected(formula):
+    with pytest.raises(ExpressionError):
+        parse_expression(formula, COLUMNS)
+
+
+def test_quoted_names():
+    expression = parse_expression("`Some Column` * 2 + `__dunder__`", COLUMNS)
+    assert [name for name, _ in expression.columns] == ["Some Column", "__dunder__"]
+
+
+def test_evaluate(engine):
+    np.testing.assert_allclose(engine.evaluate("AtomicMass / 2"), [0.5035, 2.001, 3.4705, 11.495])
+    ratio = engine.evaluate("AtomicMass / Density")
+    assert np.isnan(ratio[3])  # division by zero is missing, not inf
+    np.testing.assert_allclose(engine.evaluate("AtomicMass - group_mean(AtomicMass)")[[0, 1]], [-9.306, 0.0], atol=1e-3)
+    assert not engine.evaluate("mean(AtomicMass)").flags.writeable
+
+
+def test_unknown_column(engine):
+    with pytest.raises(ExpressionError, match="Element"):
+        engine.evaluate("Element * 2")
+
+
+def test_with_columns_shares_the_dataset_columns(engine):
+    frame = engine.with_columns((("Half", "AtomicMass / 2"),))
+    assert list(frame.columns) == [*engine.df.columns, "Half"]
+    assert "Half" not in engine.df
+    assert np.shares_memory(frame["AtomicMass"].to_numpy(), engine.df["AtomicMass"].to_numpy())
+    with pytest.raises(ExpressionError):
+        engine.with_columns((("Density", "AtomicMass"),))